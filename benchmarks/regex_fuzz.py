@@ -0,0 +1,160 @@
+"""
+Adversarial / fuzz benchmark for the heuristic regexes used on M and TMDL text.
+
+Every module-level pattern in signals_builder, pq_findings, pq_insights and pq_extractor
+(plus pq_extractor._extract_source_blocks) is run against seeded corpora of growing size.
+For each pattern the worst-case time per size and a growth exponent (slope of log time vs
+log size) are recorded; an exponent well above 1 means super-linear backtracking.
+
+    python benchmarks/regex_fuzz.py                      # table on stdout
+    python benchmarks/regex_fuzz.py --out fuzz.json      # also write the raw results
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from datavalidator.analyze import pq_findings, pq_insights, signals_builder  # noqa: E402
+from datavalidator.core.regex_guard import GuardedPattern  # noqa: E402
+from datavalidator.extract import pq_extractor  # noqa: E402
+
+MODULES = (signals_builder, pq_findings, pq_insights, pq_extractor)
+DEFAULT_SIZES = (1_000, 4_000, 16_000, 64_000)
+# A pattern that takes longer than this at one size is not run at larger sizes
+STOP_MS = 5_000.0
+
+_M_TOKENS = [
+    "let", "in", "Source", " = ", "=", ",", "(", ")", "{", "}", "[", "]", '"', '#"', "\n", "\t", "    ",
+    "Table.SelectRows", "Table.Buffer", "Table.Group", "Sql.Database", "Web.Contents", "Value.NativeQuery",
+    "#(lf)", "SELECT", "WHERE", "RangeStart", "partition ", "'measure ", "a", "b1", "x_y", "-", ".", "com",
+    "https://", "Binary.Decompress", "NAMEOF(", "{(\"",
+]
+
+
+def _repeat(unit: str, size: int) -> str:
+    return (unit * (size // max(1, len(unit)) + 1))[:size]
+
+
+def corpora(seed: int) -> Dict[str, Callable[[int], str]]:
+    """Name -> generator(size). Shapes target the backtracking-prone constructs in the heuristics."""
+
+    def random_m(size: int) -> str:
+        rng = random.Random(seed * 1_000_003 + size)
+        out: List[str] = []
+        n = 0
+        while n < size:
+            tok = rng.choice(_M_TOKENS)
+            out.append(tok)
+            n += len(tok)
+        return "".join(out)[:size]
+
+    return {
+        "random_m": random_m,
+        "ws_lines": lambda n: "Source = x\n" + _repeat("a" + " " * 40 + "\n", n),
+        "name_runs": lambda n: "Source = x\n" + _repeat("\n  ab cd [ef] - gh", n),
+        "host_dashes": lambda n: _repeat("a-", n),
+        "host_dots": lambda n: _repeat("ab.", n),
+        "step_spaces": lambda n: '#"' + " " * n,
+        "open_quotes": lambda n: _repeat('"aaa', n),
+        "sql_literal": lambda n: 'Sql.Database("' + _repeat("a", n),
+        "source_eq": lambda n: _repeat("Source = \n", n),
+        "word_soup": lambda n: _repeat("Table Table.Sel Range Start Value.Native ", n),
+    }
+
+
+def collect_patterns() -> List[Tuple[str, Callable[[str], Any]]]:
+    targets: List[Tuple[str, Callable[[str], Any]]] = []
+
+    def add(name: str, rx: Any) -> None:
+        compiled = rx.compiled if isinstance(rx, GuardedPattern) else rx
+        targets.append((name, compiled.findall))
+
+    for mod in MODULES:
+        short = mod.__name__.rsplit(".", 1)[-1]
+        for attr, value in sorted(vars(mod).items()):
+            if isinstance(value, (re.Pattern, GuardedPattern)):
+                add(f"{short}.{attr}", value)
+            elif isinstance(value, list):
+                for i, entry in enumerate(value):
+                    rx = entry[0] if isinstance(entry, tuple) else entry
+                    if isinstance(rx, (re.Pattern, GuardedPattern)):
+                        add(f"{short}.{attr}[{i}]", rx)
+    targets.append(("pq_extractor._extract_source_blocks", pq_extractor._extract_source_blocks))
+    return targets
+
+
+def _time_ms(fn: Callable[[str], Any], text: str) -> float:
+    t0 = time.perf_counter()
+    fn(text)
+    return (time.perf_counter() - t0) * 1000
+
+
+def _exponent(points: List[Tuple[int, float]]) -> float:
+    # least-squares slope of log(ms) over log(size); sub-10us timings are noise, so floor them
+    pts = [(math.log(s), math.log(max(ms, 0.01))) for s, ms in points]
+    if len(pts) < 2:
+        return 0.0
+    mx = sum(x for x, _ in pts) / len(pts)
+    my = sum(y for _, y in pts) / len(pts)
+    den = sum((x - mx) ** 2 for x, _ in pts)
+    return round(sum((x - mx) * (y - my) for x, y in pts) / den, 2) if den else 0.0
+
+
+def run(sizes: Iterable[int], seed: int) -> List[Dict[str, Any]]:
+    sizes = sorted(sizes)
+    gens = corpora(seed)
+    results: List[Dict[str, Any]] = []
+    for name, fn in collect_patterns():
+        worst: Dict[int, Tuple[float, str]] = {}
+        for corpus, gen in gens.items():
+            for size in sizes:
+                ms = _time_ms(fn, gen(size))
+                if ms > worst.get(size, (-1.0, ""))[0]:
+                    worst[size] = (ms, corpus)
+                if ms > STOP_MS:
+                    break
+        points = [(s, worst[s][0]) for s in sizes if s in worst]
+        top_size = max(worst)
+        results.append({
+            "pattern": name,
+            "worstMs": {str(s): round(worst[s][0], 3) for s in sorted(worst)},
+            "worstCorpus": worst[top_size][1],
+            "growthExponent": _exponent(points),
+        })
+    results.sort(key=lambda r: r["growthExponent"], reverse=True)
+    return results
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="comma-separated input sizes (chars)")
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--out", type=Path, default=None, help="write results as JSON")
+    ap.add_argument("--max-exponent", type=float, default=1.5, help="exit 1 if any pattern grows faster than this")
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = run(sizes, args.seed)
+
+    width = max(len(r["pattern"]) for r in results)
+    print(f"{'pattern'.ljust(width)}  exp   worst@{max(sizes)} (ms)  corpus")
+    for r in results:
+        top = r["worstMs"].get(str(max(sizes)), max(r["worstMs"].values()))
+        print(f"{r['pattern'].ljust(width)}  {r['growthExponent']:4.2f}  {top:>16.3f}  {r['worstCorpus']}")
+
+    if args.out:
+        args.out.write_text(json.dumps({"seed": args.seed, "sizes": sizes, "results": results}, indent=2), encoding="utf-8")
+    return 1 if any(r["growthExponent"] > args.max_exponent for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,5 @@
-__all__ = []
-__version__ = "0.1.0"
\ No newline at end of file
+__version__ = "0.1.0"
+
+from datavalidator.api import ScanResult, scan  # noqa: E402
+
+__all__ = ["scan", "ScanResult"]
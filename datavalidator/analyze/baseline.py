@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+_SEVERITY_RANK = {"INFO": 0, "LOW": 1, "MED": 2, "HIGH": 3, "BLOCKER": 4}
+_SCOPE_KEYS = ("table", "page", "query", "artifact")
+_PATH_KEYS = {"path", "file"}
+_RE_WS = re.compile(r"\s+")
+
+
+def _normalize(value: Any, key: str = "") -> Any:
+    # Evidence must hash the same on every machine: drop checkout-specific folders from paths
+    # and collapse whitespace so re-indented TMDL does not produce a "new" finding.
+    if isinstance(value, dict):
+        return {k: _normalize(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_normalize(v, key) for v in value]
+    if isinstance(value, str):
+        if key in _PATH_KEYS:
+            return value.replace("\\", "/").rsplit("/", 1)[-1]
+        return _RE_WS.sub(" ", value).strip()
+    return value
+
+
+def finding_scope(finding: Dict[str, Any]) -> str:
+    ev = finding.get("evidence")
+    if not isinstance(ev, dict):
+        return ""
+    for key in _SCOPE_KEYS:
+        if ev.get(key):
+            return str(ev[key])
+    return ""
+
+
+def fingerprint(finding: Dict[str, Any]) -> str:
+    """
+    Stable id for a finding: rule id + table/page scope + hash of normalized evidence.
+    Messages and recommendations are wording, not identity, so they are left out.
+    """
+    evidence = json.dumps(_normalize(finding.get("evidence")), sort_keys=True, default=str)
+    ev_hash = hashlib.sha1(evidence.encode("utf-8")).hexdigest()[:16]
+    key = f"{finding.get('id', '')}|{finding_scope(finding)}|{ev_hash}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+
+
+def add_fingerprints(findings: Iterable[Dict[str, Any]]) -> None:
+    for f in findings:
+        f["fingerprint"] = fingerprint(f)
+
+
+def _summary(f: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "fingerprint": f.get("fingerprint") or fingerprint(f),
+        "id": f.get("id"),
+        "severity": f.get("severity"),
+        "title": f.get("title"),
+        "scope": finding_scope(f),
+    }
+
+
+class Baseline:
+    """
+    Fingerprints of a previous run. Accepts a prior findings.json (list of findings) or
+    a compact {"fingerprints": [...]} file; lookups are set/dict membership only.
+    """
+
+    def __init__(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        self.entries = entries
+        self.fingerprints: Set[str] = set(entries)
+
+    @classmethod
+    def load(cls, path: Path) -> "Baseline":
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        if isinstance(raw, dict):
+            raw = raw.get("findings") or raw.get("fingerprints") or []
+        entries: Dict[str, Dict[str, Any]] = {}
+        for item in raw:
+            if isinstance(item, str):
+                entries[item] = {"fingerprint": item}
+            elif isinstance(item, dict):
+                s = _summary(item)
+                entries[s["fingerprint"]] = s
+        return cls(entries)
+
+    def __contains__(self, fp: str) -> bool:
+        return fp in self.fingerprints
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+
+class Suppressions:
+    """
+    Suppression file (JSON):
+      {"suppressions": [
+        {"fingerprint": "...", "reason": "...", "expires": "2026-12-31"},
+        {"rule": "PQ030", "scope": "Sales", "reason": "...", "expires": "2026-06-30"},
+        {"rule": "NC010", "reason": "legacy naming, accepted"}
+      ]}
+    Entries past their expiry date stop applying and are reported so they resurface. Entries with
+    an unreadable ``expires`` (not YYYY-MM-DD) do not apply either and are reported as invalid.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], today: Optional[date] = None, source: Optional[str] = None) -> None:
+        today = today or date.today()
+        self.by_fingerprint: Dict[str, Dict[str, Any]] = {}
+        self.by_rule_scope: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.expired: List[Dict[str, Any]] = []
+        self.invalid: List[Dict[str, Any]] = []
+        for index, e in enumerate(entries):
+            expires = e.get("expires")
+            if expires:
+                try:
+                    expiry = date.fromisoformat(str(expires))
+                except ValueError:
+                    self.invalid.append({
+                        "file": source, "index": index, "entry": e,
+                        "error": f"expires {expires!r} is not an ISO date (YYYY-MM-DD)",
+                    })
+                    continue
+                if expiry < today:
+                    self.expired.append(e)
+                    continue
+            if e.get("fingerprint"):
+                self.by_fingerprint[e["fingerprint"]] = e
+            elif e.get("rule"):
+                # scope "*" (or none) suppresses the rule everywhere
+                self.by_rule_scope[(e["rule"], e.get("scope") or "*")] = e
+
+    @classmethod
+    def load(cls, path: Path, today: Optional[date] = None) -> "Suppressions":
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        entries = raw.get("suppressions", []) if isinstance(raw, dict) else raw
+        return cls([e for e in entries if isinstance(e, dict)], today=today, source=str(path))
+
+    def match(self, finding: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        hit = self.by_fingerprint.get(finding.get("fingerprint") or fingerprint(finding))
+        if hit is None and self.by_rule_scope:
+            rule = finding.get("id", "")
+            hit = self.by_rule_scope.get((rule, finding_scope(finding))) or self.by_rule_scope.get((rule, "*"))
+        return hit
+
+
+@dataclass
+class BaselineDiff:
+    new: List[Dict[str, Any]] = field(default_factory=list)
+    existing: int = 0
+    resolved: List[Dict[str, Any]] = field(default_factory=list)
+    suppressed: List[Dict[str, Any]] = field(default_factory=list)
+    expired_suppressions: List[Dict[str, Any]] = field(default_factory=list)
+    invalid_suppressions: List[Dict[str, Any]] = field(default_factory=list)
+    has_baseline: bool = False
+
+    def gate_failed(self, fail_on: str = "LOW") -> bool:
+        """True when a new finding at or above ``fail_on`` severity appeared since the baseline."""
+        threshold = _SEVERITY_RANK.get(fail_on.upper(), 1)
+        return any(_SEVERITY_RANK.get(f.get("severity", "INFO"), 0) >= threshold for f in self.new)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "summary": {
+                "hasBaseline": self.has_baseline,
+                "new": len(self.new),
+                "existing": self.existing,
+                "resolved": len(self.resolved),
+                "suppressed": len(self.suppressed),
+                "expiredSuppressions": len(self.expired_suppressions),
+                "invalidSuppressions": len(self.invalid_suppressions),
+            },
+            "new": self.new,
+            "resolved": self.resolved,
+            "suppressed": self.suppressed,
+            "expiredSuppressions": self.expired_suppressions,
+            "invalidSuppressions": self.invalid_suppressions,
+        }
+
+
+def apply_suppressions(
+    findings: List[Dict[str, Any]], suppressions: Optional[Suppressions]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Split findings into (kept, suppressed)."""
+    if suppressions is None:
+        return findings, []
+    kept: List[Dict[str, Any]] = []
+    suppressed: List[Dict[str, Any]] = []
+    for f in findings:
+        hit = suppressions.match(f)
+        if hit is None:
+            kept.append(f)
+        else:
+            suppressed.append({**_summary(f), "reason": hit.get("reason"), "expires": hit.get("expires")})
+    return kept, suppressed
+
+
+def diff_against_baseline(
+    findings: List[Dict[str, Any]],
+    baseline: Optional[Baseline],
+    suppressions: Optional[Suppressions] = None,
+) -> Tuple[List[Dict[str, Any]], BaselineDiff]:
+    """
+    Drop suppressed findings, then classify the rest against the baseline.
+    Findings present in the baseline are tagged ``baselineStatus: "existing"``, others ``"new"``.
+    Returns (kept findings, diff).
+    """
+    kept, suppressed = apply_suppressions(findings, suppressions)
+    diff = BaselineDiff(
+        suppressed=suppressed,
+        expired_suppressions=list(suppressions.expired) if suppressions else [],
+        invalid_suppressions=list(suppressions.invalid) if suppressions else [],
+        has_baseline=baseline is not None,
+    )
+    if baseline is None:
+        return kept, diff
+
+    seen: Set[str] = set()
+    for f in kept:
+        fp = f.get("fingerprint") or fingerprint(f)
+        seen.add(fp)
+        if fp in baseline:
+            f["baselineStatus"] = "existing"
+            diff.existing += 1
+        else:
+            f["baselineStatus"] = "new"
+            diff.new.append(f)
+    suppressed_fps = {s["fingerprint"] for s in suppressed}
+    diff.resolved = [
+        e for fp, e in baseline.entries.items() if fp not in seen and fp not in suppressed_fps
+    ]
+    return kept, diff
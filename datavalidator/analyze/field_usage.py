@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Relative per-row storage weight by dataType. Without row counts this is only a ranking aid:
+# strings and high-precision numbers/timestamps compress worst in VertiPaq, booleans best.
+_DATATYPE_WEIGHT = {
+    "string": 4.0,
+    "binary": 4.0,
+    "datetime": 3.0,
+    "double": 3.0,
+    "decimal": 2.0,
+    "int64": 2.0,
+    "boolean": 0.5,
+}
+_CALCULATED_FACTOR = 1.5  # calculated columns are stored too, and are compressed after the fact
+_AUTO_DATE_PREFIXES = ("LocalDateTable_", "DateTableTemplate_")
+_SITES_PER_FIELD = 25
+
+_RE_DAX_STRING = re.compile(r'"(?:[^"]|"")*"')
+_RE_DAX_REF = re.compile(r"(?:'((?:[^']|'')+)'|([A-Za-z_][A-Za-z0-9_]*))?\s*\[([^\[\]]+)\]")
+
+Key = Tuple[str, str]
+
+
+def _key(table: str, name: str) -> Key:
+    return (table.strip().lower(), name.strip().lower())
+
+
+def memory_weight(column: Dict[str, Any]) -> float:
+    weight = _DATATYPE_WEIGHT.get(str(column.get("dataType") or "").lower(), 1.0)
+    return weight * (_CALCULATED_FACTOR if column.get("isCalculated") else 1.0)
+
+
+def dax_references(expression: str) -> List[Tuple[Optional[str], str]]:
+    """(table or None, name) for every ``Table[Name]`` / ``'Table'[Name]`` / ``[Name]`` in a DAX expression."""
+    text = _RE_DAX_STRING.sub('""', expression or "")
+    refs: List[Tuple[Optional[str], str]] = []
+    for m in _RE_DAX_REF.finditer(text):
+        table = m.group(1).replace("''", "'") if m.group(1) else m.group(2)
+        refs.append((table, m.group(3)))
+    return refs
+
+
+class FieldUsageIndex:
+    """
+    Which model columns/measures are referenced, and by what.
+
+    Sites are plain strings: ``page/visual`` for visuals, ``pageFilter:page``,
+    ``reportFilter``, ``dax:Table[Object]``, ``relationship:name``, ``sortBy:Table[Column]``
+    and ``hierarchy:Table``. Built in one pass over report references and one over the model.
+    """
+
+    def __init__(self) -> None:
+        self.objects: Dict[Key, Dict[str, Any]] = {}
+        self.sites: Dict[Key, List[str]] = {}
+        self.unresolved: Dict[str, List[str]] = {}
+        self.measure_by_name: Dict[str, Key] = {}
+        self.visual_count = 0
+        self.report_references = 0
+
+    # --- building -------------------------------------------------------------------------
+
+    def add_model(self, model: Dict[str, Any]) -> None:
+        for t in model.get("tables") or []:
+            if not isinstance(t, dict) or not t.get("name"):
+                continue
+            table = t["name"]
+            for c in t.get("columns") or []:
+                self.objects[_key(table, c["name"])] = {
+                    "table": table,
+                    "name": c["name"],
+                    "kind": "column",
+                    "dataType": c.get("dataType"),
+                    "isHidden": bool(c.get("isHidden")),
+                    "isCalculated": bool(c.get("isCalculated")),
+                    "memoryWeight": memory_weight(c),
+                    "autoDateTable": table.startswith(_AUTO_DATE_PREFIXES),
+                    "measuresOnlyTable": bool(t.get("isMeasuresOnly")),
+                }
+            for ms in t.get("measures") or []:
+                key = _key(table, ms["name"])
+                self.objects[key] = {"table": table, "name": ms["name"], "kind": "measure", "memoryWeight": 0.0}
+                self.measure_by_name[key[1]] = key
+
+        # model-side usage: DAX, relationships, sort-by and hierarchy levels
+        for t in model.get("tables") or []:
+            if not isinstance(t, dict) or not t.get("name"):
+                continue
+            table = t["name"]
+            for ms in t.get("measures") or []:
+                self._add_dax(table, ms.get("expression") or "", f"dax:{table}[{ms['name']}]")
+            for c in t.get("columns") or []:
+                if c.get("expression"):
+                    self._add_dax(table, c["expression"], f"dax:{table}[{c['name']}]")
+                if c.get("sortByColumn"):
+                    self._use(_key(table, c["sortByColumn"]), f"sortBy:{table}[{c['name']}]")
+            for p in t.get("partitions") or []:
+                if p.get("kind") == "calculated":
+                    self._add_dax(table, p.get("source") or "", f"dax:{table}")
+            for col in t.get("hierarchyColumns") or []:
+                self._use(_key(table, col), f"hierarchy:{table}")
+        for r in (model.get("relationships") or {}).get("items") or []:
+            site = f"relationship:{r.get('name')}"
+            self._use(_key(r.get("fromTable") or "", r.get("fromColumn") or ""), site)
+            self._use(_key(r.get("toTable") or "", r.get("toColumn") or ""), site)
+
+    def add_report(self, report: Dict[str, Any]) -> None:
+        for ref in report.get("filter_fields") or []:
+            self._add_field(ref, "reportFilter")
+        for page in report.get("pages") or []:
+            pid = page.get("page_id")
+            for ref in page.get("filter_fields") or []:
+                self._add_field(ref, f"pageFilter:{pid}")
+            for v in page.get("visuals") or []:
+                self.visual_count += 1
+                site = f"{pid}/{v.get('visual_id')}"
+                for ref in v.get("fields") or []:
+                    self._add_field(ref, site)
+
+    def _use(self, key: Key, site: str) -> bool:
+        if key not in self.objects:
+            return False
+        self.sites.setdefault(key, []).append(site)
+        return True
+
+    def _add_field(self, ref: str, site: str) -> None:
+        self.report_references += 1
+        table, _, name = ref.partition(".")
+        # Entity.Property splits on the first dot; table names may contain dots too, so retry
+        if not self._use(_key(table, name), site):
+            for i in range(ref.find(".") + 1, len(ref)):
+                if ref[i] == "." and self._use(_key(ref[:i], ref[i + 1:]), site):
+                    return
+            self.unresolved.setdefault(ref, []).append(site)
+
+    def _add_dax(self, table: str, expression: str, site: str) -> None:
+        for ref_table, name in dax_references(expression):
+            if ref_table is not None:
+                self._use(_key(ref_table, name), site)
+                continue
+            measure = self.measure_by_name.get(name.strip().lower())
+            if measure is not None:
+                self._use(measure, site)
+            else:
+                self._use(_key(table, name), site)  # unqualified column in a row context
+
+    # --- lookups --------------------------------------------------------------------------
+
+    def users_of(self, table: str, name: str) -> List[str]:
+        return list(self.sites.get(_key(table, name), []))
+
+    def visuals_using(self, table: str, name: str) -> List[str]:
+        return [s for s in self.sites.get(_key(table, name), []) if ":" not in s and "/" in s]
+
+    def _unused(self, kind: str) -> List[Dict[str, Any]]:
+        rows = [
+            o for k, o in self.objects.items()
+            if o["kind"] == kind and k not in self.sites
+            and not o.get("autoDateTable") and not (kind == "column" and o.get("measuresOnlyTable"))
+        ]
+        rows.sort(key=lambda o: (-o["memoryWeight"], o["table"].lower(), o["name"].lower()))
+        return rows
+
+    def unused_columns(self) -> List[Dict[str, Any]]:
+        return self._unused("column")
+
+    def unused_measures(self) -> List[Dict[str, Any]]:
+        return self._unused("measure")
+
+    def to_dict(self, limit: int = 100) -> Dict[str, Any]:
+        unused_cols = self.unused_columns()
+        unused_measures = self.unused_measures()
+        columns = [o for o in self.objects.values() if o["kind"] == "column"]
+        total_weight = sum(o["memoryWeight"] for o in columns if not o.get("autoDateTable"))
+        unused_weight = sum(o["memoryWeight"] for o in unused_cols)
+        return {
+            "visualCount": self.visual_count,
+            "reportReferences": self.report_references,
+            "columnsTotal": len(columns),
+            "measuresTotal": len(self.objects) - len(columns),
+            "unusedColumnsCount": len(unused_cols),
+            "unusedMeasuresCount": len(unused_measures),
+            "unusedWeightShare": round(unused_weight / total_weight, 3) if total_weight else 0.0,
+            "unusedColumns": [
+                {k: o[k] for k in ("table", "name", "dataType", "isHidden", "isCalculated", "memoryWeight")}
+                for o in unused_cols[:limit]
+            ],
+            "unusedMeasures": [{"table": o["table"], "name": o["name"]} for o in unused_measures[:limit]],
+            "unresolvedFields": [
+                {"field": ref, "usedBy": sites[:5], "uses": len(sites)}
+                for ref, sites in sorted(self.unresolved.items())
+            ][:limit],
+            "usage": {
+                f"{o['table']}.{o['name']}": {"uses": len(self.sites[k]), "sites": self.sites[k][:_SITES_PER_FIELD]}
+                for k, o in sorted(self.objects.items())
+                if k in self.sites
+            },
+        }
+
+
+def build_field_usage(inventory: Dict[str, Any]) -> FieldUsageIndex:
+    index = FieldUsageIndex()
+    index.add_model(inventory.get("model") or {})
+    index.add_report(inventory.get("report") or {})
+    return index
+
@@ -1,18 +1,64 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
 
+from datavalidator.analyze.baseline import add_fingerprints
+from datavalidator.analyze.render_cost import page_severity
 from datavalidator.analyze.signals_builder import build_signals
 
 
+# issue -> (severity, title, recommendation); ids below
+_BLOAT_RULES = [
+    ("autoDateTable", "MED", "Auto date/time tables in model",
+     "Turn off Auto date/time (File > Options > Data Load) and use one shared, marked Date table; each date column otherwise gets its own hidden calendar table."),
+    ("calculatedColumn", "MED", "Calculated columns on fact tables",
+     "Move calculated columns on large fact tables into Power Query or the source view so they are compressed with the table and not recomputed on every refresh."),
+    ("dateTimePrecision", "LOW", "Date/time columns keep a time component",
+     "Change columns that only need the date to the Date type, or split date and time into separate columns to cut cardinality."),
+    ("floatingPoint", "LOW", "Floating-point numeric columns",
+     "Use Fixed decimal (currency) or whole numbers where full double precision is not needed; they encode and compress better."),
+]
+_BLOAT_IDS = {"autoDateTable": "MD030", "calculatedColumn": "MD031", "dateTimePrecision": "MD032", "floatingPoint": "MD033"}
+# refresh policy risks that usually mean whole-table reloads
+_FULL_REFRESH_RISKS = {"noRangeFilter", "filterNotFolding", "incrementalCoversRolling"}
+
+# native SQL issue -> (id, severity, title, recommendation)
+_NATIVE_SQL_RULES = [
+    ("parameterConcatenation", "PQ050", "HIGH", "Native SQL built by string concatenation",
+     "Pass values as parameters (Value.NativeQuery's third argument) or filter in M after the source step; concatenated SQL is open to injection and cannot be folded or cached by the engine."),
+    ("selectStar", "PQ051", "MED", "Native SQL uses SELECT *",
+     "List only the columns the model loads; SELECT * pulls every column across the wire and breaks when the source schema changes."),
+    ("missingWhere", "PQ052", "MED", "Native SQL reads whole tables",
+     "Add a WHERE clause (date window, active rows) or use incremental refresh so each refresh reads only the rows it needs."),
+    ("nonSargable", "PQ053", "MED", "Native SQL filters on function-wrapped columns",
+     "Compare the bare column against a computed value (OrderDate >= '2024-01-01' instead of YEAR(OrderDate) = 2024) so the source can use its indexes."),
+    ("orderByInSubquery", "PQ054", "LOW", "ORDER BY inside native SQL subqueries",
+     "Remove ORDER BY from subqueries and derived tables; sort order is not preserved there and the extra sort costs source time."),
+]
+
+
+def _has_local_model(inventory: Dict[str, Any]) -> bool:
+    """True when a semantic model was found and extracted for this inventory (artifact units say so explicitly)."""
+    if "hasLocalModel" in inventory:
+        return bool(inventory["hasLocalModel"])
+    return bool((inventory.get("paths") or {}).get("semanticModelDir"))
+
+
+def _resource_evidence(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{k: r[k] for k in ("name", "kind", "bytes", "estimatedSavingsBytes", "uses")} for r in rows[:15]]
+
+
 def build_findings(inventory: Dict[str, Any]) -> Dict[str, Any]:
+    if inventory.get("artifacts"):
+        return _build_artifact_findings(inventory)
     signals = build_signals(inventory)
     findings: List[Dict[str, Any]] = []
 
     pq = (signals.get("powerQuery") or {})
     pq_count = pq.get("count", 0)
     inc = signals.get("incremental") or {}
-    inc_ready = bool(inc.get("hasRangeParamsOrRefs"))
+    inc_ready = bool(inc.get("hasRangeParamsOrRefs")) or bool(inc.get("policyCount"))
     param_names = (signals.get("parameters") or {}).get("names", [])
     hardcoding = signals.get("hardcoding") or {}
     naming = signals.get("naming") or {}
@@ -49,6 +95,36 @@ def build_findings(inventory: Dict[str, Any]) -> Dict[str, Any]:
             }
         })
 
+    policies = inc.get("policies") or []
+    risky = [p for p in policies if p.get("risks")]
+    if risky:
+        findings.append({
+            "id": "PQ011",
+            "severity": "HIGH" if any(r["risk"] in _FULL_REFRESH_RISKS for p in risky for r in p["risks"]) else "MED",
+            "category": "PowerQuery",
+            "title": "Incremental refresh policy likely to refresh more than intended",
+            "message": f"{len(risky)} of {len(policies)} refresh policies have a missing or non-folding RangeStart/RangeEnd filter, overlapping bounds or oversized windows.",
+            "recommendation": "Filter on RangeStart (>=) and RangeEnd (<) in a step that folds to the source, before any Table.Buffer or non-foldable step, and keep the incremental window well below the stored window.",
+            "evidence": {
+                "tables": [{"table": p["table"], "rangeFilterStep": p["rangeFilterStep"], "risks": p["risks"]} for p in risky[:15]],
+            }
+        })
+    if policies:
+        findings.append({
+            "id": "PQ012",
+            "severity": "INFO",
+            "category": "PowerQuery",
+            "title": "Incremental refresh policies",
+            "message": f"{len(policies)} tables use incremental refresh: about {inc.get('estimatedPartitions', 0)} partitions in total, up to {inc.get('refreshedPerRun', 0)} reprocessed per refresh.",
+            "recommendation": "Check the partition counts against refresh duration and capacity limits.",
+            "evidence": {
+                "policies": [
+                    {k: p.get(k) for k in ("table", "rollingWindowPeriods", "rollingWindowGranularity", "incrementalPeriods", "incrementalGranularity", "mode", "estimatedPartitions", "refreshedPerRun")}
+                    for p in policies[:25]
+                ],
+            }
+        })
+
     hardcoded_count = hardcoding.get("count", 0)
     if hardcoded_count > 0:
         findings.append({
@@ -145,6 +221,165 @@ def build_findings(inventory: Dict[str, Any]) -> Dict[str, Any]:
             }
         })
 
+    for rule_id, kind in (("NC012", "columns"), ("NC013", "measures")):
+        styles = naming.get(kind) or {}
+        if not (styles.get("dominantStyle") and styles.get("outliers")):
+            continue
+        findings.append({
+            "id": rule_id,
+            "severity": "LOW" if (styles.get("dominantCoverage") or 0) >= 0.5 else "MED",
+            "category": "Naming",
+            "title": f"Inconsistent {kind[:-1]} naming convention",
+            "message": f"Dominant {kind[:-1]} naming style is '{styles['dominantStyle']}', but {len(styles['outliers'])} multi-word {kind} use another style.",
+            "recommendation": f"Rename the outlier {kind} to the dominant style; users search the field list by name.",
+            "evidence": {
+                "dominantStyle": styles["dominantStyle"],
+                "styleDistribution": styles.get("styles", {}),
+                "outliers": styles["outliers"][:25],
+            }
+        })
+
+    near = naming.get("nearDuplicates") or {}
+    near_groups = (near.get("columns") or []) + (near.get("measures") or [])
+    if near_groups:
+        findings.append({
+            "id": "NC014",
+            "severity": "MED" if any(g["match"] == "near" for g in near_groups) else "LOW",
+            "category": "Naming",
+            "title": "Same column or measure name written several ways",
+            "message": (
+                f"{near.get('columnGroupCount', 0)} column and {near.get('measureGroupCount', 0)} measure name groups differ only by "
+                "spacing, casing, abbreviation or a typo (e.g. Sales Amount / SalesAmount / Sales_Amt)."
+            ),
+            "recommendation": "Pick one spelling per business term, rename the variants, and remove columns that duplicate each other's data.",
+            "evidence": {
+                "columns": (near.get("columns") or [])[:15],
+                "measures": (near.get("measures") or [])[:15],
+            }
+        })
+
+    embedded = signals.get("embeddedData") or {}
+    large_payloads = [r for r in (embedded.get("payloads") or []) if (r.get("approxBytes") or 0) >= 1_000_000]
+    if large_payloads:
+        findings.append({
+            "id": "PQ040",
+            "severity": "MED",
+            "category": "PowerQuery",
+            "title": "Large embedded data payloads in model",
+            "message": f"{len(large_payloads)} embedded literals of 1 MB or more (about {embedded.get('totalBytes', 0):,} bytes embedded in total).",
+            "recommendation": "Move Enter Data / Binary.Decompress tables to a real source (file, dataflow, database) so the model definition stays small and refreshable.",
+            "evidence": {
+                "tables": [
+                    {"table": r.get("table"), "line": r.get("line"), "approxBytes": r.get("approxBytes"), "context": r.get("context")}
+                    for r in large_payloads[:15]
+                ],
+            }
+        })
+
+    m_dupes = signals.get("mDuplicates") or {}
+    repeated_reads = [c for c in m_dupes.get("clusters") or [] if c.get("roundTripsSaved")]
+    if repeated_reads:
+        findings.append({
+            "id": "PQ060",
+            "severity": "MED" if m_dupes.get("roundTripsSaved", 0) >= 3 else "LOW",
+            "category": "PowerQuery",
+            "title": "Copy-pasted queries read the same source",
+            "message": (
+                f"{len(repeated_reads)} groups of near-identical M queries read the same source objects; "
+                f"about {m_dupes['roundTripsSaved']} source round trips per refresh could be saved."
+            ),
+            "recommendation": "Load each shared source once in a staging query or dataflow and reference it from the tables that need it; keep the per-table edits as steps on top.",
+            "evidence": {
+                "clusters": [
+                    {k: c[k] for k in ("match", "size", "similarity", "roundTripsSaved", "sharedSources", "members")}
+                    for c in repeated_reads[:10]
+                ],
+            }
+        })
+
+    refresh_plan = signals.get("refreshPlan") or {}
+    dominant = refresh_plan.get("dominant")
+    if dominant:
+        via = f" (through {', '.join(dominant['references'])})" if dominant.get("references") else ""
+        findings.append({
+            "id": "PQ070",
+            "severity": "HIGH" if dominant["costShare"] >= 0.7 else "MED",
+            "category": "PowerQuery",
+            "title": "One non-folding table dominates refresh time",
+            "message": (
+                f"Table '{dominant['table']}' uses {' and '.join(dominant['reasons'])}{via} without query folding "
+                f"and accounts for about {dominant['costShare']:.0%} of the estimated refresh cost."
+            ),
+            "recommendation": "Move the heavy work upstream (a foldable source, a dataflow or a view), drop Table.Buffer unless the buffered table is read several times, or split the table with an incremental refresh policy.",
+            "evidence": {
+                "table": dominant["table"],
+                "costShare": dominant["costShare"],
+                "reasons": dominant["reasons"],
+                "criticalPath": refresh_plan.get("criticalPath"),
+            }
+        })
+    if refresh_plan.get("taskCount"):
+        path = refresh_plan.get("criticalPath") or {}
+        peaks = refresh_plan.get("peakConnections") or {}
+        findings.append({
+            "id": "PQ071",
+            "severity": "INFO",
+            "category": "PowerQuery",
+            "title": "Refresh plan estimate",
+            "message": (
+                f"{refresh_plan['taskCount']} refresh tasks over {refresh_plan['tableCount']} tables at parallelism {refresh_plan['parallelism']}; "
+                f"critical path: {' -> '.join(path.get('tables') or []) or 'none'}; "
+                f"peak connections: {', '.join(f'{s} {n}' for s, n in peaks.items()) or 'none'}."
+            ),
+            "recommendation": "Start with the tables on the critical path; relative costs are heuristic (no row counts), so confirm with refresh history before tuning.",
+            "evidence": {
+                "estimatedMakespan": refresh_plan.get("estimatedMakespan"),
+                "totalCost": refresh_plan.get("totalCost"),
+                "parallelEfficiency": refresh_plan.get("parallelEfficiency"),
+                "criticalPath": path,
+                "peakConnections": peaks,
+                "topTables": [{k: t[k] for k in ("table", "sources", "folds", "costShare")} for t in (refresh_plan.get("tables") or [])[:5]],
+            }
+        })
+
+    native_sql = signals.get("nativeSql") or {}
+    for issue, rule_id, severity, title, recommendation in _NATIVE_SQL_RULES:
+        hits = [st for st in native_sql.get("statements") or [] if any(i["issue"] == issue for i in st["issues"])]
+        if not hits:
+            continue
+        findings.append({
+            "id": rule_id,
+            "severity": severity,
+            "category": "PowerQuery",
+            "title": title,
+            "message": f"{len(hits)} native SQL statements in {len({st['table'] for st in hits})} tables: {next(i['detail'] for i in hits[0]['issues'] if i['issue'] == issue)}.",
+            "recommendation": recommendation,
+            "evidence": {
+                "statements": [
+                    {"table": st["table"], "statementHash": st["statementHash"], "sql": st["sql"][:160], "concatenated": st["concatenated"][:3]}
+                    for st in hits[:10]
+                ],
+            }
+        })
+
+    scan_timeouts = signals.get("scanTimeouts") or []
+    if scan_timeouts:
+        files = sorted({str(e.get("file")) for e in scan_timeouts})
+        findings.append({
+            "id": "SCAN_TIMEOUT",
+            "severity": "MED",
+            "category": "PowerQuery",
+            "title": "Heuristic scan skipped part of the model",
+            "message": f"Pattern matching was cut short on {len(files)} file(s) (oversized input or time budget exceeded); results for them may be incomplete.",
+            "recommendation": "Check the listed tables for unusually large or machine-generated M (embedded data, very long lines) and review them manually.",
+            "evidence": {
+                "events": [
+                    {"file": e.get("file"), "pattern": e.get("pattern"), "reason": e.get("reason"), "inputChars": e.get("inputChars")}
+                    for e in scan_timeouts[:25]
+                ],
+            }
+        })
+
     if sources.get("multipleSources"):
         findings.append({
             "id": "MD010",
@@ -156,4 +391,326 @@ def build_findings(inventory: Dict[str, Any]) -> Dict[str, Any]:
             "evidence": {"connectors": sources.get("connectors", [])}
         })
 
+    # Field usage: only meaningful when the report actually has visuals bound to this model
+    usage = signals.get("fieldUsage") or {}
+    if usage.get("visualCount") and usage.get("unusedColumnsCount"):
+        findings.append({
+            "id": "MD020",
+            "severity": "MED",
+            "category": "Model",
+            "title": "Model columns not used by the report",
+            "message": f"{usage['unusedColumnsCount']} of {usage.get('columnsTotal', 0)} columns are not referenced by any visual, filter, measure, relationship or sort-by column (about {usage.get('unusedWeightShare', 0):.0%} of the estimated column storage).",
+            "recommendation": "Remove unused columns in Power Query (not just hide them); start with the highest-weight text and timestamp columns. Check other reports bound to the same model first.",
+            "evidence": {
+                "columns": [
+                    {"table": c["table"], "column": c["name"], "dataType": c.get("dataType"), "memoryWeight": c.get("memoryWeight")}
+                    for c in usage.get("unusedColumns", [])[:25]
+                ],
+            }
+        })
+    if usage.get("visualCount") and usage.get("unusedMeasuresCount"):
+        findings.append({
+            "id": "MD021",
+            "severity": "LOW",
+            "category": "Model",
+            "title": "Measures not used by the report",
+            "message": f"{usage['unusedMeasuresCount']} measures are not referenced by any visual, filter or other measure.",
+            "recommendation": "Delete dead measures or move them to a documented library table so the field list stays navigable.",
+            "evidence": {"measures": [{"table": m["table"], "measure": m["name"]} for m in usage.get("unusedMeasures", [])[:25]]},
+        })
+    lineage = signals.get("lineage") or {}
+    if usage.get("visualCount") and lineage.get("feedsOnlyDeadObjectsCount"):
+        findings.append({
+            "id": "MD050",
+            "severity": "LOW",
+            "category": "Model",
+            "title": "Columns and measures that only feed unused objects",
+            "message": f"{lineage['feedsOnlyDeadObjectsCount']} columns/measures are referenced, but only by measures, calculated columns or tables that never reach a visual, filter or relationship.",
+            "recommendation": "Remove the dead chain from the end: delete the unused measures or calculated objects first, then the columns that only fed them.",
+            "evidence": {"objects": lineage.get("feedsOnlyDeadObjects", [])[:25]},
+        })
+    # thin reports (byConnection, unbound) have no model to resolve fields against
+    if usage.get("unresolvedFields") and _has_local_model(inventory):
+        findings.append({
+            "id": "RP010",
+            "severity": "MED",
+            "category": "Report",
+            "title": "Visuals reference fields missing from the model",
+            "message": f"{len(usage['unresolvedFields'])} referenced fields do not exist in the semantic model; affected visuals render as errors.",
+            "recommendation": "Re-bind or remove the broken fields (renamed or deleted columns/measures) in the affected visuals and filters.",
+            "evidence": {"fields": usage["unresolvedFields"][:25]},
+        })
+
+    # Report pages whose estimated render cost is high (replaces the raw visual-count check)
+    for page in (signals.get("renderCost") or {}).get("pages") or []:
+        sev = page_severity(page.get("estimatedCost") or 0.0)
+        if not sev:
+            continue
+        findings.append({
+            "id": "RP002",
+            "severity": sev,
+            "category": "Report",
+            "title": "Expensive page render",
+            "message": f"Page '{page['page']}' issues ~{page['estimatedQueries']} queries from {page['visualCount']} visuals (estimated cost {page['estimatedCost']:.0f}).",
+            "recommendation": "Move detail tables/matrices and rarely used visuals to drill-through or tooltip pages, trim long literal filter lists, and avoid slicers on high-cardinality columns.",
+            "evidence": {
+                "page": page["page"],
+                "estimatedQueries": page["estimatedQueries"],
+                "estimatedCost": page["estimatedCost"],
+                "heavyVisuals": page.get("heavyVisuals", []),
+            }
+        })
+
+    dups = signals.get("reportDuplicates") or {}
+    if dups.get("duplicateVisualGroups"):
+        savings = dups.get("duplicateVisualQuerySavings", 0)
+        findings.append({
+            "id": "RP020",
+            "severity": "MED" if savings >= 10 else "LOW",
+            "category": "Report",
+            "title": "Duplicate visuals with identical queries",
+            "message": f"{dups['duplicateVisualGroups']} groups of visuals share the same query and filter definition; removing the copies would save ~{savings} queries per full report render.",
+            "recommendation": "Keep one instance per page, reuse it through drill-through/tooltip or bookmarks, and delete copies left over from copy-paste.",
+            "evidence": {
+                "groups": [
+                    {"visualType": g["visualType"], "fields": g["fields"][:8], "count": g["count"], "visuals": g["visuals"][:10]}
+                    for g in dups.get("exact", [])[:10]
+                ],
+            }
+        })
+    if dups.get("duplicatePageGroups"):
+        findings.append({
+            "id": "RP021",
+            "severity": "MED",
+            "category": "Report",
+            "title": "Copy-pasted report pages",
+            "message": f"{dups['duplicatePageGroups']} sets of pages contain the same visuals with the same queries.",
+            "recommendation": "Merge duplicated pages and use slicers, bookmarks or drill-through to switch context instead of page copies.",
+            "evidence": {"pageGroups": [{"pages": g["pages"], "visualsPerPage": g["visualsPerPage"]} for g in dups.get("pages", [])[:10]]},
+        })
+    if dups.get("nearDuplicateGroups"):
+        findings.append({
+            "id": "RP022",
+            "severity": "INFO",
+            "category": "Report",
+            "title": "Near-duplicate visuals",
+            "message": f"{dups['nearDuplicateGroups']} groups of visuals use the same type and fields but differ in sort, aggregation or filter values.",
+            "recommendation": "Check whether these can become one visual with a slicer or field parameter.",
+            "evidence": {
+                "groups": [
+                    {"visualType": g["visualType"], "fields": g["fields"][:8], "count": g["count"], "visuals": g["visuals"][:10]}
+                    for g in dups.get("near", [])[:10]
+                ],
+            }
+        })
+
+    storage = signals.get("storageModes") or {}
+    rels = storage.get("relationships") or []
+    dual_candidates = [r for r in rels if r.get("shouldBeDual")]
+    if dual_candidates:
+        findings.append({
+            "id": "MD040",
+            "severity": "HIGH",
+            "category": "Model",
+            "title": "Import tables joined to DirectQuery tables",
+            "message": f"{len(dual_candidates)} relationships connect Import and DirectQuery tables; they are limited relationships, so joins run in the engine after both sides are queried.",
+            "recommendation": "Set the dimension tables on these relationships to Dual storage mode so queries can join them at the DirectQuery source.",
+            "evidence": {
+                "relationships": [
+                    {k: r[k] for k in ("name", "fromTable", "fromMode", "toTable", "toMode")} for r in dual_candidates[:15]
+                ],
+            }
+        })
+    other_limited = [r for r in rels if r.get("limited") and not r.get("shouldBeDual")]
+    if other_limited:
+        findings.append({
+            "id": "MD041",
+            "severity": "MED",
+            "category": "Model",
+            "title": "Limited relationships across source groups",
+            "message": f"{len(other_limited)} relationships are limited (different DirectQuery sources or many-to-many); filters across them are applied late and cannot use source-side joins.",
+            "recommendation": "Keep related tables in the same source group where possible, or add an aggregation/bridge table so visuals do not depend on limited relationships.",
+            "evidence": {
+                "relationships": [
+                    {k: r[k] for k in ("name", "fromTable", "fromMode", "toTable", "toMode", "reason")} for r in other_limited[:15]
+                ],
+            }
+        })
+    broken_aggs = [a for a in storage.get("aggregations") or [] if a.get("problems")]
+    if broken_aggs:
+        findings.append({
+            "id": "MD042",
+            "severity": "MED",
+            "category": "Model",
+            "title": "Aggregation mappings that will not be used",
+            "message": f"{len(broken_aggs)} aggregation column mappings point at missing objects or cannot redirect queries.",
+            "recommendation": "Map aggregation columns to existing DirectQuery base columns and store the aggregation table in Import (or Dual) mode.",
+            "evidence": {"mappings": broken_aggs[:15]},
+        })
+    dq_facts = storage.get("directQueryFactsWithoutAggregations") or []
+    if dq_facts:
+        findings.append({
+            "id": "MD043",
+            "severity": "INFO",
+            "category": "Model",
+            "title": "DirectQuery fact tables without aggregations",
+            "message": f"{len(dq_facts)} DirectQuery tables on the many side of relationships have no aggregation table mapped to them; every visual query goes to the source.",
+            "recommendation": "For frequently used grains, add an Import aggregation table with alternateOf mappings to answer summary visuals from memory.",
+            "evidence": {"tables": dq_facts[:25], "modeCounts": storage.get("modeCounts")},
+        })
+
+    res = signals.get("reportResources") or {}
+    res_rows = res.get("resources") or []
+
+    oversized = [r for r in res_rows if {"oversizedImage", "largeTheme"} & set(r["problems"])]
+    if oversized:
+        savings = sum(r["estimatedSavingsBytes"] for r in oversized)
+        findings.append({
+            "id": "RP030",
+            "severity": "MED",
+            "category": "Report",
+            "title": "Oversized images and theme files",
+            "message": f"{len(oversized)} report resources are large enough to slow report load (~{savings:,} bytes could be saved by resizing/compressing images).",
+            "recommendation": "Resize images to their display size and compress them (or use SVG); trim unused sections from custom theme JSON.",
+            "evidence": {"resources": _resource_evidence(oversized)},
+        })
+    unused = [r for r in res_rows if "unused" in r["problems"]]
+    if unused:
+        savings = sum(r["estimatedSavingsBytes"] for r in unused)
+        findings.append({
+            "id": "RP031",
+            "severity": "MED" if savings >= 1_000_000 else "LOW",
+            "category": "Report",
+            "title": "Unused report resources",
+            "message": f"{len(unused)} registered resources or custom visual packages are not referenced by any page, visual or theme ({savings:,} bytes).",
+            "recommendation": "Delete unused images and custom visual packages from the report (View > Custom visuals / resource packages) so they are not shipped with it.",
+            "evidence": {"resources": _resource_evidence(unused)},
+        })
+    heavy_cv = [r for r in res_rows if "heavyCustomVisual" in r["problems"]]
+    if heavy_cv:
+        findings.append({
+            "id": "RP032",
+            "severity": "MED" if any(r["uses"] >= 5 for r in heavy_cv) else "LOW",
+            "category": "Report",
+            "title": "Heavy custom visuals",
+            "message": f"{len(heavy_cv)} custom visual packages are over {1_000_000:,} bytes; each one is downloaded and initialized in its own sandbox before it renders.",
+            "recommendation": "Prefer a built-in visual where one covers the need, or replace the package with a lighter/certified alternative.",
+            "evidence": {"resources": _resource_evidence(heavy_cv)},
+        })
+
+    # Model bloat: one finding per issue type, largest estimated savings first
+    bloat = signals.get("modelBloat") or {}
+    bloat_issues = bloat.get("issues") or []
+    bloat_findings = []
+    for issue, severity, title, recommendation in _BLOAT_RULES:
+        rows = [i for i in bloat_issues if i.get("issue") == issue]
+        if not rows:
+            continue
+        savings = (bloat.get("savingsByIssue") or {}).get(issue, 0.0)
+        share = savings / bloat["totalWeight"] if bloat.get("totalWeight") else 0.0
+        bloat_findings.append((savings, {
+            "id": _BLOAT_IDS[issue],
+            "severity": severity,
+            "category": "Model",
+            "title": title,
+            "message": f"{len(rows)} {'tables' if issue == 'autoDateTable' else 'columns'} affected; estimated {share:.0%} of relative model weight is avoidable.",
+            "recommendation": recommendation,
+            "evidence": {
+                "items": [
+                    {"table": i["table"], "column": i.get("column"), "estimatedSavings": i["estimatedSavings"]}
+                    for i in rows[:20]
+                ],
+            }
+        }))
+    bloat_findings.sort(key=lambda sf: sf[0], reverse=True)
+    findings.extend(f for _, f in bloat_findings)
+
+    add_fingerprints(findings)
+    return {"signals": signals, "findings": findings}
+
+
+def _merged_report(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Pages and filters of every report bound to one model, so model usage rules see all consumers."""
+    pages: List[Dict[str, Any]] = []
+    filters: List[str] = []
+    for a in reports:
+        rp = a.get("report") or {}
+        pages.extend({**p, "page_id": f"{a['name']}/{p.get('page_id')}"} for p in rp.get("pages") or [])
+        filters.extend(rp.get("filter_fields") or [])
+    return {"pages": pages, "filter_fields": filters, "theme_present": any((a.get("report") or {}).get("theme_present") for a in reports)}
+
+
+def model_inventories(inventory: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    (model name, inventory) per semantic model, with the pages of every report bound to it.
+    Single-artifact inventories come back unchanged under the name "".
+    """
+    artifacts = inventory.get("artifacts") or []
+    models = [a for a in artifacts if a.get("kind") == "semanticModel"]
+    if not models:
+        return [("", inventory)]
+    reports = [a for a in artifacts if a.get("kind") == "report"]
+    base = {"rootDir": inventory.get("rootDir"), "project": inventory.get("project")}
+    return [
+        (m["name"], {
+            **base,
+            "paths": {"reportDir": "", "semanticModelDir": m["path"]},
+            "powerQuery": m.get("powerQuery") or {},
+            "model": m.get("model") or {},
+            "report": _merged_report([r for r in reports if r.get("model") == m["name"]]),
+        })
+        for m in models
+    ]
+
+
+def _build_artifact_findings(inventory: Dict[str, Any], max_workers: int = 4) -> Dict[str, Any]:
+    """
+    Findings for a project with several reports/models. Model, Power Query and naming rules run
+    once per semantic model (against the pages of every report bound to it); report rules run
+    once per report against its bound model. Each finding names its artifact in the evidence.
+    """
+    artifacts = inventory["artifacts"]
+    models = {a["name"]: a for a in artifacts if a["kind"] == "semanticModel"}
+    reports = [a for a in artifacts if a["kind"] == "report"]
+    base = {"rootDir": inventory.get("rootDir"), "project": inventory.get("project")}
+
+    # (artifact, is report, unit inventory)
+    units: List[Tuple[Dict[str, Any], bool, Dict[str, Any]]] = [
+        (models[name], False, unit) for name, unit in model_inventories(inventory)
+    ]
+    for r in reports:
+        m = models.get(r.get("model") or "")
+        # byConnection/unbound reports have no local model: model-dependent report rules are skipped
+        units.append((r, True, {
+            **base,
+            "paths": {"reportDir": r["path"], "semanticModelDir": m["path"] if m else ""},
+            "hasLocalModel": m is not None,
+            "powerQuery": (m or {}).get("powerQuery") or {},
+            "model": (m or {}).get("model") or {},
+            "report": r.get("report") or {},
+        }))
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dv-findings") as pool:
+        bundles = list(pool.map(lambda u: build_findings(u[2]), units))
+
+    findings: List[Dict[str, Any]] = []
+    summary: List[Dict[str, Any]] = []
+    for (artifact, is_report, unit), bundle in zip(units, bundles):
+        own = [f for f in bundle["findings"] if (f.get("category") == "Report") == is_report]
+        for f in own:
+            f["evidence"] = {**(f.get("evidence") or {}), "artifact": artifact["name"]}
+        findings.extend(own)
+        by_severity: Dict[str, int] = {}
+        for f in own:
+            by_severity[f["severity"]] = by_severity.get(f["severity"], 0) + 1
+        entry = {"name": artifact["name"], "kind": artifact["kind"], "findings": len(own), "bySeverity": by_severity}
+        entry.update({"model": artifact.get("model"), "connection": artifact.get("connection"), "hasLocalModel": unit.get("hasLocalModel")} if is_report else {"reports": artifact.get("reports", [])})
+        summary.append(entry)
+    add_fingerprints(findings)
+
+    # top-level signals describe the primary report and its model, as for single-artifact projects
+    primary = inventory.get("paths", {}).get("reportDir") or inventory.get("paths", {}).get("semanticModelDir")
+    index = next((i for i, (a, _, _) in enumerate(units) if a["path"] == primary), 0)
+    signals = dict(bundles[index]["signals"]) if bundles else {}
+    signals["artifacts"] = summary
     return {"signals": signals, "findings": findings}
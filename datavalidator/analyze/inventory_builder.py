@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import asdict, is_dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, is_dataclass, replace
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
-from datavalidator.extract.pbip_loader import load_pbip
+from datavalidator.core.cache import FileCache
+from datavalidator.extract.pbip_loader import PbipContext, load_pbip
 from datavalidator.extract.pq_extractor import extract_powerquery
 from datavalidator.extract.report_extractor import extract_report
 from datavalidator.extract.tmdl_extractor import extract_semantic_model
+from datavalidator.extract.vfs import as_path
 
 
 def _to_jsonable(x: Any) -> Any:
@@ -24,19 +27,77 @@ def _to_jsonable(x: Any) -> Any:
     return str(x)
 
 
-def build_inventory(project_path: Path) -> Dict[str, Any]:
-    project_path = Path(project_path)
-    ctx = load_pbip(project_path)
-
-    pq = _to_jsonable(extract_powerquery(ctx)) or {}
-    rp = _to_jsonable(extract_report(ctx)) or {}
-    model = _to_jsonable(extract_semantic_model(ctx)) or {}
-
+def _model_inventory(ctx: Any, cache: Optional[FileCache]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    pq = _to_jsonable(extract_powerquery(ctx, cache=cache)) or {}
+    model = _to_jsonable(extract_semantic_model(ctx, cache=cache)) or {}
     pq.setdefault("queries", [])
     pq.setdefault("count", len(pq.get("queries") or []))
     pq.setdefault("partitionsWithM", pq.get("partitionsWithM") or pq.get("queries") or [])
+    return pq, model
+
+
+def _artifact_name(ctx: PbipContext, path: Path) -> str:
+    # relative to the project root so same-named artifacts in different folders stay distinct
+    root, full = str(ctx.project_root).replace("\\", "/"), str(path).replace("\\", "/")
+    return full[len(root):].lstrip("/") if full.startswith(root) else path.name
+
+
+def _artifacts(ctx: PbipContext, cache: Optional[FileCache], max_workers: int) -> List[Dict[str, Any]]:
+    """
+    Every report and semantic model of a multi-artifact project. Each model is extracted once,
+    however many reports bind to it; models and reports are extracted concurrently.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dv-artifact") as pool:
+        model_jobs = [pool.submit(_model_inventory, replace(ctx, model_dir=m), cache) for m in ctx.models]
+        report_jobs = [pool.submit(extract_report, replace(ctx, report_dir=r), cache) for r in ctx.reports]
+        models = [job.result() for job in model_jobs]
+        reports = [_to_jsonable(job.result()) or {} for job in report_jobs]
+
+    names = {str(m): _artifact_name(ctx, m) for m in ctx.models}
+    out: List[Dict[str, Any]] = []
+    for m, (pq, model) in zip(ctx.models, models):
+        out.append({
+            "name": names[str(m)],
+            "kind": "semanticModel",
+            "path": str(m),
+            "reports": [_artifact_name(ctx, r) for r in ctx.reports if ctx.bindings.get(str(r)) == str(m)],
+            "powerQuery": pq,
+            "model": model,
+        })
+    for r, rp in zip(ctx.reports, reports):
+        bound = ctx.bindings.get(str(r))
+        out.append({
+            "name": _artifact_name(ctx, r),
+            "kind": "report",
+            "path": str(r),
+            "model": names.get(bound) if bound else None,
+            "connection": ctx.connections.get(str(r)),
+            "report": rp,
+        })
+    return out
+
+
+def build_inventory(project_path: Path, cache: Optional[FileCache] = None, max_workers: int = 4) -> Dict[str, Any]:
+    """
+    Inventory of a PBIP project. The top-level powerQuery/report/model describe the primary
+    report and its model; projects holding several reports or models also list every artifact
+    under ``artifacts`` (findings are then built per artifact).
+    """
+    project_path = as_path(project_path)
+    ctx = load_pbip(project_path)
+
+    artifacts: List[Dict[str, Any]] = []
+    if ctx.is_multi_artifact:
+        artifacts = _artifacts(ctx, cache, max_workers)
+        primary_model = next((a for a in artifacts if a["kind"] == "semanticModel" and a["path"] == str(ctx.model_dir)), None)
+        primary_report = next((a for a in artifacts if a["kind"] == "report" and a["path"] == str(ctx.report_dir)), None)
+        pq, model = (primary_model["powerQuery"], primary_model["model"]) if primary_model else ({}, {})
+        rp = primary_report["report"] if primary_report else {}
+    else:
+        pq, model = _model_inventory(ctx, cache)
+        rp = _to_jsonable(extract_report(ctx, cache=cache)) or {}
 
-    return {
+    inventory = {
         "rootDir": str(project_path),
         "project": {"rootDir": str(project_path), "name": project_path.name},
         "paths": {
@@ -46,4 +107,7 @@ def build_inventory(project_path: Path) -> Dict[str, Any]:
         "powerQuery": pq,
         "report": rp,
         "model": model,
-    }
\ No newline at end of file
+    }
+    if artifacts:
+        inventory["artifacts"] = artifacts
+    return inventory
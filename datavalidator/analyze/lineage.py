@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import re
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from datavalidator.analyze.field_usage import dax_references
+from datavalidator.extract.m_steps import let_steps
+
+# Node kinds, upstream to downstream
+SOURCE_COLUMN = "sourceColumn"
+COLUMN = "column"
+MEASURE = "measure"
+VISUAL = "visual"
+FILTER = "filter"
+RELATIONSHIP = "relationship"  # key columns stay alive even when no visual shows them
+_CONSUMERS = (VISUAL, FILTER, RELATIONSHIP)
+
+_RE_CONNECTOR = re.compile(r"\b([A-Z][A-Za-z]*\.(?:Database|Databases|DataSource|Catalogs|Contents|Query|Warehouses|Lakehouses|Files|Document|Workbook))\s*\(([^()]*)\)")
+_RE_NAV = re.compile(r'\b(?:Schema|Item|Name|Kind)\s*=\s*"((?:[^"]|"")*)"')
+_RE_RENAME_PAIR = re.compile(r'\{\s*"((?:[^"]|"")*)"\s*,\s*"((?:[^"]|"")*)"\s*\}')
+_RE_WS = re.compile(r"\s+")
+
+
+def _key(table: str, name: str) -> str:
+    return f"{table.strip().lower()}[{name.strip().lower()}]"
+
+
+def source_object(m_text: str, table: str) -> str:
+    """
+    Identity of the source object an M partition reads: first connector call plus navigation
+    items (``Sql.Database(Host,"SalesDb")/dbo/Customer``). Tables reading the same source
+    object share source-column nodes. Native queries and unknown sources are per table.
+    """
+    steps, result = let_steps(m_text or "")
+    text = "\n".join(expr for _, expr in steps) if steps else (result or "")
+    if "Value.NativeQuery" in text:
+        return f"nativeQuery:{table}"
+    m = _RE_CONNECTOR.search(text)
+    if not m:
+        return f"query:{table}"
+    nav = [v.replace('""', '"') for v in _RE_NAV.findall(text[m.end():])]
+    return "/".join([f"{m.group(1)}({_RE_WS.sub('', m.group(2))})"] + nav)
+
+
+def renamed_columns(m_text: str) -> Dict[str, str]:
+    """New name -> original name for every ``Table.RenameColumns`` step (chained renames collapse)."""
+    steps, _ = let_steps(m_text or "")
+    original: Dict[str, str] = {}
+    for _, expr in steps:
+        if "Table.RenameColumns" not in expr:
+            continue
+        for old, new in _RE_RENAME_PAIR.findall(expr):
+            old, new = old.replace('""', '"'), new.replace('""', '"')
+            original[new] = original.pop(old, old)
+    return original
+
+
+class LineageGraph:
+    """
+    Column-level lineage: source columns -> model columns -> measures/calculated columns ->
+    visuals and filters. Adjacency is stored as CSR int arrays (offsets + targets) in both
+    directions; every node also carries a bitmask of the consumers it reaches and of the source
+    columns that reach it, so impact and dead-column questions are bit operations.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: List[Dict[str, Any]] = []
+        self.index: Dict[str, int] = {}
+        self._edges: Set[Tuple[int, int]] = set()
+        self.out_offsets = array("l")
+        self.out_targets = array("l")
+        self.in_offsets = array("l")
+        self.in_targets = array("l")
+        self.consumers: List[int] = []  # node ids of visuals/filters; bit i = consumers[i]
+        self.sources: List[int] = []  # node ids of source columns; bit i = sources[i]
+        self.reaches: List[int] = []  # per node: consumer bitmask
+        self.reached_by: List[int] = []  # per node: source-column bitmask
+
+    # --- building -------------------------------------------------------------------------
+
+    def node(self, key: str, kind: str, **attrs: Any) -> int:
+        nid = self.index.get(key)
+        if nid is None:
+            nid = self.index[key] = len(self.nodes)
+            self.nodes.append({"key": key, "kind": kind, **attrs})
+        return nid
+
+    def edge(self, src: int, dst: int) -> None:
+        if src != dst:
+            self._edges.add((src, dst))
+
+    def freeze(self) -> "LineageGraph":
+        n = len(self.nodes)
+        self.out_offsets, self.out_targets = _csr(n, sorted(self._edges))
+        self.in_offsets, self.in_targets = _csr(n, sorted((d, s) for s, d in self._edges))
+        self._edges = set()
+        self.consumers = [i for i, nd in enumerate(self.nodes) if nd["kind"] in _CONSUMERS]
+        self.sources = [i for i, nd in enumerate(self.nodes) if nd["kind"] == SOURCE_COLUMN]
+        self.reaches = self._propagate(self.consumers, self.out_offsets, self.out_targets)
+        self.reached_by = self._propagate(self.sources, self.in_offsets, self.in_targets)
+        return self
+
+    def _propagate(self, seeds: List[int], offsets: array, targets: array) -> List[int]:
+        """Bitmask per node of the seeds reachable along (offsets, targets); memoized iterative DFS."""
+        n = len(self.nodes)
+        masks = [0] * n
+        for bit, nid in enumerate(seeds):
+            masks[nid] = 1 << bit
+        state = [0] * n  # 0 new, 1 on stack, 2 done
+        for start in range(n):
+            if state[start]:
+                continue
+            stack = [(start, offsets[start])]
+            state[start] = 1
+            while stack:
+                nid, pos = stack[-1]
+                if pos < offsets[nid + 1]:
+                    stack[-1] = (nid, pos + 1)
+                    nxt = targets[pos]
+                    if state[nxt] == 0:
+                        state[nxt] = 1
+                        stack.append((nxt, offsets[nxt]))
+                    continue
+                stack.pop()
+                state[nid] = 2
+                for p in range(offsets[nid], offsets[nid + 1]):
+                    masks[nid] |= masks[targets[p]]  # a cycle member may miss bits; DAX forbids cycles
+        return masks
+
+    # --- queries --------------------------------------------------------------------------
+
+    def _labels(self, mask: int, ids: List[int]) -> List[str]:
+        out: List[str] = []
+        while mask:
+            low = mask & -mask
+            out.append(self.nodes[ids[low.bit_length() - 1]]["label"])
+            mask ^= low
+        return out
+
+    def consumers_of(self, ref: str) -> List[str]:
+        """Visuals and filters a node feeds, from the precomputed bitmask."""
+        nid = self.find(ref)
+        return self._labels(self.reaches[nid], self.consumers) if nid is not None else []
+
+    def sources_of(self, ref: str) -> List[str]:
+        """Source columns a node is built from, from the precomputed bitmask."""
+        nid = self.find(ref)
+        return self._labels(self.reached_by[nid], self.sources) if nid is not None else []
+
+    def _walk(self, nid: int, offsets: array, targets: array) -> List[int]:
+        seen = {nid}
+        stack = [nid]
+        while stack:
+            cur = stack.pop()
+            for p in range(offsets[cur], offsets[cur + 1]):
+                t = targets[p]
+                if t not in seen:
+                    seen.add(t)
+                    stack.append(t)
+        seen.discard(nid)
+        return sorted(seen)
+
+    def find(self, ref: str) -> Optional[int]:
+        """Node id for a key (``col:Sales[Amount]``) or a plain ``Table[Name]`` column/measure reference."""
+        if ref in self.index:
+            return self.index[ref]
+        m = re.match(r"^'?(.+?)'?\[(.+)\]$", ref.strip())
+        if m:
+            k = _key(m.group(1), m.group(2))
+            for prefix in ("col:", "msr:"):
+                if prefix + k in self.index:
+                    return self.index[prefix + k]
+        return None
+
+    def impact(self, ref: str) -> Dict[str, Any]:
+        """Everything downstream of a node (what breaks if it is dropped), grouped by kind."""
+        nid = self.find(ref)
+        if nid is None:
+            return {"node": ref, "found": False}
+        grouped: Dict[str, List[str]] = {}
+        for d in self._walk(nid, self.out_offsets, self.out_targets):
+            grouped.setdefault(self.nodes[d]["kind"], []).append(self.nodes[d]["label"])
+        return {"node": self.nodes[nid]["label"], "found": True, "consumers": bin(self.reaches[nid]).count("1"), **grouped}
+
+    def upstream(self, ref: str) -> Dict[str, Any]:
+        """Source columns and model objects a node depends on."""
+        nid = self.find(ref)
+        if nid is None:
+            return {"node": ref, "found": False}
+        grouped: Dict[str, List[str]] = {}
+        for d in self._walk(nid, self.in_offsets, self.in_targets):
+            grouped.setdefault(self.nodes[d]["kind"], []).append(self.nodes[d]["label"])
+        return {"node": self.nodes[nid]["label"], "found": True, **grouped}
+
+    def dead(self, kind: str) -> List[Dict[str, Any]]:
+        """Nodes of ``kind`` that reach no visual, filter or relationship, directly or through measures."""
+        return [nd for i, nd in enumerate(self.nodes) if nd["kind"] == kind and not self.reaches[i]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact export: node list plus CSR adjacency (targets of node i are targets[offsets[i]:offsets[i+1]])."""
+        return {
+            "nodes": [{k: v for k, v in nd.items() if k != "key"} | {"id": i} for i, nd in enumerate(self.nodes)],
+            "adjacency": {"offsets": list(self.out_offsets), "targets": list(self.out_targets)},
+        }
+
+
+def _csr(n: int, pairs: Iterable[Tuple[int, int]]) -> Tuple[array, array]:
+    offsets = array("l", [0] * (n + 1))
+    targets = array("l")
+    for s, d in pairs:  # pairs sorted by source
+        offsets[s + 1] += 1
+        targets.append(d)
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    return offsets, targets
+
+
+def build_lineage(inventory: Dict[str, Any]) -> LineageGraph:
+    g = LineageGraph()
+    model = inventory.get("model") or {}
+    tables = [t for t in model.get("tables") or [] if isinstance(t, dict) and t.get("name")]
+    measure_by_name: Dict[str, int] = {}
+
+    for t in tables:
+        table = t["name"]
+        for c in t.get("columns") or []:
+            g.node(f"col:{_key(table, c['name'])}", COLUMN, label=f"{table}[{c['name']}]", table=table,
+                   calculated=bool(c.get("isCalculated")))
+        for ms in t.get("measures") or []:
+            nid = g.node(f"msr:{_key(table, ms['name'])}", MEASURE, label=f"{table}[{ms['name']}]", table=table)
+            measure_by_name.setdefault(ms["name"].strip().lower(), nid)
+
+    def resolve(table: str, ref_table: Optional[str], name: str) -> Optional[int]:
+        if ref_table is not None:
+            k = _key(ref_table, name)
+            return g.index.get(f"col:{k}", g.index.get(f"msr:{k}"))
+        nid = measure_by_name.get(name.strip().lower())
+        return nid if nid is not None else g.index.get(f"col:{_key(table, name)}")
+
+    def link_dax(table: str, expression: str, targets: List[int]) -> None:
+        for ref_table, name in dax_references(expression):
+            src = resolve(table, ref_table, name)
+            if src is not None:
+                for dst in targets:
+                    g.edge(src, dst)
+
+    for t in tables:
+        table = t["name"]
+        m_parts = [p for p in t.get("partitions") or [] if p.get("kind") == "m"]
+        col_ids = [g.index[f"col:{_key(table, c['name'])}"] for c in t.get("columns") or []]
+        # source columns: one per (source object, original column name) feeding a data column
+        for p in m_parts:
+            obj = source_object(p.get("source") or "", table)
+            original = renamed_columns(p.get("source") or "")
+            for c in t.get("columns") or []:
+                if c.get("isCalculated") or not c.get("sourceColumn"):
+                    continue
+                name = original.get(c["sourceColumn"], c["sourceColumn"])
+                src = g.node(f"src:{obj}|{name.lower()}", SOURCE_COLUMN, label=f"{obj}.{name}", source=obj)
+                g.edge(src, g.index[f"col:{_key(table, c['name'])}"])
+        for c in t.get("columns") or []:
+            own = g.index[f"col:{_key(table, c['name'])}"]
+            if c.get("expression"):
+                link_dax(table, c["expression"], [own])
+            if c.get("sortByColumn"):
+                sort_col = g.index.get(f"col:{_key(table, c['sortByColumn'])}")
+                if sort_col is not None:
+                    g.edge(sort_col, own)
+        for ms in t.get("measures") or []:
+            link_dax(table, ms.get("expression") or "", [g.index[f"msr:{_key(table, ms['name'])}"]])
+        for p in t.get("partitions") or []:
+            if p.get("kind") == "calculated":
+                link_dax(table, p.get("source") or "", col_ids)  # calculated table: every column depends on the expression
+
+    for r in (model.get("relationships") or {}).get("items") or []:
+        consumer = g.node(f"rel:{r.get('name')}", RELATIONSHIP, label=f"relationship {r.get('fromTable')}->{r.get('toTable')}")
+        for side in ("from", "to"):
+            nid = g.index.get(f"col:{_key(r.get(side + 'Table') or '', r.get(side + 'Column') or '')}")
+            if nid is not None:
+                g.edge(nid, consumer)
+
+    def link_field(ref: str, consumer: int) -> None:
+        # Entity.Property splits on the first dot; table names may contain dots too
+        for i, ch in enumerate(ref):
+            if ch != ".":
+                continue
+            k = _key(ref[:i], ref[i + 1:])
+            nid = g.index.get(f"col:{k}", g.index.get(f"msr:{k}"))
+            if nid is not None:
+                g.edge(nid, consumer)
+                return
+
+    report = inventory.get("report") or {}
+    if report.get("filter_fields"):
+        consumer = g.node("filter:report", FILTER, label="report filters")
+        for ref in report["filter_fields"]:
+            link_field(ref, consumer)
+    for page in report.get("pages") or []:
+        pid = page.get("page_id")
+        if page.get("filter_fields"):
+            consumer = g.node(f"filter:page:{pid}", FILTER, label=f"{pid} filters", page=pid)
+            for ref in page["filter_fields"]:
+                link_field(ref, consumer)
+        for v in page.get("visuals") or []:
+            consumer = g.node(f"vis:{pid}/{v.get('visual_id')}", VISUAL, label=f"{pid}/{v.get('visual_id')}",
+                              page=pid, visualType=v.get("visual_type"))
+            for ref in v.get("fields") or []:
+                link_field(ref, consumer)
+    return g.freeze()
+
+
+def lineage_summary(g: LineageGraph, limit: int = 50) -> Dict[str, Any]:
+    """Counts, transitively dead model objects and the source columns with the widest impact."""
+    counts: Dict[str, int] = {}
+    for nd in g.nodes:
+        counts[nd["kind"]] = counts.get(nd["kind"], 0) + 1
+    # referenced by something, but only by objects that never reach a consumer
+    feeds_dead = sorted(
+        ({"object": nd["label"], "kind": nd["kind"]} for i, nd in enumerate(g.nodes)
+         if nd["kind"] in (COLUMN, MEASURE) and not g.reaches[i] and g.out_offsets[i + 1] > g.out_offsets[i]),
+        key=lambda x: (x["kind"], x["object"].lower()),
+    )
+    dead_sources = [nd["label"] for nd in g.dead(SOURCE_COLUMN)]
+    widest = sorted(
+        ((bin(g.reaches[i]).count("1"), g.nodes[i]["label"]) for i in g.sources if g.reaches[i]),
+        key=lambda x: (-x[0], x[1]),
+    )
+    return {
+        "nodeCounts": counts,
+        "edgeCount": len(g.out_targets),
+        "feedsOnlyDeadObjects": feeds_dead[:limit],
+        "feedsOnlyDeadObjectsCount": len(feeds_dead),
+        "deadSourceColumnsCount": len(dead_sources),
+        "deadSourceColumns": sorted(dead_sources)[:limit],
+        "widestImpactSourceColumns": [{"sourceColumn": label, "consumers": n} for n, label in widest[:20]],
+    }
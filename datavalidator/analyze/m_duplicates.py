@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from datavalidator.analyze.lineage import source_object
+from datavalidator.core.minhash import jaccard, similar_groups, token_shingles
+
+_MIN_TOKENS = 10          # "Source" or a bare table reference is not worth clustering
+_SHINGLE = 6
+_NEAR_THRESHOLD = 0.75
+_NUM_PERM = 128
+_BANDS = 16  # 8 rows per band: candidates above a Jaccard of ~0.7, shared boilerplate stays out
+_MEMBERS_SHOWN = 20
+
+# Every alternative can always match (unterminated strings/comments run to the end), so one pass is linear
+_RE_M_TOKEN = re.compile(
+    r"""(?P<ws>\s+)
+      | (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+      | (?P<qid>\#"(?:[^"]|"")*(?:"|\Z))
+      | (?P<str>"(?:[^"]|"")*(?:"|\Z))
+      | (?P<num>0[xX][0-9A-Fa-f]+|\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+      | (?P<id>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+      | (?P<op>=>|<>|<=|>=|\.\.\.?|\S)""",
+    re.VERBOSE,
+)
+
+Key = Tuple[str, str, str]  # (project, model, table)
+
+
+def m_name(name: str) -> str:
+    """Identifier text of a bare or ``#"quoted"`` M name."""
+    name = name.strip()
+    return name[2:-1].replace('""', '"') if name.startswith('#"') and name.endswith('"') else name
+
+
+def m_tokens(m_text: str) -> List[Tuple[str, str]]:
+    """(kind, text) tokens of an M expression without whitespace and comments; kinds: qid, str, num, id, op."""
+    return [(m.lastgroup or "op", m.group()) for m in _RE_M_TOKEN.finditer(m_text or "") if m.lastgroup not in ("ws", "comment")]
+
+
+def step_names(tokens: List[Tuple[str, str]]) -> Dict[str, str]:
+    """Names defined by the outermost ``let`` (same rules as ``m_steps.let_steps``, on tokens) -> ``$n``."""
+    if not tokens or tokens[0][1] != "let":
+        return {}
+    renames: Dict[str, str] = {}
+    depth = nested = 0
+    expect_name = True
+    for i in range(1, len(tokens) - 1):
+        kind, tok = tokens[i]
+        if tok in ("(", "[", "{"):
+            depth += 1
+        elif tok in (")", "]", "}"):
+            depth -= 1
+        elif depth == 0 and tok == "let":
+            nested += 1
+        elif depth == 0 and tok == "in":
+            if not nested:
+                break
+            nested -= 1
+        elif depth == 0 and nested == 0 and tok == ",":
+            expect_name = True
+            continue
+        elif expect_name and kind in ("id", "qid") and tokens[i + 1][1] == "=":
+            name = m_name(tok)
+            renames.setdefault(name, f"${len(renames) + 1}")
+        expect_name = False
+    return renames
+
+
+def normalize_m(m_text: str) -> Tuple[List[str], List[str]]:
+    """
+    Token streams of an M expression without whitespace and comments: ``shape`` has step names
+    renamed to ``$1, $2, ...`` in definition order and every string/number literal replaced by a
+    placeholder (what copy-paste keeps); ``exact`` keeps the literals (what the source sees).
+    """
+    tokens = m_tokens(m_text)
+    renames = step_names(tokens)
+    shape: List[str] = []
+    exact: List[str] = []
+    for kind, tok in tokens:
+        if kind in ("id", "qid"):
+            tok = renames.get(m_name(tok) if kind == "qid" else tok, tok)
+            shape.append(tok)
+            exact.append(tok)
+        elif kind in ("str", "num"):
+            shape.append(f"${kind}")
+            exact.append(tok)
+        else:
+            shape.append(tok)
+            exact.append(tok)
+    return shape, exact
+
+
+def _digest(tokens: List[str]) -> str:
+    return hashlib.blake2b("\x1f".join(tokens).encode("utf-8"), digest_size=12).hexdigest()
+
+
+def collect_m_queries(inventory: Dict[str, Any], project: str = "") -> List[Dict[str, Any]]:
+    """M partitions of every semantic model in an inventory (each artifact of multi-model projects)."""
+    models = [(a.get("name") or "", a.get("model") or {}) for a in inventory.get("artifacts") or [] if a.get("kind") == "semanticModel"]
+    if not models:
+        models = [("", inventory.get("model") or {})]
+    return [q for name, model in models for q in model_m_queries(model, project, name)]
+
+
+def model_m_queries(model: Dict[str, Any], project: str = "", model_name: str = "") -> List[Dict[str, Any]]:
+    out = []
+    for t in model.get("tables") or []:
+        if not isinstance(t, dict) or not t.get("name"):
+            continue
+        for p in t.get("partitions") or []:
+            if p.get("kind") == "m" and p.get("source"):
+                out.append({"project": project, "model": model_name, "table": t["name"], "m": p["source"]})
+    return out
+
+
+def find_m_duplicates(queries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Clusters of copy-pasted M queries (``{"project", "model", "table", "m"}`` items, from one
+    project or a batch). Queries with the same normalized shape collapse by hash first; one
+    representative per shape goes into a MinHash/LSH index over token shingles, so near copies
+    are found without comparing every pair.
+
+    Within a cluster, members that read the same source object (connector + navigation, or the
+    same native query text) each cost a round trip a shared staging query or dataflow would
+    make once: ``roundTripsSaved`` = members - distinct source objects. Parameter values are not
+    resolved, so sources compare as written.
+    """
+    by_shape: Dict[str, List[Key]] = {}
+    shapes: Dict[str, List[str]] = {}
+    texts: Dict[Key, Tuple[str, str]] = {}
+    indexed = 0
+    for q in queries:
+        shape, exact = normalize_m(q.get("m") or "")
+        if len(shape) < _MIN_TOKENS:
+            continue
+        key: Key = (q.get("project") or "", q.get("model") or "", q.get("table") or "")
+        digest = _digest(shape)
+        by_shape.setdefault(digest, []).append(key)
+        shapes.setdefault(digest, shape)
+        texts[key] = (q.get("m") or "", _digest(exact))
+        indexed += 1
+
+    shingles = {d: token_shingles(tokens, _SHINGLE) for d, tokens in shapes.items()}
+    groups, stats = similar_groups(shingles, _NEAR_THRESHOLD, num_perm=_NUM_PERM, bands=_BANDS)
+    grouped = {d for g in groups for d in g}
+    shape_groups = groups + [[d] for d, keys in by_shape.items() if len(keys) > 1 and d not in grouped]
+
+    clusters = []
+    for digests in shape_groups:
+        members = sorted(k for d in digests for k in by_shape[d])
+        per_source: Dict[str, int] = {}
+        for k in members:
+            src = _source(k, *texts[k])
+            per_source[src] = per_source.get(src, 0) + 1
+        head = shingles[digests[0]]
+        clusters.append({
+            "match": "near" if len(digests) > 1 else "exact",
+            "size": len(members),
+            "similarity": round(min(jaccard(head, shingles[d]) for d in digests), 3),
+            "projects": len({k[0] for k in members}),
+            "distinctSources": len(per_source),
+            "roundTripsSaved": len(members) - len(per_source),
+            "sharedSources": sorted(s for s, n in per_source.items() if n > 1)[:10],
+            "members": [_label(k) for k in members[:_MEMBERS_SHOWN]],
+        })
+    clusters.sort(key=lambda c: (-c["roundTripsSaved"], -c["size"], c["members"][0]))
+    return {
+        "queriesIndexed": indexed,
+        "distinctShapes": len(shapes),
+        "clusterCount": len(clusters),
+        "crossProjectClusters": sum(1 for c in clusters if c["projects"] > 1),
+        "roundTripsSaved": sum(c["roundTripsSaved"] for c in clusters),
+        "clusters": clusters[:50],
+        "stats": {"candidatePairs": stats["candidatePairs"], "verifiedPairs": stats["verifiedPairs"], "skippedBuckets": stats["skippedBuckets"]},
+    }
+
+
+def _source(key: Key, m_text: str, exact_digest: str) -> str:
+    src = source_object(m_text, key[2])
+    if src.startswith("nativeQuery:"):
+        # per table in lineage; the same statement text still reads the same data
+        return f"nativeQuery:{exact_digest}"
+    if src.startswith("query:"):
+        # no connector call (embedded data, references to other queries): no round trip to share
+        return f"query:{_label(key)}"
+    return src
+
+
+def _label(key: Key) -> str:
+    project, model, table = key
+    return "/".join(p for p in (project, model) if p) + (":" if project or model else "") + table
+
+
+def build_m_duplicates(model: Dict[str, Any], project: Optional[str] = None) -> Dict[str, Any]:
+    """Near-duplicate M queries within one semantic model."""
+    return find_m_duplicates(model_m_queries(model, project or ""))
+
+
+def batch_m_duplicates(projects: List[Path], max_workers: int = 4) -> Dict[str, Any]:
+    """
+    Near-duplicate M queries across a batch of projects: inventories are extracted concurrently
+    and every M partition goes into one index. Projects are labelled by folder name (full path
+    when two folders share a name).
+    """
+    from datavalidator.api import load_inventory
+
+    names = [Path(p).name for p in projects]
+    labels = [str(p) if names.count(n) > 1 else n for p, n in zip(projects, names)]
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dv-dupes") as pool:
+        inventories = list(pool.map(load_inventory, projects))
+    queries = [q for label, inv in zip(labels, inventories) for q in collect_m_queries(inv, label)]
+    return {"projects": labels, **find_m_duplicates(queries)}
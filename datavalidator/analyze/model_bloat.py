@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Set
+
+from datavalidator.analyze.field_usage import memory_weight
+
+# Relative weights, not bytes: TMDL carries no row counts, so tables on the many side of a
+# relationship (facts) are assumed to be this many times larger than other tables.
+_FACT_FACTOR = 4.0
+_AUTO_DATE_PREFIXES = ("LocalDateTable_", "DateTableTemplate_")
+_DATE_ONLY_FORMATS = {"long date", "short date", "medium date"}
+_RE_TIME_TOKENS = re.compile(r"[hns]|am/pm|time|general", re.IGNORECASE)  # custom format time parts
+
+# Share of a column's weight recovered by fixing each issue
+_SAVINGS = {
+    "calculatedColumn": 0.5,   # materialized upstream it compresses with the rest of the table
+    "dateTimePrecision": 0.6,  # date-only (or split date + time) cuts cardinality sharply
+    "floatingPoint": 0.3,      # fixed decimal / integer encoding instead of double
+}
+
+
+def _is_date_only(col: Dict[str, Any]) -> bool:
+    if str((col.get("annotations") or {}).get("UnderlyingDateTimeDataType") or "").lower() == "date":
+        return True
+    fmt = str(col.get("formatString") or "").strip()
+    if fmt.lower() in _DATE_ONLY_FORMATS:
+        return True
+    return bool(fmt) and not _RE_TIME_TOKENS.search(fmt)
+
+
+def _fact_tables(model: Dict[str, Any]) -> Set[str]:
+    items = (model.get("relationships") or {}).get("items") or []
+    return {str(r.get("fromTable")).lower() for r in items if r.get("fromTable")}
+
+
+def _column_issues(col: Dict[str, Any], is_fact: bool, is_auto_date: bool) -> List[str]:
+    if is_auto_date:
+        return []  # reported once per table
+    issues = []
+    if col.get("isCalculated") and is_fact:
+        issues.append("calculatedColumn")
+    data_type = str(col.get("dataType") or "").lower()
+    if data_type == "datetime" and not _is_date_only(col):
+        issues.append("dateTimePrecision")
+    if data_type == "double":
+        issues.append("floatingPoint")
+    return issues
+
+
+def build_model_bloat(model: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Relative memory weight per column and table from TMDL column definitions, plus the
+    issues behind avoidable weight: Auto date/time tables, calculated columns on fact tables,
+    datetime columns that keep a time part, and floating-point numeric columns.
+    ``bloatScore`` is the share of a table's weight that fixing its issues would recover.
+    """
+    facts = _fact_tables(model)
+    tables_out: List[Dict[str, Any]] = []
+    issues_out: List[Dict[str, Any]] = []
+    auto_date_tables: List[str] = []
+    total_weight = 0.0
+
+    for t in model.get("tables") or []:
+        if not isinstance(t, dict) or not t.get("name"):
+            continue
+        name = t["name"]
+        is_auto_date = name.startswith(_AUTO_DATE_PREFIXES)
+        is_fact = name.lower() in facts
+        factor = _FACT_FACTOR if is_fact else 1.0
+        columns_out = []
+        table_weight = 0.0
+        table_savings = 0.0
+        for col in t.get("columns") or []:
+            weight = round(memory_weight(col) * factor, 2)
+            issues = _column_issues(col, is_fact, is_auto_date)
+            savings = round(weight * min(1.0, sum(_SAVINGS[i] for i in issues)), 2)
+            table_weight += weight
+            table_savings += savings
+            columns_out.append({
+                "name": col.get("name"),
+                "dataType": col.get("dataType"),
+                "isCalculated": bool(col.get("isCalculated")),
+                "isHidden": bool(col.get("isHidden")),
+                "summarizeBy": col.get("summarizeBy"),
+                "weight": weight,
+                "issues": issues,
+            })
+            for issue in issues:
+                issues_out.append({
+                    "table": name,
+                    "column": col.get("name"),
+                    "issue": issue,
+                    "weight": weight,
+                    "estimatedSavings": round(weight * _SAVINGS[issue], 2),
+                })
+        if is_auto_date:
+            auto_date_tables.append(name)
+            table_savings = table_weight
+            issues_out.append({
+                "table": name,
+                "column": None,
+                "issue": "autoDateTable",
+                "weight": round(table_weight, 2),
+                "estimatedSavings": round(table_weight, 2),
+            })
+        total_weight += table_weight
+        columns_out.sort(key=lambda c: c["weight"], reverse=True)
+        tables_out.append({
+            "table": name,
+            "isFact": is_fact,
+            "isAutoDateTable": is_auto_date,
+            "weight": round(table_weight, 2),
+            "estimatedSavings": round(table_savings, 2),
+            "bloatScore": round(table_savings / table_weight, 3) if table_weight else 0.0,
+            "columns": columns_out,
+        })
+
+    tables_out.sort(key=lambda t: (t["estimatedSavings"], t["weight"]), reverse=True)
+    issues_out.sort(key=lambda i: i["estimatedSavings"], reverse=True)
+    savings_by_issue: Dict[str, float] = {}
+    for i in issues_out:
+        savings_by_issue[i["issue"]] = round(savings_by_issue.get(i["issue"], 0.0) + i["estimatedSavings"], 2)
+
+    return {
+        "totalWeight": round(total_weight, 2),
+        "estimatedSavings": round(sum(savings_by_issue.values()), 2),
+        "autoDateTimeEnabled": bool(model.get("autoDateTimeEnabled")) or bool(auto_date_tables),
+        "autoDateTables": auto_date_tables,
+        "savingsByIssue": savings_by_issue,
+        "tables": tables_out,
+        "issues": issues_out[:200],
+    }
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+from datavalidator.core.minhash import char_shingles, similar_groups
+
+_AUTO_DATE_PREFIXES = ("LocalDateTable_", "DateTableTemplate_")
+_OUTLIERS_SHOWN = 50
+_OBJECTS_SHOWN = 10
+
+# One pass per name: the alternatives are tried in the order the style rules are ranked
+_RE_STYLE = re.compile(
+    r"(?P<snake_case>[a-z][a-z0-9_]*)"
+    r"|(?P<PascalCase>[A-Z][A-Za-z0-9]*)"
+    r"|(?P<camelCase>[a-z][a-z0-9]*[A-Z][A-Za-z0-9]*)"
+)
+# Words of a name: acronyms, Capitalized/lower words, numbers and symbols (%, #) kept as tokens
+_RE_TOKEN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+|[^\sA-Za-z\d_\-.]")
+
+# Word variants: MinHash/LSH over character bigrams of each distinct word, verified by _same_word
+_WORD_NGRAM = 2
+_WORD_THRESHOLD = 0.2
+_NUM_PERM = 64
+_BANDS = 32
+_MAX_ABBREVIATION_RATIO = 0.6
+_MIN_PREFIX_ABBREVIATION = 4
+_VOWELS = frozenset("aeiou")
+_MIN_TYPO_LENGTH = 5
+
+
+def name_style(name: str) -> str:
+    m = _RE_STYLE.fullmatch(name)
+    if m:
+        return m.lastgroup or "other"
+    if " " in name:
+        return "space_separated"
+    if "-" in name:
+        return "kebab-case"
+    return "other"
+
+
+def classify_styles(names: Iterable[str]) -> Dict[str, str]:
+    """Style per distinct name; repeated names (Date, Key, Amount across tables) are classified once."""
+    return {nm: name_style(nm) for nm in set(names)}
+
+
+def name_tokens(name: str) -> Tuple[str, ...]:
+    return tuple(t.lower() for t in _RE_TOKEN.findall(name))
+
+
+def _style_summary(names: List[str], labels: List[str], styles: Dict[str, str]) -> Dict[str, Any]:
+    counts: Dict[str, int] = {}
+    for nm in names:
+        counts[styles[nm]] = counts.get(styles[nm], 0) + 1
+    dominant, dominant_count = (sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[0] if counts else (None, 0))
+    outliers = [label for nm, label in zip(names, labels) if styles[nm] != dominant][:_OUTLIERS_SHOWN] if dominant else []
+    return {
+        "styles": counts,
+        "dominantStyle": dominant,
+        "dominantCoverage": (dominant_count / len(names)) if names else None,
+        "outliers": outliers,
+        "count": len(names),
+    }
+
+
+def _object_styles(objects: List[Tuple[str, str]], styles: Dict[str, str]) -> Dict[str, Any]:
+    # single words (Region, Amount) fit every style, so they neither vote nor count as outliers
+    styled = [(t, n) for t, n in objects if len(name_tokens(n)) > 1]
+    summary = _style_summary([n for _, n in styled], [f"{t}[{n}]" for t, n in styled], styles)
+    summary["singleWordNames"] = len(objects) - len(styled)
+    return summary
+
+
+def _edit_distance_le1(a: str, b: str) -> bool:
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diff = [i for i in range(len(a)) if a[i] != b[i]]
+        # one substitution, or two adjacent letters swapped
+        return len(diff) <= 1 or (len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]])
+    short, long_ = (a, b) if len(a) < len(b) else (b, a)
+    i = 0
+    while i < len(short) and short[i] == long_[i]:
+        i += 1
+    return short[i:] == long_[i + 1:]
+
+
+def _is_subsequence(short: str, long_: str) -> bool:
+    it = iter(long_)
+    return all(ch in it for ch in short)
+
+
+def _consonants(word: str) -> str:
+    return "".join(ch for ch in word if ch not in _VOWELS)
+
+
+def _is_abbreviation(short: str, long_: str) -> bool:
+    """
+    ``short`` keeps the first letter of ``long_`` and then only consonants (amt, qty, nbr), or,
+    from _MIN_PREFIX_ABBREVIATION letters on, a prefix followed by consonants (dept, mgmt).
+    Either way letters inside the word are dropped: plain prefixes (net/network, part/partner,
+    plan/planning) are words of their own, not abbreviations.
+    """
+    if len(short) < 2 or len(short) > _MAX_ABBREVIATION_RATIO * len(long_) or short[0] != long_[0]:
+        return False
+    if long_.startswith(short):
+        return False
+    if _is_subsequence(short[1:], _consonants(long_[1:])):
+        return True
+    if len(short) < _MIN_PREFIX_ABBREVIATION:
+        return False
+    k = 0
+    while k < len(short) and short[k] == long_[k]:
+        k += 1
+    return any(_is_subsequence(short[j:], _consonants(long_[j:])) for j in range(k, 1, -1))
+
+
+def _same_word(a: str, b: str) -> bool:
+    """Equal, an abbreviation (amt/amount, qty/quantity, dept/department) or a one-letter typo of each other."""
+    if a == b:
+        return True
+    if a.isdigit() or b.isdigit():
+        return False
+    short, long_ = (a, b) if len(a) <= len(b) else (b, a)
+    if _is_abbreviation(short, long_):
+        return True
+    return len(short) >= _MIN_TYPO_LENGTH and _edit_distance_le1(a, b)
+
+
+def _word_variants(words: Iterable[str]) -> Dict[str, str]:
+    """
+    Canonical spelling per word: words linked by abbreviation or typo share the longest member
+    of their cluster. Candidates come from a MinHash/LSH index over the vocabulary, which stays
+    small (a few thousand words) however many columns use it.
+    """
+    shingles = {w: char_shingles(w, _WORD_NGRAM) for w in words if not w.isdigit() and len(w) >= 2}
+    groups, _ = similar_groups(shingles, _WORD_THRESHOLD, num_perm=_NUM_PERM, bands=_BANDS, accept=_same_word)
+    canonical: Dict[str, str] = {}
+    for g in groups:
+        head = max(g, key=lambda w: (len(w), w))
+        for w in g:
+            canonical[w] = head
+    return canonical
+
+
+def _near_duplicates(objects: List[Tuple[str, str]]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Group names that differ only in separators/casing (exact) or by abbreviated or misspelled
+    words (near). Names are bucketed by their canonical word sequence, so the cost is linear in
+    the number of names plus the LSH pass over the word vocabulary.
+    """
+    by_name: Dict[str, List[str]] = {}
+    for table, name in objects:
+        by_name.setdefault(name, []).append(f"{table}[{name}]")
+
+    tokens: Dict[str, Tuple[str, ...]] = {}
+    by_key: Dict[str, List[str]] = {}
+    for name in by_name:
+        toks = name_tokens(name)
+        key = "".join(toks)
+        if not key:
+            continue
+        tokens.setdefault(key, toks)
+        by_key.setdefault(key, []).append(name)
+
+    vocabulary = {w for toks in tokens.values() for w in toks}
+    canonical = _word_variants(vocabulary)
+    by_canonical: Dict[Tuple[str, ...], List[str]] = {}
+    for key, toks in tokens.items():
+        by_canonical.setdefault(tuple(canonical.get(w, w) for w in toks), []).append(key)
+
+    key_groups: List[Tuple[str, List[str]]] = []
+    for keys in by_canonical.values():
+        # abbreviation clusters can chain (cat -> category, catalog): keep only keys that match the first
+        while keys:
+            head = keys[0]
+            same = [head] + [k for k in keys[1:] if all(_same_word(x, y) for x, y in zip(tokens[head], tokens[k]))]
+            keys = [k for k in keys if k not in same]
+            if len(same) > 1:
+                key_groups.append(("near", same))
+            elif len(by_key[head]) > 1:
+                key_groups.append(("exact", same))
+
+    rows = []
+    for match, keys in key_groups:
+        names = sorted(nm for k in keys for nm in by_key[k])
+        sites = [s for nm in names for s in by_name[nm]]
+        rows.append({
+            "match": match,
+            "names": names,
+            "objectCount": len(sites),
+            "objects": sites[:_OBJECTS_SHOWN],
+        })
+    rows.sort(key=lambda r: (-len(r["names"]), -r["objectCount"], r["names"][0]))
+    stats = {
+        "names": len(by_name),
+        "normalizedNames": len(tokens),
+        "vocabulary": len(vocabulary),
+        "wordVariants": len(canonical),
+    }
+    return rows, stats
+
+
+def build_naming(model: Dict[str, Any], excluded_tables: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Naming styles of tables, columns and measures (dominant style, coverage, outliers) and groups
+    of column/measure names that are the same name written differently (``Sales Amount``,
+    ``SalesAmount``, ``Sales_Amt``). Auto date tables and ``excluded_tables`` are skipped.
+    """
+    excluded = set(excluded_tables)
+    tables: List[str] = []
+    columns: List[Tuple[str, str]] = []
+    measures: List[Tuple[str, str]] = []
+    for t in model.get("tables") or []:
+        if not isinstance(t, dict) or not t.get("name") or t["name"].startswith(_AUTO_DATE_PREFIXES):
+            continue
+        if t["name"] not in excluded:
+            tables.append(t["name"])
+        columns.extend((t["name"], c["name"]) for c in t.get("columns") or [] if c.get("name"))
+        measures.extend((t["name"], m["name"]) for m in t.get("measures") or [] if m.get("name"))
+
+    styles = classify_styles([*tables, *(n for _, n in columns), *(n for _, n in measures)])
+    table_summary = _style_summary(tables, tables, styles)
+    column_dupes, column_stats = _near_duplicates(columns)
+    measure_dupes, measure_stats = _near_duplicates(measures)
+
+    return {
+        "tableStyles": table_summary["styles"],
+        "dominantTableStyle": table_summary["dominantStyle"],
+        "dominantCoverage": table_summary["dominantCoverage"],
+        "outlierTables": table_summary["outliers"],
+        "tableCount": table_summary["count"],
+        "columns": _object_styles(columns, styles),
+        "measures": _object_styles(measures, styles),
+        "nearDuplicates": {
+            "columns": column_dupes[:_OUTLIERS_SHOWN],
+            "measures": measure_dupes[:_OUTLIERS_SHOWN],
+            "columnGroupCount": len(column_dupes),
+            "measureGroupCount": len(measure_dupes),
+            "stats": {"columns": column_stats, "measures": measure_stats},
+        },
+    }
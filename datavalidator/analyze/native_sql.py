@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Where SQL text enters M: Value.NativeQuery(source, "sql", ...) and the Query= option of the
+# database connectors. The SQL argument is whatever follows up to the end of the expression.
+_RE_SQL_ENTRY = re.compile(
+    r"\bValue\.NativeQuery\s*\(|\b(?:Query|CommandText)\s*=\s*(?=[\"A-Za-z_#])",
+    re.IGNORECASE,
+)
+_M_ESCAPES = {"lf": "\n", "cr": "\r", "tab": "\t", "cr,lf": "\r\n", "#": "#"}
+_RE_M_ESCAPE = re.compile(r"#\(([^)]{1,12})\)")
+
+# One alternation, each branch possessive by construction (no nested quantifiers)
+_RE_SQL_TOKEN = re.compile(
+    r"(?P<ws>\s+)"
+    r"|(?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))"
+    r"|(?P<string>N?'(?:[^']|'')*(?:'|\Z))"
+    r"|(?P<qident>\"(?:[^\"]|\"\")*(?:\"|\Z)|\[[^\]]*(?:\]|\Z)|`[^`]*(?:`|\Z))"
+    r"|(?P<param>[@:$?][A-Za-z0-9_]*)"
+    r"|(?P<number>\d+(?:\.\d+)?)"
+    r"|(?P<word>[A-Za-z_][A-Za-z0-9_$#]*)"
+    r"|(?P<op><>|!=|<=|>=|\|\||[=<>])"
+    r"|(?P<punct>.)",
+    re.DOTALL,
+)
+_CLAUSE_WORDS = {"SELECT", "FROM", "WHERE", "GROUP", "HAVING", "ORDER", "UNION", "EXCEPT", "INTERSECT", "ON", "JOIN", "QUALIFY"}
+_FILTER_CLAUSES = {"WHERE", "ON", "HAVING"}
+# Functions that never take a column (niladic/date constants) and so cannot make a predicate non-sargable
+_CONSTANT_FUNCS = {"GETDATE", "GETUTCDATE", "SYSDATETIME", "CURRENT_DATE", "CURRENT_TIMESTAMP", "NOW", "SYSDATE"}
+_LIMITING_WORDS = {"TOP", "LIMIT", "OFFSET", "FETCH"}
+_NOT_COLUMNS = {
+    "AND", "OR", "NOT", "NULL", "IS", "IN", "AS", "CASE", "WHEN", "THEN", "ELSE", "END", "TRUE", "FALSE",
+    "DATE", "TIME", "DATETIME", "DATETIME2", "INT", "BIGINT", "DECIMAL", "VARCHAR", "NVARCHAR", "CHAR",
+    "YEAR", "QUARTER", "MONTH", "WEEK", "DAY", "HOUR", "MINUTE", "SECOND", "YY", "MM", "DD", "HH",
+}
+
+_CACHE_SIZE = 2048
+_SNIPPET_CHARS = 300
+
+
+def _unescape_m(body: str) -> str:
+    body = body.replace('""', '"')
+    return _RE_M_ESCAPE.sub(lambda m: _M_ESCAPES.get(m.group(1).lower().replace(" ", ""), m.group(0)), body)
+
+
+def _read_m_string(text: str, i: int) -> Tuple[Optional[str], int]:
+    """Body of the M string literal starting at text[i] == '"', and the index after it."""
+    j = i + 1
+    while True:
+        k = text.find('"', j)
+        if k < 0:
+            return None, len(text)
+        if text.startswith('""', k):
+            j = k + 2
+            continue
+        return text[i + 1:k], k + 1
+
+
+def _read_operand(text: str, i: int) -> Tuple[str, int]:
+    """A non-literal M operand (Text.From(RangeStart), Param, #"Step"[Col]) up to the next top-level & , ) ] ."""
+    depth = 0
+    j = i
+    while j < len(text):
+        ch = text[j]
+        if ch == '"':
+            _, j = _read_m_string(text, j)
+            continue
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            if depth == 0:
+                break
+            depth -= 1
+        elif depth == 0 and ch in "&,":
+            break
+        j += 1
+    return text[i:j].strip(), j
+
+
+def extract_sql_statements(m_text: str) -> List[Dict[str, Any]]:
+    """
+    SQL passed to Value.NativeQuery or a connector's Query= option, unescaped from M string
+    literals (``""``, ``#(lf)``, ``#(tab)``...). Concatenated operands (``"..." & Text.From(RangeStart) & "..."``)
+    are replaced with ``@p1, @p2...`` placeholders and listed in ``concatenated``.
+    """
+    out: List[Dict[str, Any]] = []
+    for m in _RE_SQL_ENTRY.finditer(m_text or ""):
+        i = m.end()
+        if m.group(0).lower().startswith("value.nativequery"):
+            # first argument is the source; skip to the top-level comma
+            _, i = _read_operand(m_text, i)
+            if i >= len(m_text) or m_text[i] != ",":
+                continue
+            i += 1
+        parts: List[str] = []
+        concatenated: List[str] = []
+        saw_literal = False
+        while i < len(m_text):
+            while i < len(m_text) and m_text[i].isspace():
+                i += 1
+            if i < len(m_text) and m_text[i] == '"':
+                body, i = _read_m_string(m_text, i)
+                if body is None:
+                    break
+                parts.append(_unescape_m(body))
+                saw_literal = True
+            else:
+                operand, i = _read_operand(m_text, i)
+                if not operand:
+                    break
+                concatenated.append(operand)
+                parts.append(f"@p{len(concatenated)}")
+            while i < len(m_text) and m_text[i].isspace():
+                i += 1
+            if i < len(m_text) and m_text[i] == "&":
+                i += 1
+                continue
+            break
+        if saw_literal:
+            out.append({"sql": "".join(parts), "concatenated": concatenated})
+    return out
+
+
+def _tokens(sql: str) -> List[Tuple[str, str]]:
+    toks = []
+    for m in _RE_SQL_TOKEN.finditer(sql):
+        kind = m.lastgroup or "punct"
+        if kind in ("ws", "comment"):
+            continue
+        toks.append((kind, m.group(0)))
+    return toks
+
+
+class _Level:
+    """State of one SELECT scope (top level or a parenthesised subquery)."""
+
+    __slots__ = ("is_query", "has_from", "has_where", "limited", "clause", "order_by")
+
+    def __init__(self) -> None:
+        self.is_query = False
+        self.has_from = False
+        self.has_where = False
+        self.limited = False
+        self.clause = ""
+        self.order_by = False
+
+
+def analyze_sql(sql: str) -> Dict[str, Any]:
+    """Token-level checks: SELECT *, missing WHERE, functions on filter columns, ORDER BY in subqueries."""
+    toks = _tokens(sql)
+    issues: List[Dict[str, Any]] = []
+    levels: List[_Level] = [_Level()]
+    # open function calls: [name, index of the name token, saw a column inside, opened in a filter clause]
+    calls: List[List[Any]] = []
+    paren_kinds: List[str] = []  # "sub" | "call" | "group" per open paren
+
+    def issue(kind: str, detail: str) -> None:
+        issues.append({"issue": kind, "detail": detail})
+
+    prev_kind, prev_val = "", ""
+    for idx, (kind, val) in enumerate(toks):
+        upper = val.upper() if kind == "word" else ""
+        lvl = levels[-1]
+        if val == "(":
+            nxt = toks[idx + 1][1].upper() if idx + 1 < len(toks) else ""
+            if nxt in ("SELECT", "WITH"):
+                paren_kinds.append("sub")
+                levels.append(_Level())
+            elif prev_kind == "word" and prev_val.upper() not in _CLAUSE_WORDS | {"IN", "AS", "AND", "OR", "NOT", "EXISTS"}:
+                paren_kinds.append("call")
+                calls.append([prev_val, idx - 1, False, lvl.clause in _FILTER_CLAUSES])
+            else:
+                paren_kinds.append("group")
+        elif val == ")":
+            pk = paren_kinds.pop() if paren_kinds else "group"
+            if pk == "sub":
+                _close_level(levels.pop(), issue, nested=True)
+            elif pk == "call" and calls:
+                name, name_idx, saw_col, in_filter = calls.pop()
+                compared = (idx + 1 < len(toks) and toks[idx + 1][0] == "op") or (name_idx > 0 and toks[name_idx - 1][0] == "op")
+                if in_filter and saw_col and compared and not calls:
+                    issue("nonSargable", f"{name.upper()}(...) wraps a column in a filter predicate")
+                elif saw_col and calls:
+                    calls[-1][2] = True
+        elif kind == "word":
+            if upper == "SELECT":
+                lvl.is_query = True
+                lvl.clause = "SELECT"
+                nxt = toks[idx + 1] if idx + 1 < len(toks) else ("", "")
+                if nxt[1].upper() in ("DISTINCT", "ALL"):
+                    nxt = toks[idx + 2] if idx + 2 < len(toks) else ("", "")
+                if nxt[1].upper() == "TOP":
+                    lvl.limited = True
+                if nxt[1] == "*" or _star_after_select(toks, idx):
+                    issue("selectStar", "SELECT * returns every column, including ones the model never loads")
+            elif upper in _LIMITING_WORDS:
+                lvl.limited = True
+            elif upper in _CLAUSE_WORDS:
+                lvl.clause = upper
+                if upper == "FROM":
+                    lvl.has_from = True
+                elif upper == "WHERE":
+                    lvl.has_where = True
+                elif upper == "ORDER":
+                    lvl.order_by = True
+                elif upper in ("UNION", "EXCEPT", "INTERSECT"):
+                    # each branch of a set operation is its own SELECT; a WHERE in one counts for none
+                    _close_level(lvl, issue, nested=len(levels) > 1, set_branch=True)
+                    levels[-1] = _Level()
+            elif calls and upper not in _NOT_COLUMNS and upper not in _CONSTANT_FUNCS:
+                nxt = toks[idx + 1][1] if idx + 1 < len(toks) else ""
+                if nxt != "(":
+                    calls[-1][2] = True
+        elif kind == "qident" and calls:
+            calls[-1][2] = True
+        prev_kind, prev_val = kind, val
+
+    _close_level(levels[0], issue, nested=False)
+    seen = set()
+    unique = []
+    for it in issues:
+        key = (it["issue"], it["detail"])
+        if key not in seen:
+            seen.add(key)
+            unique.append(it)
+    return {"tokens": len(toks), "issues": unique}
+
+
+def _star_after_select(toks: List[Tuple[str, str]], idx: int) -> bool:
+    # SELECT t.* / SELECT TOP 10 *
+    for j in range(idx + 1, min(idx + 6, len(toks))):
+        val = toks[j][1]
+        if val == "*":
+            return toks[j - 1][1] == "." or toks[j - 1][0] == "number"
+        if val.upper() == "FROM":
+            break
+    return False
+
+
+def _close_level(lvl: _Level, issue: Any, nested: bool, set_branch: bool = False) -> None:
+    if not lvl.is_query:
+        return
+    if nested and lvl.order_by and not lvl.limited and not set_branch:
+        issue("orderByInSubquery", "ORDER BY inside a subquery/derived table is ignored or rejected by most engines and blocks folding of outer steps")
+    if not nested and lvl.has_from and not lvl.has_where and not lvl.limited:
+        issue("missingWhere", "top-level SELECT has no WHERE clause: every refresh reads the full table")
+
+
+class SqlAnalysisCache:
+    """Parse results keyed by statement hash; the same SQL is often pasted into many tables."""
+
+    def __init__(self, max_entries: int = _CACHE_SIZE) -> None:
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, sql: str) -> Tuple[str, Dict[str, Any]]:
+        digest = hashlib.blake2b(sql.encode("utf-8", "surrogatepass"), digest_size=12).hexdigest()
+        with self._lock:
+            cached = self._entries.get(digest)
+            if cached is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return digest, cached
+        result = analyze_sql(sql)
+        with self._lock:
+            self.misses += 1
+            self._entries[digest] = result
+            if len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+        return digest, result
+
+
+_DEFAULT_CACHE = SqlAnalysisCache()
+
+
+def build_native_sql(model: Dict[str, Any], cache: Optional[SqlAnalysisCache] = None) -> Dict[str, Any]:
+    """
+    Native SQL statements per M partition with their issues, plus per-issue counts across the model.
+    Reads full partition sources: the PowerQuery source-block scan stops at the ``Source =`` step.
+    """
+    cache = cache or _DEFAULT_CACHE
+    hits_before = cache.hits
+    statements: List[Dict[str, Any]] = []
+    issue_counts: Dict[str, int] = {}
+    digests = set()
+    for t in model.get("tables") or []:
+        if not isinstance(t, dict):
+            continue
+        for part in t.get("partitions") or []:
+            source = part.get("source") or ""
+            if part.get("kind") != "m" or not _RE_SQL_ENTRY.search(source):
+                continue
+            for stmt in extract_sql_statements(source):
+                digest, result = cache.analyze(stmt["sql"])
+                digests.add(digest)
+                issues = list(result["issues"])
+                if stmt["concatenated"]:
+                    issues.append({
+                        "issue": "parameterConcatenation",
+                        "detail": f"SQL built by string concatenation of {', '.join(stmt['concatenated'][:3])}",
+                    })
+                for i in issues:
+                    issue_counts[i["issue"]] = issue_counts.get(i["issue"], 0) + 1
+                statements.append({
+                    "table": t.get("name"),
+                    "partition": part.get("name"),
+                    "path": t.get("path"),
+                    "statementHash": digest,
+                    "sql": stmt["sql"][:_SNIPPET_CHARS],
+                    "concatenated": stmt["concatenated"],
+                    "issues": issues,
+                })
+    return {
+        "statementCount": len(statements),
+        "distinctStatements": len(digests),
+        "cacheHits": cache.hits - hits_before,
+        "issueCounts": issue_counts,
+        "statements": statements[:200],
+    }
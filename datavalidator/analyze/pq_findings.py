@@ -3,21 +3,23 @@ from __future__ import annotations
 import re
 from typing import Any, Dict, List
 
+from datavalidator.core.regex_guard import GuardedPattern
+
 
 # Folding breaker-ish patterns (heuristic)
 FOLDING_BREAKERS = [
-    (re.compile(r"\bTable\.Buffer\b", re.IGNORECASE), "Table.Buffer often blocks folding and forces local evaluation."),
-    (re.compile(r"\bBinary\.Decompress\b", re.IGNORECASE), "Embedded binary/data steps typically mean no folding."),
-    (re.compile(r"\bWeb\.Contents\b", re.IGNORECASE), "Web.Contents / API sources typically won’t fold like SQL sources."),
-    (re.compile(r"\bOdbc\.Query\b", re.IGNORECASE), "Odbc.Query can be folding-hostile depending on connector."),
-    (re.compile(r"\bText\.From\b|\bNumber\.ToText\b", re.IGNORECASE), "Text/number conversions mid-pipeline often reduce folding."),
-    (re.compile(r"\bTable\.ToRecords\b|\bRecord\.ToTable\b", re.IGNORECASE), "Record/List materialization typically breaks folding."),
+    (GuardedPattern(re.compile(r"\bTable\.Buffer\b", re.IGNORECASE)), "Table.Buffer often blocks folding and forces local evaluation."),
+    (GuardedPattern(re.compile(r"\bBinary\.Decompress\b", re.IGNORECASE)), "Embedded binary/data steps typically mean no folding."),
+    (GuardedPattern(re.compile(r"\bWeb\.Contents\b", re.IGNORECASE)), "Web.Contents / API sources typically won’t fold like SQL sources."),
+    (GuardedPattern(re.compile(r"\bOdbc\.Query\b", re.IGNORECASE)), "Odbc.Query can be folding-hostile depending on connector."),
+    (GuardedPattern(re.compile(r"\bText\.From\b|\bNumber\.ToText\b", re.IGNORECASE)), "Text/number conversions mid-pipeline often reduce folding."),
+    (GuardedPattern(re.compile(r"\bTable\.ToRecords\b|\bRecord\.ToTable\b", re.IGNORECASE)), "Record/List materialization typically breaks folding."),
 ]
 
-RE_FILTER = re.compile(r"\bTable\.SelectRows\b|\bTable\.RowCount\b|\bWHERE\b", re.IGNORECASE)
-RE_HEAVY = re.compile(r"\bTable\.(Group|NestedJoin|Join|ExpandTableColumn|AddColumn|TransformColumns)\b", re.IGNORECASE)
-RE_NATIVE_QUERY = re.compile(r"\bValue\.NativeQuery\s*\(", re.IGNORECASE)
-RE_RANGE = re.compile(r"\bRangeStart\b|\bRangeEnd\b", re.IGNORECASE)
+RE_FILTER = GuardedPattern(re.compile(r"\bTable\.SelectRows\b|\bTable\.RowCount\b|\bWHERE\b", re.IGNORECASE), "pq_findings.FILTER")
+RE_HEAVY = GuardedPattern(re.compile(r"\bTable\.(Group|NestedJoin|Join|ExpandTableColumn|AddColumn|TransformColumns)\b", re.IGNORECASE), "pq_findings.HEAVY")
+RE_NATIVE_QUERY = GuardedPattern(re.compile(r"\bValue\.NativeQuery\s*\(", re.IGNORECASE), "pq_findings.NATIVE_QUERY")
+RE_RANGE = GuardedPattern(re.compile(r"\bRangeStart\b|\bRangeEnd\b", re.IGNORECASE), "pq_findings.RANGE")
 
 
 def build_pq_findings(inventory: Dict[str, Any], signals: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -2,6 +2,8 @@ from __future__ import annotations
 from typing import Any, Dict, List
 import re
 
+from datavalidator.core.regex_guard import GuardedPattern
+
 HEAVY_PATTERNS = [
     ("Table.Buffer", "HIGH", "PQ101", "Table.Buffer can break query folding"),
     ("Value.NativeQuery", "MED", "PQ102", "NativeQuery requires careful parameterization and security review"),
@@ -9,6 +11,9 @@ HEAVY_PATTERNS = [
     ("Table.Sort", "LOW", "PQ104", "Sorting in Power Query can be expensive; validate folding"),
 ]
 
+RE_STEP = GuardedPattern(re.compile(r'#"[^"]+"'), "pq_insights.STEP")
+RE_LITERAL = GuardedPattern(re.compile(r'"[^"]{3,}"'), "pq_insights.LITERAL")
+
 def pq_insights(inv: Dict[str, Any]) -> List[Dict[str, Any]]:
     findings = []
     pq = inv.get("powerQuery", {})
@@ -35,7 +40,7 @@ def pq_insights(inv: Dict[str, Any]) -> List[Dict[str, Any]]:
                 })
 
         # step bloat (count #"<step>")
-        steps = re.findall(r'#"\s*[^"]+\s*"', mtxt)
+        steps = RE_STEP.findall(mtxt)
         if len(steps) >= 25:
             findings.append({
                 "id": "PQ201",
@@ -49,7 +54,7 @@ def pq_insights(inv: Dict[str, Any]) -> List[Dict[str, Any]]:
 
         # “hardcoding readiness” heuristic:
         # if lots of quoted literals AND few parameter usages
-        literal_count = len(re.findall(r'"[^"]{3,}"', mtxt))
+        literal_count = len(RE_LITERAL.findall(mtxt))
         param_used = sum(1 for n in param_names if n in mtxt)
         if literal_count >= 12 and param_used == 0:
             findings.append({
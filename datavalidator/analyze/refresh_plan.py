@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import heapq
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from datavalidator.analyze.field_usage import memory_weight
+from datavalidator.analyze.m_duplicates import m_name, m_tokens, step_names
+from datavalidator.analyze.storage_modes import table_storage
+
+# Relative costs, not seconds: TMDL carries no row counts or source latencies. A table's volume
+# comes from its column weights (facts, the many side of a relationship, count this many times),
+# scaled by how expensive its connector is per row and whether the work runs at the source.
+_FACT_FACTOR = 4.0
+_CONNECTOR_COST = {
+    "SQL Server": 1.0,
+    "Snowflake": 1.0,
+    "Databricks": 1.0,
+    "BigQuery": 1.2,
+    "SAP HANA": 1.2,
+    "Power BI Dataflows": 0.8,
+    "ODBC": 1.5,
+    "OLE DB": 1.5,
+    "File": 1.5,
+    "Web/API": 3.0,
+}
+_UNKNOWN_CONNECTOR_COST = 0.5  # embedded data, #table, references only
+_NON_FOLDING_SOURCES = ("Web/API", "File")
+_NOT_FOLDED_FACTOR = 2.0       # every row crosses the gateway and is transformed by the mashup engine
+_BUFFER_FACTOR = 1.5           # Table.Buffer holds the whole table in mashup memory
+_HEAVY_FOLDED = 0.05           # per Table.Group/Join/... step pushed to the source
+_HEAVY_LOCAL = 0.25            # per heavy step evaluated locally
+_CALCULATED_FACTOR = 0.3       # calculated tables are computed in the engine after their inputs load
+_MIN_COST = 0.01
+
+# The service processes up to this many objects at once unless the refresh request sets maxParallelism
+DEFAULT_PARALLELISM = 6
+_DOMINANT_SHARE = 0.5
+_TABLES_SHOWN = 50
+
+_RE_DAX_STRING = re.compile(r'"(?:[^"]|"")*"')
+# 'Quoted Table' or a bare name that is not a function call (DATE(...) is not the Date table)
+_RE_DAX_TABLE = re.compile(r"'((?:[^']|'')+)'|\b([A-Za-z_][A-Za-z0-9_]*)\b(?!\s*\()")
+
+Profile = Callable[[str], Dict[str, Any]]
+
+
+def _references(m_text: str, names: Set[str], exclude: Set[str]) -> List[str]:
+    """Shared expressions / other queries an M expression refers to (step names and record fields excluded)."""
+    tokens = m_tokens(m_text)
+    local = set(step_names(tokens)) | exclude
+    out: List[str] = []
+    for i, (kind, tok) in enumerate(tokens):
+        if kind not in ("id", "qid") or (i and tokens[i - 1][1] == "["):
+            continue
+        name = m_name(tok) if kind == "qid" else tok
+        if name in names and name not in local and name not in out:
+            out.append(name)
+    return out
+
+
+def _dax_tables(expression: str, tables: Set[str]) -> List[str]:
+    text = _RE_DAX_STRING.sub('""', expression or "")
+    out: List[str] = []
+    for m in _RE_DAX_TABLE.finditer(text):
+        name = m.group(1).replace("''", "'") if m.group(1) else m.group(2)
+        if name in tables and name not in out:
+            out.append(name)
+    return out
+
+
+class _Query:
+    """One M query (partition source or shared expression) with its references inlined."""
+
+    def __init__(self, profile: Dict[str, Any], refs: List[str]) -> None:
+        self.sources: Set[str] = set(profile.get("sources") or [])
+        self.breakers: Set[str] = set(profile.get("breakers") or [])
+        self.heavy_ops = int(profile.get("heavyOps") or 0)
+        self.refs = refs
+
+
+def _inline(name: str, queries: Dict[str, _Query], memo: Dict[str, _Query], stack: Set[str]) -> _Query:
+    """Sources, breakers and heavy steps of a query plus everything it references, evaluated again for each caller."""
+    if name in memo:
+        return memo[name]
+    q = queries[name]
+    merged = _Query({"sources": q.sources, "breakers": q.breakers, "heavyOps": q.heavy_ops}, q.refs)
+    stack.add(name)
+    for ref in q.refs:
+        if ref in stack or ref not in queries:
+            continue  # cycles are an M error; count each query once
+        sub = _inline(ref, queries, memo, stack)
+        merged.sources |= sub.sources
+        merged.breakers |= sub.breakers
+        merged.heavy_ops += sub.heavy_ops
+    stack.discard(name)
+    memo[name] = merged
+    return merged
+
+
+def _query_cost(q: _Query, volume: float) -> Tuple[float, bool]:
+    folds = not q.breakers and not any(s in _NON_FOLDING_SOURCES for s in q.sources)
+    base = max((_CONNECTOR_COST.get(s, _UNKNOWN_CONNECTOR_COST) for s in q.sources), default=_UNKNOWN_CONNECTOR_COST)
+    cost = volume * base
+    if not folds:
+        cost *= _NOT_FOLDED_FACTOR
+    if "Table.Buffer" in q.breakers:
+        cost *= _BUFFER_FACTOR
+    cost *= 1 + q.heavy_ops * (_HEAVY_FOLDED if folds else _HEAVY_LOCAL)
+    return cost, folds
+
+
+def _simulate(tasks: List[Dict[str, Any]], parallelism: int) -> Tuple[float, Dict[str, int]]:
+    """
+    List scheduling: whenever a slot is free, start the ready task with the highest cost. Each
+    running task holds one connection per source it reads. Returns (makespan, peak connections per source).
+    """
+    waiting = {t["id"]: len(t["deps"]) for t in tasks}
+    dependents: Dict[int, List[int]] = {}
+    for t in tasks:
+        for d in t["deps"]:
+            dependents.setdefault(d, []).append(t["id"])
+    by_id = {t["id"]: t for t in tasks}
+    ready = [(-t["cost"], t["id"]) for t in tasks if not t["deps"]]
+    heapq.heapify(ready)
+    running: List[Tuple[float, int]] = []
+    open_: Dict[str, int] = {}
+    peak: Dict[str, int] = {}
+    now = 0.0
+    while ready or running:
+        while ready and len(running) < parallelism:
+            _, tid = heapq.heappop(ready)
+            heapq.heappush(running, (now + by_id[tid]["cost"], tid))
+            for s in by_id[tid]["sources"]:
+                open_[s] = open_.get(s, 0) + 1
+                peak[s] = max(peak.get(s, 0), open_[s])
+        now, tid = heapq.heappop(running)
+        for s in by_id[tid]["sources"]:
+            open_[s] -= 1
+        for nxt in dependents.get(tid, []):
+            waiting[nxt] -= 1
+            if not waiting[nxt]:
+                heapq.heappush(ready, (-by_id[nxt]["cost"], nxt))
+    return now, peak
+
+
+def _critical_path(costs: Dict[str, float], deps: Dict[str, List[str]]) -> Tuple[List[str], float]:
+    """Longest chain of task costs (one task per table) through calculated-table dependencies."""
+    best: Dict[str, Tuple[float, Optional[str]]] = {}
+
+    def visit(name: str, stack: Set[str]) -> float:
+        if name not in best:
+            stack.add(name)
+            prev = [(visit(d, stack), d) for d in deps.get(name, []) if d in costs and d not in stack]
+            stack.discard(name)
+            top = max(prev, default=(0.0, None))
+            best[name] = (costs[name] + top[0], top[1])
+        return best[name][0]
+
+    for name in costs:
+        visit(name, set())
+    if not best:
+        return [], 0.0
+    end = max(best, key=lambda n: (best[n][0], n))
+    path: List[str] = []
+    node: Optional[str] = end
+    while node is not None:
+        path.append(node)
+        node = best[node][1]
+    return path[::-1], best[end][0]
+
+
+def build_refresh_plan(
+    model: Dict[str, Any],
+    profile: Profile,
+    policies: Optional[List[Dict[str, Any]]] = None,
+    parallelism: int = DEFAULT_PARALLELISM,
+) -> Dict[str, Any]:
+    """
+    Simulated full refresh of the import/dual tables of a model. ``profile(m_text)`` returns the
+    connectors, folding breakers and heavy step count of an M expression. Queries that reference
+    shared expressions or other tables evaluate them again, so their sources and cost are added to
+    the caller. Incremental tables refresh ``refreshedPerRun`` of their ``estimatedPartitions``;
+    calculated tables wait for the tables their DAX reads. Costs are relative, for ranking tables
+    and spotting one table that holds the whole refresh up.
+    """
+    default_mode = model.get("defaultMode") or "import"
+    tables = [t for t in model.get("tables") or [] if isinstance(t, dict) and t.get("name")]
+    table_names = {t["name"] for t in tables}
+    shared = {e["name"]: e.get("expression") or "" for e in (model.get("expressions") or {}).get("shared") or [] if e.get("name")}
+    params = {str(p.get("name")) for p in (model.get("expressions") or {}).get("parameters") or [] if isinstance(p, dict)}
+    facts = {str(r.get("fromTable")) for r in (model.get("relationships") or {}).get("items") or [] if r.get("fromTable")}
+    per_run = {p["table"]: p for p in policies or [] if p.get("table")}
+
+    def m_source(t: Dict[str, Any]) -> str:
+        texts = [p.get("source") or "" for p in t.get("partitions") or [] if p.get("kind") == "m"]
+        return "\n".join(x for x in texts if x) or str((t.get("refreshPolicy") or {}).get("sourceExpression") or "")
+
+    names = table_names | set(shared)
+    queries: Dict[str, _Query] = {}
+    for name, text in shared.items():
+        queries[name] = _Query(profile(text), _references(text, names, params | {name}))
+    for t in tables:
+        text = m_source(t)
+        if text and t["name"] not in shared:
+            queries[t["name"]] = _Query(profile(text), _references(text, names, params | {t["name"]}))
+
+    memo: Dict[str, _Query] = {}
+    rows: List[Dict[str, Any]] = []
+    for t in tables:
+        name = t["name"]
+        storage = table_storage(t, default_mode)
+        if storage["storageMode"] == "directQuery":
+            continue  # queried at report time, not refreshed
+        volume = 1 + sum(memory_weight(c) for c in t.get("columns") or []) / 10
+        if name in facts:
+            volume *= _FACT_FACTOR
+        calculated = [p for p in t.get("partitions") or [] if p.get("kind") == "calculated"]
+        if calculated or (t.get("isCalculated") and name not in queries):
+            expr = "\n".join(p.get("source") or "" for p in calculated)
+            rows.append({
+                "table": name, "mode": storage["storageMode"], "sources": [], "folds": None, "breakers": [],
+                "heavyOps": 0, "references": [], "cost": volume * _CALCULATED_FACTOR,
+                "dependsOn": [d for d in _dax_tables(expr, table_names) if d != name],
+            })
+            continue
+        if name not in queries:
+            continue
+        q = _inline(name, queries, memo, set())
+        cost, folds = _query_cost(q, volume)
+        rows.append({
+            "table": name, "mode": storage["storageMode"], "sources": sorted(q.sources) or ["Unknown"],
+            "folds": folds, "breakers": sorted(q.breakers), "heavyOps": q.heavy_ops,
+            "references": queries[name].refs, "cost": cost, "dependsOn": [],
+        })
+
+    # Incremental tables: each refreshed partition is its own task over its share of the rows
+    tasks: List[Dict[str, Any]] = []
+    first_task: Dict[str, List[int]] = {}
+    for r in rows:
+        policy = per_run.get(r["table"]) or {}
+        total, refreshed = policy.get("estimatedPartitions"), policy.get("refreshedPerRun")
+        if total and refreshed:
+            count, each = min(refreshed, total), r["cost"] / total
+        else:
+            count, each = 1, r["cost"]
+        r["partitions"] = count
+        r["cost"] = max(_MIN_COST, each * count)
+        r["taskCost"] = max(_MIN_COST, each)
+        for _ in range(count):
+            first_task.setdefault(r["table"], []).append(len(tasks))
+            tasks.append({"id": len(tasks), "table": r["table"], "cost": r["taskCost"], "sources": [s for s in r["sources"] if s != "Unknown"], "deps": r["dependsOn"]})
+    for task in tasks:
+        task["deps"] = [tid for d in task["deps"] for tid in first_task.get(d, [])]
+
+    total_cost = sum(r["cost"] for r in rows)
+    for r in rows:
+        r["relativeCost"] = round(r["cost"], 2)
+        r["costShare"] = round(r["cost"] / total_cost, 3) if total_cost else 0.0
+    rows.sort(key=lambda r: (-r["cost"], r["table"]))
+
+    makespan, peak = _simulate(tasks, max(1, parallelism)) if tasks else (0.0, {})
+    # partitions of one table run side by side, so a chain passes through one partition task per table
+    path, path_cost = _critical_path({r["table"]: r["taskCost"] for r in rows}, {r["table"]: r["dependsOn"] for r in rows})
+    top = rows[0] if rows else None
+    dominant = None
+    if top and len(rows) > 1 and top["costShare"] >= _DOMINANT_SHARE and top["folds"] is False:
+        reasons = (["Web.Contents"] if "Web/API" in top["sources"] else []) + (["Table.Buffer"] if "Table.Buffer" in top["breakers"] else [])
+        if reasons:
+            dominant = {"table": top["table"], "costShare": top["costShare"], "reasons": reasons, "references": top["references"]}
+    slots = min(max(1, parallelism), len(tasks)) or 1
+    return {
+        "parallelism": parallelism,
+        "taskCount": len(tasks),
+        "tableCount": len(rows),
+        "tables": [{k: v for k, v in r.items() if k not in ("cost", "taskCost")} for r in rows[:_TABLES_SHOWN]],
+        "totalCost": round(total_cost, 2),
+        "estimatedMakespan": round(makespan, 2),
+        "criticalPath": {"tables": path, "cost": round(path_cost, 2)},
+        "peakConnections": dict(sorted(peak.items(), key=lambda kv: (-kv[1], kv[0]))),
+        "dominant": dominant,
+        "parallelEfficiency": round(total_cost / (makespan * slots), 3) if makespan else None,
+    }
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from datavalidator.extract.m_steps import let_steps
+
+# Coarse-to-fine granularities and how many of the finer unit fit in the coarser one
+_GRANULARITIES = ["year", "quarter", "month", "day"]
+_UNITS_PER_PARENT = {"quarter": 4, "month": 3, "day": 31}
+_DAYS = {"year": 365.25, "quarter": 91.3, "month": 30.4, "day": 1.0}
+_MANY_REFRESHED = 60  # partitions reprocessed on every run
+
+# Steps that stop query folding for everything after them, and sources that never fold
+_BREAKERS = ("table.buffer", "binary.decompress", "table.torecords", "record.totable", "list.buffer", "table.fromrows", "table.fromrecords")
+_NON_FOLDING_SOURCES = ("web.contents", "file.contents", "csv.document", "excel.workbook", "json.document", "folder.files", "sharepoint.files", "sharepoint.contents")
+_RE_RANGE_REF = re.compile(r"\bRange(?:Start|End)\b")
+_RE_BOUNDS = re.compile(r"(>=|<=|>|<)\s*(RangeStart|RangeEnd)\b|\b(RangeStart|RangeEnd)\s*(>=|<=|>|<)")
+_RE_FOLDING_OPT = re.compile(r"EnableFolding\s*=\s*true", re.IGNORECASE)
+_RE_M_STRING = re.compile(r'"(?:[^"]|"")*"')
+
+_FLIP = {">=": "<=", "<=": ">=", ">": "<", "<": ">"}
+
+
+def estimate_partitions(policy: Dict[str, Any]) -> Dict[str, Optional[int]]:
+    """
+    Upper bound of partitions the service keeps for a policy and how many each refresh reprocesses.
+    Historical periods use the rolling granularity; the current rolling period is split into
+    each finer granularity down to the incremental one, and the incremental window is one
+    partition per incremental period (plus the DirectQuery partition of a hybrid table).
+    """
+    rolling_g, inc_g = policy.get("rollingWindowGranularity"), policy.get("incrementalGranularity")
+    rolling_n, inc_n = policy.get("rollingWindowPeriods"), policy.get("incrementalPeriods")
+    if rolling_g not in _DAYS or inc_g not in _DAYS or rolling_n is None or inc_n is None:
+        return {"partitions": None, "refreshedPerRun": inc_n}
+    hi, lo = _GRANULARITIES.index(rolling_g), _GRANULARITIES.index(inc_g)
+    intermediate = sum(_UNITS_PER_PARENT[g] - 1 for g in _GRANULARITIES[hi + 1:lo]) if lo > hi else 0
+    hybrid = 1 if str(policy.get("mode") or "").lower() == "hybrid" else 0
+    return {"partitions": rolling_n + intermediate + inc_n + hybrid, "refreshedPerRun": inc_n}
+
+
+def _range_filter(m_text: str) -> Tuple[Optional[str], Optional[bool], List[str]]:
+    """(filter step name, folds?, reasons it may not fold) for the first step referencing RangeStart/RangeEnd."""
+    steps, _ = let_steps(m_text)
+    if not steps:
+        found = _RE_RANGE_REF.search(_RE_M_STRING.sub('""', m_text or ""))
+        return ("<expression>", None, []) if found else (None, None, [])
+    reasons: List[str] = []
+    for name, expr in steps:
+        low = expr.lower()
+        # "... RangeStart ..." inside a SQL/text literal is not a reference to the parameter
+        if _RE_RANGE_REF.search(_RE_M_STRING.sub('""', expr)):
+            if "value.nativequery" in low and not _RE_FOLDING_OPT.search(expr):
+                reasons.append(f"'{name}' filters inside Value.NativeQuery without EnableFolding=true")
+            return name, not reasons, reasons
+        for token in _NON_FOLDING_SOURCES:
+            if token in low:
+                reasons.append(f"'{name}' reads from a non-folding source ({token})")
+        for token in _BREAKERS:
+            if token in low:
+                reasons.append(f"'{name}' uses {token} before the range filter")
+        if "value.nativequery" in low and not _RE_FOLDING_OPT.search(expr):
+            reasons.append(f"'{name}' is a native query without EnableFolding=true; later steps cannot fold")
+    return None, None, reasons
+
+
+def _boundary_problem(m_text: str) -> Optional[str]:
+    """RangeStart must be inclusive and RangeEnd exclusive (or the reverse), otherwise rows repeat or go missing."""
+    ops: Dict[str, str] = {}
+    for m in _RE_BOUNDS.finditer(_RE_M_STRING.sub('""', m_text or "")):
+        if m.group(2):
+            ops.setdefault(m.group(2), m.group(1))  # [Col] >= RangeStart
+        else:
+            ops.setdefault(m.group(3), _FLIP[m.group(4)])  # RangeStart <= [Col]
+    start, end = ops.get("RangeStart"), ops.get("RangeEnd")
+    if not start or not end:
+        return None
+    if ("=" in start) == ("=" in end):
+        kind = "inclusive" if "=" in start else "exclusive"
+        return f"both bounds are {kind} ({start} RangeStart, {end} RangeEnd)"
+    return None
+
+
+def _policy_source(table: Dict[str, Any], policy: Dict[str, Any]) -> str:
+    candidates = [policy.get("sourceExpression") or ""] + [
+        p.get("source") or "" for p in table.get("partitions") or [] if p.get("kind") == "m"
+    ]
+    for src in candidates:
+        if _RE_RANGE_REF.search(_RE_M_STRING.sub('""', src)):
+            return src
+    return next((c for c in candidates if c), "")
+
+
+def build_refresh_policies(model: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One row per table with a refreshPolicy: settings, partition estimates and full-refresh risks."""
+    rows: List[Dict[str, Any]] = []
+    for t in model.get("tables") or []:
+        policy = t.get("refreshPolicy") if isinstance(t, dict) else None
+        if not policy:
+            continue
+        source = _policy_source(t, policy)
+        step, folds, fold_reasons = _range_filter(source)
+        estimate = estimate_partitions(policy)
+        risks: List[Dict[str, str]] = []
+        if step is None:
+            risks.append({"risk": "noRangeFilter", "detail": "source query never references RangeStart/RangeEnd, so every partition loads the full table"})
+        elif folds is False or fold_reasons:
+            risks.append({"risk": "filterNotFolding", "detail": "; ".join(fold_reasons)})
+        boundary = _boundary_problem(source)
+        if boundary:
+            risks.append({"risk": "boundaryOverlap", "detail": boundary})
+        rolling_g, inc_g = policy.get("rollingWindowGranularity"), policy.get("incrementalGranularity")
+        if rolling_g in _DAYS and inc_g in _DAYS and policy.get("rollingWindowPeriods") and policy.get("incrementalPeriods"):
+            rolling_days = _DAYS[rolling_g] * policy["rollingWindowPeriods"]
+            inc_days = _DAYS[inc_g] * policy["incrementalPeriods"]
+            if inc_days >= rolling_days:
+                risks.append({"risk": "incrementalCoversRolling", "detail": f"incremental window ({policy['incrementalPeriods']} {inc_g}) is as long as the stored window ({policy['rollingWindowPeriods']} {rolling_g})"})
+        if (estimate["refreshedPerRun"] or 0) >= _MANY_REFRESHED:
+            risks.append({"risk": "manyRefreshedPartitions", "detail": f"{estimate['refreshedPerRun']} {inc_g} partitions are reprocessed on every refresh"})
+        rows.append({
+            "table": t.get("name"),
+            "path": t.get("path"),
+            **{k: v for k, v in policy.items() if k not in ("sourceExpression", "pollingExpression")},
+            "hasPollingExpression": bool(policy.get("pollingExpression")),
+            "estimatedPartitions": estimate["partitions"],
+            "refreshedPerRun": estimate["refreshedPerRun"],
+            "rangeFilterStep": step,
+            "rangeFilterFolds": folds,
+            "risks": risks,
+        })
+    return rows
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Set
+
+# Visuals that render without querying the model
+_NO_QUERY_TYPES = {
+    "textbox", "image", "shape", "basicShape", "actionButton", "pageNavigator",
+    "bookmarkNavigator", "visualGroup",
+}
+# Per-type base cost (one query each); tables/matrices also pay per projected field below
+_BASE_COST = {
+    "card": 1.0, "cardVisual": 1.5, "multiRowCard": 1.5, "kpi": 1.5, "gauge": 1.0,
+    "slicer": 1.5, "advancedSlicerVisual": 1.5,
+    "tableEx": 2.0, "pivotTable": 3.0,
+    "map": 3.0, "filledMap": 3.0, "shapeMap": 3.0, "azureMap": 3.0,
+    "decompositionTreeVisual": 4.0, "keyDriversVisual": 6.0, "keyDriversInfluencer": 6.0, "qnaVisual": 4.0,
+    "scriptVisual": 8.0, "pythonVisual": 8.0,
+}
+_DEFAULT_BASE = 1.5
+_GRID_TYPES = {"tableEx", "pivotTable"}
+_SLICER_TYPES = {"slicer", "advancedSlicerVisual"}
+_CUSTOM_VISUAL_COST = 3.0  # sandboxed iframe + JS bundle load, no query batching
+_HIGH_CARD_SLICER_FACTOR = 3.0
+
+PAGE_COST_MED = 35.0
+PAGE_COST_HIGH = 60.0
+
+
+def visual_cost(
+    visual: Dict[str, Any],
+    high_cardinality: Optional[Set[str]] = None,
+    custom_visuals: Optional[Set[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Estimated queries and relative render cost of one visual from its extracted features:
+    type, projected field count, visual-level filters and their literal values.
+    ``high_cardinality`` holds "Entity.Property" refs suspected to be high-cardinality;
+    ``custom_visuals`` the visual types the report ships or lists as custom visuals.
+    """
+    vtype = visual.get("visual_type") or "unknown"
+    if vtype in _NO_QUERY_TYPES:
+        return {"queries": 0, "cost": 0.1, "drivers": []}
+
+    drivers: List[str] = []
+    projections = int(visual.get("projection_count") or 0)
+    cost = _BASE_COST.get(vtype, _DEFAULT_BASE)
+    if vtype in _GRID_TYPES:
+        cost += 0.75 * projections
+        if projections >= 10:
+            drivers.append(f"{projections} projected fields")
+    else:
+        cost += 0.25 * max(0, projections - 2)
+
+    literals = int(visual.get("filter_literals") or 0)
+    cost += 0.5 * int(visual.get("filter_count") or 0)
+    if literals:
+        cost += math.log2(1 + literals)
+        if literals >= 50:
+            drivers.append(f"{literals} literal filter values")
+
+    if vtype in _SLICER_TYPES and high_cardinality and any(f in high_cardinality for f in visual.get("fields") or []):
+        cost *= _HIGH_CARD_SLICER_FACTOR
+        drivers.append("high-cardinality slicer")
+    if custom_visuals and vtype in custom_visuals:
+        cost += _CUSTOM_VISUAL_COST
+        drivers.append("custom visual")
+    return {"queries": 1, "cost": round(cost, 2), "drivers": drivers}
+
+
+def high_cardinality_fields(model: Dict[str, Any]) -> Set[str]:
+    """Text/datetime/double columns on the many side of a relationship: likely many distinct values."""
+    facts = {
+        str(r.get("fromTable")).lower()
+        for r in (model.get("relationships") or {}).get("items") or []
+        if r.get("fromTable")
+    }
+    out: Set[str] = set()
+    for t in model.get("tables") or []:
+        if not isinstance(t, dict) or str(t.get("name", "")).lower() not in facts:
+            continue
+        for c in t.get("columns") or []:
+            if str(c.get("dataType") or "").lower() in ("string", "datetime", "double"):
+                out.add(f"{t['name']}.{c['name']}")
+    return out
+
+
+def custom_visual_types(report: Dict[str, Any]) -> Set[str]:
+    """Visual types that are custom visuals: packages under CustomVisuals plus report.json publicCustomVisuals."""
+    packaged = {str(r.get("name")) for r in report.get("resources") or [] if r.get("kind") == "customVisual"}
+    return packaged | set(report.get("public_custom_visuals") or [])
+
+
+def build_render_cost(report: Dict[str, Any], model: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Per-page estimated query count and cost; pages sorted by cost, most expensive first."""
+    high_card = high_cardinality_fields(model or {})
+    custom = custom_visual_types(report)
+    pages: List[Dict[str, Any]] = []
+    visuals_total = 0
+    for page in report.get("pages") or []:
+        queries = 0
+        cost = 0.0
+        heavy: List[Dict[str, Any]] = []
+        for v in page.get("visuals") or []:
+            vc = visual_cost(v, high_card, custom)
+            queries += vc["queries"]
+            cost += vc["cost"]
+            if vc["drivers"]:
+                heavy.append({"visual": v.get("visual_id"), "type": v.get("visual_type"), "cost": vc["cost"], "drivers": vc["drivers"]})
+        visuals_total += page.get("visual_count") or 0
+        heavy.sort(key=lambda h: h["cost"], reverse=True)
+        pages.append({
+            "page": page.get("display_name") or page.get("page_id"),
+            "pageId": page.get("page_id"),
+            "visualCount": page.get("visual_count") or 0,
+            "estimatedQueries": queries,
+            "estimatedCost": round(cost, 2),
+            "heavyVisuals": heavy[:5],
+        })
+    pages.sort(key=lambda p: p["estimatedCost"], reverse=True)
+    return {
+        "visualCount": visuals_total,
+        "estimatedQueries": sum(p["estimatedQueries"] for p in pages),
+        "pageCount": len(pages),
+        "pages": pages,
+        "thresholds": {"MED": PAGE_COST_MED, "HIGH": PAGE_COST_HIGH},
+    }
+
+
+def page_severity(cost: float) -> Optional[str]:
+    if cost >= PAGE_COST_HIGH:
+        return "HIGH"
+    if cost >= PAGE_COST_MED:
+        return "MED"
+    return None
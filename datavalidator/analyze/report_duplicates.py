@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, List, Tuple
+
+_MEMBERS_SHOWN = 20
+
+
+def _group_rows(groups: Dict[str, List[Tuple[str, Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    rows = []
+    for key, members in groups.items():
+        if len(members) < 2:
+            continue
+        first = members[0][1]
+        rows.append({
+            "fingerprint": key,
+            "visualType": first.get("visual_type"),
+            "fields": first.get("fields") or [],
+            "count": len(members),
+            "pages": len({site.split("/", 1)[0] for site, _ in members}),
+            "querySavings": len(members) - 1,
+            "visuals": [site for site, _ in members[:_MEMBERS_SHOWN]],
+        })
+    rows.sort(key=lambda r: (r["querySavings"], r["fingerprint"]), reverse=True)
+    return rows
+
+
+def build_report_duplicates(report: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Group visuals by their normalized query/filter fingerprint (exact duplicates) and by
+    type + field set (near duplicates: same fields, different sort/aggregation/filter values),
+    and pages by the multiset of their visual fingerprints. One pass with hash maps.
+    Each extra copy of an exact duplicate is one query the report could avoid.
+    """
+    exact: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+    near: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+    near_variants: Dict[str, set] = {}
+    pages: Dict[str, List[Dict[str, Any]]] = {}
+
+    for page in report.get("pages") or []:
+        pid = page.get("page_id")
+        page_hashes = []
+        for v in page.get("visuals") or []:
+            if not v.get("config_hash"):
+                continue
+            site = f"{pid}/{v.get('visual_id')}"
+            exact.setdefault(v["config_hash"], []).append((site, v))
+            near.setdefault(v["field_hash"], []).append((site, v))
+            near_variants.setdefault(v["field_hash"], set()).add(v["config_hash"])
+            page_hashes.append(v["config_hash"])
+        if len(page_hashes) >= 2:
+            key = hashlib.sha1("|".join(sorted(page_hashes)).encode("ascii")).hexdigest()[:16]
+            pages.setdefault(key, []).append({
+                "pageId": pid,
+                "page": page.get("display_name") or pid,
+                "visuals": len(page_hashes),
+            })
+
+    exact_groups = _group_rows(exact)
+    # near groups are only interesting when they are not already one exact group
+    near_groups = _group_rows({k: m for k, m in near.items() if len(near_variants[k]) > 1})
+    page_groups = [
+        {"fingerprint": k, "pages": [p["page"] for p in members], "visualsPerPage": members[0]["visuals"],
+         "querySavings": members[0]["visuals"] * (len(members) - 1)}
+        for k, members in pages.items()
+        if len(members) > 1
+    ]
+    page_groups.sort(key=lambda g: g["querySavings"], reverse=True)
+    return {
+        "duplicateVisualGroups": len(exact_groups),
+        "duplicateVisualQuerySavings": sum(g["querySavings"] for g in exact_groups),
+        "nearDuplicateGroups": len(near_groups),
+        "duplicatePageGroups": len(page_groups),
+        "exact": exact_groups[:50],
+        "near": near_groups[:50],
+        "pages": page_groups[:20],
+    }
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+# Above these sizes a resource noticeably delays report load (downloaded before first render)
+IMAGE_LARGE_BYTES = 500_000
+IMAGE_TARGET_BYTES = 150_000  # what a web-optimized background/logo usually needs
+THEME_LARGE_BYTES = 100_000
+CUSTOM_VISUAL_LARGE_BYTES = 1_000_000
+
+
+def build_report_resources(report: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Every report resource with its size and the pages/visuals referencing it. Images are
+    referenced by ``ResourcePackageItem`` item name, the custom and base themes by name from
+    report.json, custom visual packages by visual type.
+    """
+    users: Dict[str, List[str]] = {}
+    visual_types: Dict[str, List[str]] = {}
+    for page in report.get("pages") or []:
+        pid = page.get("page_id")
+        for name in page.get("resources") or []:
+            users.setdefault(name, []).append(f"page:{pid}")
+        for v in page.get("visuals") or []:
+            site = f"{pid}/{v.get('visual_id')}"
+            for name in v.get("resources") or []:
+                users.setdefault(name, []).append(site)
+            visual_types.setdefault(str(v.get("visual_type")), []).append(site)
+    for name in report.get("report_resources") or []:
+        users.setdefault(name, []).append("report")
+    if report.get("custom_theme"):
+        users.setdefault(report["custom_theme"], []).append("theme")
+    # the base theme ships inside SharedResources; older exports reference it without the file
+    if report.get("base_theme") and any(r.get("name") == report["base_theme"] for r in report.get("resources") or []):
+        users.setdefault(report["base_theme"], []).append("theme")
+
+    rows: List[Dict[str, Any]] = []
+    for r in report.get("resources") or []:
+        if r.get("kind") == "customVisual":
+            used_by = visual_types.get(r["name"], [])
+        else:
+            used_by = users.get(r["name"], [])
+        savings = 0
+        problems: List[str] = []
+        size = int(r.get("bytes") or 0)
+        if not used_by and (r.get("registered") or r.get("kind") == "customVisual"):
+            problems.append("unused")
+            savings = size
+        elif r.get("kind") == "image" and size >= IMAGE_LARGE_BYTES:
+            problems.append("oversizedImage")
+            savings = size - IMAGE_TARGET_BYTES
+        elif r.get("kind") == "theme" and size >= THEME_LARGE_BYTES:
+            problems.append("largeTheme")
+        elif r.get("kind") == "customVisual" and size >= CUSTOM_VISUAL_LARGE_BYTES:
+            problems.append("heavyCustomVisual")
+        rows.append({
+            "name": r.get("name"),
+            "path": r.get("path"),
+            "kind": r.get("kind"),
+            "bytes": size,
+            "usedBy": used_by[:25],
+            "uses": len(used_by),
+            "problems": problems,
+            "estimatedSavingsBytes": savings,
+        })
+    rows.sort(key=lambda x: x["bytes"], reverse=True)
+
+    by_kind: Dict[str, int] = {}
+    for row in rows:
+        by_kind[row["kind"]] = by_kind.get(row["kind"], 0) + row["bytes"]
+    # referenced names with no file behind them (deleted/renamed images)
+    present = {r.get("name") for r in report.get("resources") or []}
+    missing = sorted(n for n in users if n not in present)
+    return {
+        "count": len(rows),
+        "totalBytes": sum(by_kind.values()),
+        "bytesByKind": by_kind,
+        "estimatedSavingsBytes": sum(r["estimatedSavingsBytes"] for r in rows),
+        "missingResources": missing,
+        "resources": rows[:200],
+    }
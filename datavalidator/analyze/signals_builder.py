@@ -3,60 +3,73 @@ from __future__ import annotations
 import re
 from typing import Any, Dict, List
 
+from datavalidator.analyze.field_usage import build_field_usage
+from datavalidator.analyze.lineage import build_lineage, lineage_summary
+from datavalidator.analyze.m_duplicates import build_m_duplicates
+from datavalidator.analyze.model_bloat import build_model_bloat
+from datavalidator.analyze.naming import build_naming
+from datavalidator.analyze.native_sql import build_native_sql
+from datavalidator.analyze.refresh_plan import build_refresh_plan
+from datavalidator.analyze.refresh_policy import build_refresh_policies
+from datavalidator.analyze.render_cost import build_render_cost
+from datavalidator.analyze.report_duplicates import build_report_duplicates
+from datavalidator.analyze.report_resources import build_report_resources
+from datavalidator.analyze.storage_modes import build_storage_modes
+from datavalidator.core.regex_guard import GuardedPattern, scan_budget
 
-_RE_HARDCODED_HOST = re.compile(r"(https?://[^\s\"']+)|(\b[A-Za-z0-9\-_]+\.[A-Za-z0-9\-_]+\.[A-Za-z]{2,}\b)")
-_RE_RANGE = re.compile(r"\bRangeStart\b|\bRangeEnd\b", re.IGNORECASE)
-_RE_STEP = re.compile(r'#"\s*[^"]+\s*"')
-_RE_FILTER = re.compile(r"\bTable\.SelectRows\b|\bWHERE\b", re.IGNORECASE)
-_RE_HEAVY = re.compile(
+
+# DNS labels are at most 63 characters; bounding them keeps the host scan linear on long "a-a-a-..." runs
+_RE_HARDCODED_HOST = GuardedPattern(
+    re.compile(r"(https?://[^\s\"']+)|(\b[A-Za-z0-9\-_]{1,63}\.[A-Za-z0-9\-_]{1,63}\.[A-Za-z]{2,63}\b)"),
+    "signals.HARDCODED_HOST",
+)
+_RE_RANGE = GuardedPattern(re.compile(r"\bRangeStart\b|\bRangeEnd\b", re.IGNORECASE), "signals.RANGE")
+_RE_STEP = GuardedPattern(re.compile(r'#"[^"]+"'), "signals.STEP")
+_RE_FILTER = GuardedPattern(re.compile(r"\bTable\.SelectRows\b|\bWHERE\b", re.IGNORECASE), "signals.FILTER")
+_RE_HEAVY = GuardedPattern(re.compile(
     r"\bTable\.(Group|Join|NestedJoin|ExpandTableColumn|TransformColumns|AddColumn|Sort)\b",
     re.IGNORECASE,
-)
+), "signals.HEAVY")
 
 _FOLDING_BREAKERS = [
-    (re.compile(r"\bTable\.Buffer\b", re.IGNORECASE), "Table.Buffer"),
-    (re.compile(r"\bBinary\.Decompress\b", re.IGNORECASE), "Binary.Decompress"),
-    (re.compile(r"\bTable\.ToRecords\b|\bRecord\.ToTable\b", re.IGNORECASE), "Record/List materialization"),
-    (re.compile(r"\bOdbc\.Query\b", re.IGNORECASE), "Odbc.Query"),
+    (GuardedPattern(re.compile(r"\bTable\.Buffer\b", re.IGNORECASE)), "Table.Buffer"),
+    (GuardedPattern(re.compile(r"\bBinary\.Decompress\b", re.IGNORECASE)), "Binary.Decompress"),
+    (GuardedPattern(re.compile(r"\bTable\.ToRecords\b|\bRecord\.ToTable\b", re.IGNORECASE)), "Record/List materialization"),
+    (GuardedPattern(re.compile(r"\bOdbc\.Query\b", re.IGNORECASE)), "Odbc.Query"),
 ]
 
 _SOURCE_LITERAL_PATTERNS = [
-    re.compile(r"\bSql\.Database\s*\(\s*\"[^\"]+\"\s*,\s*\"[^\"]+\"", re.IGNORECASE),
-    re.compile(r"\bWeb\.Contents\s*\(\s*\"https?://", re.IGNORECASE),
-    re.compile(r"\bFile\.Contents\s*\(\s*\"[A-Za-z]:\\", re.IGNORECASE),
-    re.compile(r"\bOdbc\.DataSource\s*\(\s*\"[^\"]+\"", re.IGNORECASE),
-    re.compile(r"\bDatabricks\.Catalogs\s*\(\s*\"[^\"]+\"", re.IGNORECASE),
+    GuardedPattern(re.compile(r"\bSql\.Database\s*\(\s*\"[^\"]+\"\s*,\s*\"[^\"]+\"", re.IGNORECASE)),
+    GuardedPattern(re.compile(r"\bWeb\.Contents\s*\(\s*\"https?://", re.IGNORECASE)),
+    GuardedPattern(re.compile(r"\bFile\.Contents\s*\(\s*\"[A-Za-z]:\\", re.IGNORECASE)),
+    GuardedPattern(re.compile(r"\bOdbc\.DataSource\s*\(\s*\"[^\"]+\"", re.IGNORECASE)),
+    GuardedPattern(re.compile(r"\bDatabricks\.Catalogs\s*\(\s*\"[^\"]+\"", re.IGNORECASE)),
 ]
-_SOURCE_PARAM_HINT = re.compile(
+_SOURCE_PARAM_HINT = GuardedPattern(re.compile(
     r"\b(Sql\.Database|Databricks\.Catalogs|Web\.Contents|File\.Contents|Odbc\.DataSource)\s*\(\s*[A-Za-z_][A-Za-z0-9_]*",
     re.IGNORECASE,
-)
+), "signals.SOURCE_PARAM_HINT")
 _SOURCE_PATTERNS = [
-    (re.compile(r"\bSql\.Database\b", re.IGNORECASE), "SQL Server"),
-    (re.compile(r"\bDatabricks\.Catalogs\b", re.IGNORECASE), "Databricks"),
-    (re.compile(r"\bPowerBI\.Dataflows\b", re.IGNORECASE), "Power BI Dataflows"),
-    (re.compile(r"\bWeb\.Contents\b", re.IGNORECASE), "Web/API"),
-    (re.compile(r"\bFile\.Contents\b", re.IGNORECASE), "File"),
-    (re.compile(r"\bOdbc\.(DataSource|Query)\b", re.IGNORECASE), "ODBC"),
-    (re.compile(r"\bOleDb\.DataSource\b", re.IGNORECASE), "OLE DB"),
-    (re.compile(r"\bSnowflake\.Databases\b", re.IGNORECASE), "Snowflake"),
-    (re.compile(r"\bGoogleBigQuery\.Database\b", re.IGNORECASE), "BigQuery"),
-    (re.compile(r"\bSapHana\.Database\b", re.IGNORECASE), "SAP HANA"),
+    (GuardedPattern(re.compile(r"\bSql\.Database\b", re.IGNORECASE)), "SQL Server"),
+    (GuardedPattern(re.compile(r"\bDatabricks\.Catalogs\b", re.IGNORECASE)), "Databricks"),
+    (GuardedPattern(re.compile(r"\bPowerBI\.Dataflows\b", re.IGNORECASE)), "Power BI Dataflows"),
+    (GuardedPattern(re.compile(r"\bWeb\.Contents\b", re.IGNORECASE)), "Web/API"),
+    (GuardedPattern(re.compile(r"\bFile\.Contents\b", re.IGNORECASE)), "File"),
+    (GuardedPattern(re.compile(r"\bOdbc\.(DataSource|Query)\b", re.IGNORECASE)), "ODBC"),
+    (GuardedPattern(re.compile(r"\bOleDb\.DataSource\b", re.IGNORECASE)), "OLE DB"),
+    (GuardedPattern(re.compile(r"\bSnowflake\.Databases\b", re.IGNORECASE)), "Snowflake"),
+    (GuardedPattern(re.compile(r"\bGoogleBigQuery\.Database\b", re.IGNORECASE)), "BigQuery"),
+    (GuardedPattern(re.compile(r"\bSapHana\.Database\b", re.IGNORECASE)), "SAP HANA"),
 ]
 
 
-def _name_style(name: str) -> str:
-    if re.fullmatch(r"[a-z][a-z0-9_]*", name):
-        return "snake_case"
-    if re.fullmatch(r"[A-Z][A-Za-z0-9]*", name):
-        return "PascalCase"
-    if re.fullmatch(r"[a-z][A-Za-z0-9]*", name) and any(c.isupper() for c in name):
-        return "camelCase"
-    if " " in name:
-        return "space_separated"
-    if "-" in name:
-        return "kebab-case"
-    return "other"
+def _m_profile(m_text: str) -> Dict[str, Any]:
+    """Connectors, folding breakers and heavy step count of one M expression (refresh plan input)."""
+    return {
+        "sources": [name for rx, name in _SOURCE_PATTERNS if rx.search(m_text)],
+        "breakers": [label for rx, label in _FOLDING_BREAKERS if rx.search(m_text)],
+        "heavyOps": len(_RE_HEAVY.findall(m_text)),
+    }
 
 
 def build_signals(inventory: Dict[str, Any]) -> Dict[str, Any]:
@@ -101,7 +114,15 @@ def build_signals(inventory: Dict[str, Any]) -> Dict[str, Any]:
     has_range = ("RangeStart" in param_names or "RangeEnd" in param_names) or any(
         _RE_RANGE.search((it.get("mSnippet") or "")) for it in pq_items
     )
-    signals["incremental"] = {"hasRangeParamsOrRefs": bool(has_range)}
+    # refreshPolicy blocks from table TMDL: windows, partition estimates, full-refresh risks
+    policies = build_refresh_policies(model)
+    signals["incremental"] = {
+        "hasRangeParamsOrRefs": bool(has_range),
+        "policyCount": len(policies),
+        "estimatedPartitions": sum(p["estimatedPartitions"] or 0 for p in policies),
+        "refreshedPerRun": sum(p["refreshedPerRun"] or 0 for p in policies),
+        "policies": policies,
+    }
 
     # Hard-coded vs parameterized source hints
     hardcoded_hits = []
@@ -110,100 +131,85 @@ def build_signals(inventory: Dict[str, Any]) -> Dict[str, Any]:
     sources_by_table = []
     folding_by_table = []
     breaker_counts: Dict[str, int] = {}
+    scan_timeouts: List[Dict[str, Any]] = list(pq.get("scanTimeouts") or [])
 
     for it in pq_items:
         table = it.get("table")
         path = it.get("path")
         snip = it.get("mSnippet") or ""
-        matched_literal = None
-        for rx in _SOURCE_LITERAL_PATTERNS:
-            lm = rx.search(snip)
-            if lm:
-                matched_literal = lm.group(0)[:220]
-                break
-
-        generic_host_hit = None
-        m = _RE_HARDCODED_HOST.search(snip)
-        if m:
-            generic_host_hit = m.group(0)
-
-        is_param_source = bool(_SOURCE_PARAM_HINT.search(snip)) or any(
-            re.search(rf"\b{re.escape(pn)}\b", snip) for pn in param_names
-        )
-
-        if matched_literal or generic_host_hit:
-            hardcoded_hits.append(
+        with scan_budget(str(path or table)) as budget:
+            matched_literal = None
+            for rx in _SOURCE_LITERAL_PATTERNS:
+                lm = rx.search(snip)
+                if lm:
+                    matched_literal = lm.group(0)[:220]
+                    break
+
+            generic_host_hit = None
+            m = _RE_HARDCODED_HOST.search(snip)
+            if m:
+                generic_host_hit = m.group(0)
+
+            is_param_source = bool(_SOURCE_PARAM_HINT.search(snip)) or any(
+                re.search(rf"\b{re.escape(pn)}\b", snip) for pn in param_names
+            )
+
+            if matched_literal or generic_host_hit:
+                hardcoded_hits.append(
+                    {
+                        "table": table,
+                        "path": path,
+                        "hit": matched_literal or generic_host_hit,
+                    }
+                )
+
+            status = "parameterized" if is_param_source and not (matched_literal or generic_host_hit) else "hardcodedOrLiteral"
+            if not matched_literal and not generic_host_hit and not is_param_source:
+                status = "unknown"
+            source_coverage.append({"table": table, "path": path, "status": status})
+
+            matched_sources = []
+            for rx, source_name in _SOURCE_PATTERNS:
+                if rx.search(snip):
+                    matched_sources.append(source_name)
+                    source_counts[source_name] = source_counts.get(source_name, 0) + 1
+            if bool(it.get("isNativeQuery")):
+                matched_sources.append("Native Query")
+                source_counts["Native Query"] = source_counts.get("Native Query", 0) + 1
+
+            normalized_sources = sorted(set(matched_sources)) or ["Unknown"]
+            for src in normalized_sources:
+                if src == "Unknown":
+                    source_counts[src] = source_counts.get(src, 0) + 1
+            sources_by_table.append({"table": table, "path": path, "sources": normalized_sources})
+
+            # Folding heuristics
+            breakers = []
+            for rx, label in _FOLDING_BREAKERS:
+                if rx.search(snip):
+                    breakers.append(label)
+                    breaker_counts[label] = breaker_counts.get(label, 0) + 1
+            heavy_ops = len(_RE_HEAVY.findall(snip))
+            has_filter = bool(_RE_FILTER.search(snip))
+            steps = len(_RE_STEP.findall(snip))
+            folding_by_table.append(
                 {
                     "table": table,
                     "path": path,
-                    "hit": matched_literal or generic_host_hit,
+                    "breakers": breakers,
+                    "stepCount": steps,
+                    "heavyOps": heavy_ops,
+                    "hasFilterHint": has_filter,
+                    "isNativeQuery": bool(it.get("isNativeQuery")),
                 }
             )
-
-        status = "parameterized" if is_param_source and not (matched_literal or generic_host_hit) else "hardcodedOrLiteral"
-        if not matched_literal and not generic_host_hit and not is_param_source:
-            status = "unknown"
-        source_coverage.append({"table": table, "path": path, "status": status})
-
-        matched_sources = []
-        for rx, source_name in _SOURCE_PATTERNS:
-            if rx.search(snip):
-                matched_sources.append(source_name)
-                source_counts[source_name] = source_counts.get(source_name, 0) + 1
-        if bool(it.get("isNativeQuery")):
-            matched_sources.append("Native Query")
-            source_counts["Native Query"] = source_counts.get("Native Query", 0) + 1
-
-        normalized_sources = sorted(set(matched_sources)) or ["Unknown"]
-        for src in normalized_sources:
-            if src == "Unknown":
-                source_counts[src] = source_counts.get(src, 0) + 1
-        sources_by_table.append({"table": table, "path": path, "sources": normalized_sources})
-
-        # Folding heuristics
-        breakers = []
-        for rx, label in _FOLDING_BREAKERS:
-            if rx.search(snip):
-                breakers.append(label)
-                breaker_counts[label] = breaker_counts.get(label, 0) + 1
-        heavy_ops = len(_RE_HEAVY.findall(snip))
-        has_filter = bool(_RE_FILTER.search(snip))
-        steps = len(_RE_STEP.findall(snip))
-        folding_by_table.append(
-            {
-                "table": table,
-                "path": path,
-                "breakers": breakers,
-                "stepCount": steps,
-                "heavyOps": heavy_ops,
-                "hasFilterHint": has_filter,
-                "isNativeQuery": bool(it.get("isNativeQuery")),
-            }
-        )
+        scan_timeouts.extend(budget.to_list())
 
     top_breakers = [
         {"pattern": k, "count": v}
         for k, v in sorted(breaker_counts.items(), key=lambda kv: kv[1], reverse=True)
     ][:8]
 
-    # Naming convention dominance from semantic model tables
-    table_names = [
-        t.get("name", "")
-        for t in model_tables
-        if isinstance(t, dict) and t.get("name") and t.get("name") not in excluded_table_names
-    ]
-    style_counts: Dict[str, int] = {}
-    for nm in table_names:
-        style = _name_style(nm)
-        style_counts[style] = style_counts.get(style, 0) + 1
-    dominant_style = None
-    dominant_count = 0
-    if style_counts:
-        dominant_style, dominant_count = sorted(style_counts.items(), key=lambda kv: kv[1], reverse=True)[0]
-    outliers = []
-    if dominant_style:
-        outliers = [nm for nm in table_names if _name_style(nm) != dominant_style][:50]
-
     signals["powerQuery"] = {
         "count": pq_count,
         "items": pq_items,
@@ -226,21 +232,58 @@ def build_signals(inventory: Dict[str, Any]) -> Dict[str, Any]:
         "countDistinct": len([r for r in connector_rows if r.get("name") != "Unknown"]),
         "multipleSources": len([r for r in connector_rows if r.get("name") != "Unknown"]) > 1,
     }
-    signals["naming"] = {
-        "tableStyles": style_counts,
-        "dominantTableStyle": dominant_style,
-        "dominantCoverage": (dominant_count / len(table_names)) if table_names else None,
-        "outlierTables": outliers,
-        "tableCount": len(table_names),
+    # Naming styles of tables/columns/measures and names written several ways (Sales Amount / Sales_Amt)
+    signals["naming"] = build_naming(model, excluded_table_names)
+    # Embedded data (Enter Data / Binary.FromText payloads), measured by the streaming TMDL reader
+    payload_rows = []
+    for t in model_tables:
+        for pl in (t.get("embeddedPayloads") or []) if isinstance(t, dict) else []:
+            payload_rows.append({"table": t.get("name"), "path": t.get("path"), **pl})
+    payload_rows.sort(key=lambda r: r.get("approxBytes") or 0, reverse=True)
+    signals["embeddedData"] = {
+        "count": len(payload_rows),
+        "totalBytes": sum(r.get("approxBytes") or 0 for r in payload_rows),
+        "binaryDecompressBytes": sum(r.get("approxBytes") or 0 for r in payload_rows if r.get("context") == "Binary.Decompress"),
+        "payloads": payload_rows[:50],
     }
+
+    # Copy-pasted M partitions (normalized, MinHash/LSH clustered) and the source round trips they repeat
+    signals["mDuplicates"] = build_m_duplicates(model)
+
+    # Refresh task graph: relative cost per table, critical path, peak connections per source
+    with scan_budget("refreshPlan") as budget:
+        signals["refreshPlan"] = build_refresh_plan(model, _m_profile, policies)
+    scan_timeouts.extend(budget.to_list())
+
+    # SQL text inside Value.NativeQuery / Query= options, unescaped and checked per statement
+    signals["nativeSql"] = build_native_sql(model)
+
+    # Regex inputs skipped by the guard (oversized or over time budget); extraction + signal passes
+    signals["scanTimeouts"] = scan_timeouts
+
+    # Relative memory weight per table/column and the avoidable part of it
+    signals["modelBloat"] = build_model_bloat(model)
+
     signals["model"] = {
         "tablesCount": model.get("tablesCount"),
         "relationships": model.get("relationships") or {},
     }
+    # Per-partition storage modes, limited relationships and aggregation mappings
+    signals["storageModes"] = build_storage_modes(model)
     report = inventory.get("report") or {}
+    # Visual/filter references resolved against model columns and measures
+    signals["fieldUsage"] = build_field_usage(inventory).to_dict()
+    # Source column -> model column -> measure -> visual reachability
+    signals["lineage"] = lineage_summary(build_lineage(inventory))
     signals["report"] = {
         "pageCount": len(report.get("pages") or []),
         "themePresent": bool(report.get("theme_present")),
     }
+    # Estimated queries and render cost per page, from each visual's query/filter definition
+    signals["renderCost"] = build_render_cost(report, model)
+    # Visuals/pages with identical (or same-field) query definitions
+    signals["reportDuplicates"] = build_report_duplicates(report)
+    # Images, theme files and custom visual packages: size and who references them
+    signals["reportResources"] = build_report_resources(report)
 
     return signals
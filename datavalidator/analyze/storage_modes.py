@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional, Set
+
+from datavalidator.extract.m_steps import let_steps
+
+_IMPORT_GROUP = "import"
+# First connector call of a DirectQuery partition identifies its source group (server/database)
+_RE_CONNECTOR = re.compile(r"\b([A-Z][A-Za-z]*\.(?:Database|Databases|DataSource|Catalogs|Contents|Query|Warehouses|Lakehouses|Dataflows))\s*\(([^()]*)\)")
+_RE_WS = re.compile(r"\s+")
+
+
+def _source_group(source: str, table: str) -> str:
+    steps, result = let_steps(source)
+    text = steps[0][1] if steps else (result or source)
+    m = _RE_CONNECTOR.search(text) or _RE_CONNECTOR.search(source)
+    if not m:
+        return f"directQuery:{table}"  # unknown source: assume its own group
+    return f"{m.group(1)}({_RE_WS.sub('', m.group(2))})"
+
+
+def table_storage(table: Dict[str, Any], default_mode: str = "import") -> Dict[str, Any]:
+    """
+    Storage mode of a table from its partitions (``default`` resolves to the model's defaultMode).
+    Calculated tables are import. Tables whose partitions disagree (hybrid tables) are ``mixed``.
+    Source groups: import data shares one group; each DirectQuery source is its own group;
+    dual and mixed tables belong to both.
+    """
+    modes: List[str] = []
+    groups: Set[str] = set()
+    for p in table.get("partitions") or []:
+        mode = str(p.get("mode") or "default")
+        if mode == "default":
+            mode = default_mode
+        if p.get("kind") == "calculated":
+            mode = "import"
+        modes.append(mode)
+        if mode in ("directQuery", "dual"):
+            groups.add(_source_group(p.get("source") or "", str(table.get("name"))))
+        if mode in ("import", "dual"):
+            groups.add(_IMPORT_GROUP)
+    distinct = sorted(set(modes))
+    if not distinct:
+        storage = "import" if table.get("isCalculated") else default_mode
+        groups.add(_IMPORT_GROUP if storage != "directQuery" else f"directQuery:{table.get('name')}")
+    else:
+        storage = distinct[0] if len(distinct) == 1 else "mixed"
+    return {"storageMode": storage, "partitionModes": modes, "sourceGroups": sorted(groups)}
+
+
+def _is_many_to_many(rel: Dict[str, Any]) -> bool:
+    return str(rel.get("fromCardinality", "many")).lower() == "many" and str(rel.get("toCardinality", "one")).lower() == "many"
+
+
+def build_storage_modes(model: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Per-table storage mode and source groups, relationships classified as regular or limited
+    (tables in different source groups, or many-to-many), and aggregation table mappings.
+    """
+    default_mode = model.get("defaultMode") or "import"
+    tables: Dict[str, Dict[str, Any]] = {}
+    columns: Dict[str, Set[str]] = {}
+    mode_counts: Dict[str, int] = {}
+    for t in model.get("tables") or []:
+        if not isinstance(t, dict) or not t.get("name"):
+            continue
+        info = table_storage(t, default_mode)
+        tables[t["name"].lower()] = {"table": t["name"], **info}
+        columns[t["name"].lower()] = {str(c.get("name")).lower() for c in t.get("columns") or []}
+        mode_counts[info["storageMode"]] = mode_counts.get(info["storageMode"], 0) + 1
+
+    def mode_of(name: Optional[str]) -> Optional[str]:
+        info = tables.get(str(name).lower())
+        return info["storageMode"] if info else None
+
+    relationships: List[Dict[str, Any]] = []
+    dq_facts: Set[str] = set()
+    for r in (model.get("relationships") or {}).get("items") or []:
+        src, dst = tables.get(str(r.get("fromTable")).lower()), tables.get(str(r.get("toTable")).lower())
+        if not src or not dst:
+            continue
+        if src["storageMode"] in ("directQuery", "mixed"):
+            dq_facts.add(src["table"])
+        reason = None
+        if _is_many_to_many(r):
+            reason = "manyToMany"
+        elif not set(src["sourceGroups"]) & set(dst["sourceGroups"]):
+            reason = "crossSourceGroup"
+        relationships.append({
+            "name": r.get("name"),
+            "fromTable": src["table"],
+            "fromMode": src["storageMode"],
+            "toTable": dst["table"],
+            "toMode": dst["storageMode"],
+            "limited": reason is not None,
+            "reason": reason,
+            # Import on one side, DirectQuery on the other: a Dual dimension would make the join regular
+            "shouldBeDual": reason == "crossSourceGroup" and {src["storageMode"], dst["storageMode"]} == {"import", "directQuery"},
+        })
+
+    aggregations: List[Dict[str, Any]] = []
+    aggregated_bases: Set[str] = set()
+    for t in model.get("tables") or []:
+        if not isinstance(t, dict) or not t.get("name"):
+            continue
+        for c in t.get("columns") or []:
+            alt = c.get("alternateOf")
+            if not alt:
+                continue
+            base_table, base_column = alt.get("baseTable"), alt.get("baseColumn")
+            problems = []
+            if not base_table or base_table.lower() not in tables:
+                problems.append("base table not in model")
+            elif base_column and base_column.lower() not in columns.get(base_table.lower(), set()):
+                problems.append("base column not in model")
+            if mode_of(t["name"]) == "directQuery":
+                problems.append("aggregation table is DirectQuery")
+            if base_table and mode_of(base_table) == "import":
+                problems.append("base table is Import; aggregations only redirect DirectQuery queries")
+            if base_table:
+                aggregated_bases.add(base_table.lower())
+            aggregations.append({
+                "table": t["name"],
+                "column": c.get("name"),
+                "baseTable": base_table,
+                "baseColumn": base_column,
+                "summarization": alt.get("summarization"),
+                "problems": problems,
+            })
+
+    dq_without_aggs = sorted(f for f in dq_facts if f.lower() not in aggregated_bases)
+    is_composite = len({g for info in tables.values() for g in info["sourceGroups"]}) > 1
+    return {
+        "defaultMode": default_mode,
+        "modeCounts": mode_counts,
+        "isComposite": is_composite,
+        "tables": sorted(tables.values(), key=lambda x: x["table"].lower()),
+        "relationships": relationships,
+        "limitedRelationships": sum(1 for r in relationships if r["limited"]),
+        "aggregations": aggregations,
+        "directQueryFactsWithoutAggregations": dq_without_aggs,
+    }
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Union
+
+from datavalidator.analyze.findings_builder import build_findings
+from datavalidator.analyze.inventory_builder import build_inventory
+from datavalidator.core.cache import FileCache
+from datavalidator.core.findings import Finding
+from datavalidator.extract.archive_source import archive_root, is_archive
+from datavalidator.extract.vfs import VirtualPath, as_path, find_project_root, memory_root
+
+
+@dataclass
+class ScanResult:
+    project: str
+    inventory: Dict[str, Any]
+    signals: Dict[str, Any]
+    findings: List[Dict[str, Any]]
+
+    def typed_findings(self) -> List[Finding]:
+        return [Finding.from_dict(f) for f in self.findings]
+
+    def count_by_severity(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for f in self.findings:
+            sev = f.get("severity", "INFO")
+            counts[sev] = counts.get(sev, 0) + 1
+        return counts
+
+
+Sink = Callable[[ScanResult], None]
+
+
+def load_inventory(project: Union[Path, VirtualPath], cache: Optional[FileCache] = None) -> Dict[str, Any]:
+    """Inventory of a project folder, .pbip file or .zip/.tar export."""
+    # archives are read in place through their member index; nothing is extracted to disk
+    opened = archive_root(project) if is_archive(project) else None
+    try:
+        return build_inventory(opened or project, cache=cache)
+    finally:
+        if opened is not None:
+            opened.store.close()
+
+
+def scan(
+    project: Union[str, Path, VirtualPath, None] = None,
+    *,
+    files: Optional[Mapping[str, Union[str, bytes]]] = None,
+    sinks: Iterable[Sink] = (),
+    cache: Optional[FileCache] = None,
+) -> ScanResult:
+    """
+    Scan a PBIP project and return results in memory.
+
+    Pass either ``project`` (folder, .pbip path, or .zip/.tar export) or ``files``
+    ({relative path: text}) to scan content that never touched disk. Nothing is written unless sinks are supplied, e.g.
+    ``sinks=[JsonArtifactsSink(out_dir), HtmlReportSink(out_dir)]``.
+    """
+    if (project is None) == (files is None):
+        raise ValueError("scan: pass exactly one of 'project' or 'files'")
+
+    if files is not None:
+        project = find_project_root(memory_root(files))
+    project = as_path(project)
+
+    inventory = load_inventory(project, cache=cache)
+    bundle = build_findings(inventory)
+    result = ScanResult(
+        project=str(project),
+        inventory=inventory,
+        signals=bundle["signals"],
+        findings=bundle["findings"],
+    )
+
+    for sink in sinks:
+        sink(result)
+    return result
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
+from typing import List, Optional
 import typer
 from dotenv import load_dotenv
 
@@ -9,11 +10,16 @@ from datavalidator.pipeline import run_pipeline
 
 app = typer.Typer(add_completion=False)
 
-@app.command()
+@app.callback(invoke_without_command=True)
 def run(
-    project: Path = typer.Option(..., "--project", "-p", exists=True, help="PBIP project root folder"),
+    ctx: typer.Context,
+    project: Optional[Path] = typer.Option(None, "--project", "-p", exists=True, help="PBIP project root folder, .pbip file, or .zip/.tar export"),
     out: Path = typer.Option(Path("output"), "--out", "-o", help="Output directory"),
     ai: bool = typer.Option(False, "--ai", help="Run AI review (Power Query first)"),
+    baseline: Optional[Path] = typer.Option(None, "--baseline", exists=True, dir_okay=False, help="Prior findings.json (or fingerprint list); report only new/resolved findings"),
+    suppressions: Optional[Path] = typer.Option(None, "--suppressions", exists=True, dir_okay=False, help="Suppression file (JSON) with optional expiry dates"),
+    fail_on: str = typer.Option("LOW", "--fail-on", help="With --baseline: exit 1 when a new finding has this severity or higher"),
+    store: Optional[Path] = typer.Option(None, "--store", dir_okay=False, help="Also append this run to a SQLite results store (see 'history')"),
 ):
     """
     Run QA scan on a PBIP project and generate:
@@ -22,7 +28,15 @@ def run(
       - output/findings.json
       - (optional) output/ai_pq.json
       - output/report.html
+      - output/baseline_diff.json (with --baseline/--suppressions)
+      - one run appended to the --store database (optional)
     """
+    if ctx.invoked_subcommand is not None:
+        return
+    if project is None:
+        typer.echo("Error: Missing option '--project' / '-p'.", err=True)
+        raise typer.Exit(code=2)
+
     # IMPORTANT: load .env into environment for THIS process
     load_dotenv(override=False)
 
@@ -33,9 +47,168 @@ def run(
     run_dir = out / f"{project_name}_{ts}"
     run_dir.mkdir(parents=True, exist_ok=True)
 
-    run_pipeline(project_path=project, out_dir=run_dir, run_ai=ai)
+    diff = run_pipeline(
+        project_path=project,
+        out_dir=run_dir,
+        run_ai=ai,
+        baseline_path=baseline,
+        suppressions_path=suppressions,
+        store_path=store,
+    )
     typer.echo(f"Report generated: {run_dir / 'report.html'}")
 
+    for bad in diff.invalid_suppressions if diff is not None else []:
+        typer.echo(f"Invalid suppression {bad['file']} #{bad['index']}: {bad['error']} (entry ignored)", err=True)
+
+    if diff is not None and diff.has_baseline:
+        typer.echo(
+            f"Baseline: {len(diff.new)} new, {len(diff.resolved)} resolved, "
+            f"{diff.existing} unchanged, {len(diff.suppressed)} suppressed"
+        )
+        if diff.gate_failed(fail_on):
+            typer.echo(f"Gate failed: new findings at or above {fail_on.upper()}", err=True)
+            raise typer.Exit(code=1)
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind (keep local unless fronted by a proxy)"),
+    port: int = typer.Option(8765, "--port", help="TCP port"),
+    max_projects: int = typer.Option(8, "--max-projects", help="How many parsed projects to keep warm (LRU)"),
+    max_concurrent: int = typer.Option(2, "--max-concurrent", help="Scans allowed to run at the same time"),
+    queue_timeout: float = typer.Option(30.0, "--queue-timeout", help="Seconds a request waits for a scan slot before 503"),
+):
+    """
+    Run a local HTTP scan service that keeps recently parsed projects in memory.
+    POST /scan {"project": "<path>"} returns findings JSON; GET /health and /metrics for ops.
+    """
+    from datavalidator.server import serve as run_server
+
+    typer.echo(f"Serving on http://{host}:{port} (max projects {max_projects}, max concurrent {max_concurrent})")
+    run_server(host=host, port=port, max_projects=max_projects, max_concurrent=max_concurrent, queue_timeout=queue_timeout)
+
+@app.command()
+def timeline(
+    repo: Path = typer.Option(Path("."), "--repo", exists=True, file_okay=False, help="Git repository holding the PBIP"),
+    subdir: str = typer.Option("", "--path", help="PBIP folder inside the repo (default: repo root)"),
+    rev: str = typer.Option("HEAD", "--rev", help="Revision to walk back from"),
+    max_count: int = typer.Option(200, "--max-count", "-n", help="How many commits touching the PBIP to scan"),
+    out: Path = typer.Option(Path("timeline.json"), "--out", "-o", help="Output JSON file"),
+):
+    """
+    Scan PBIP history straight from git objects (no checkouts) and write a per-revision findings timeline.
+    """
+    import json
+    from datavalidator.timeline import build_timeline
+
+    def progress(point):
+        typer.echo(f"{point['commit'][:10]} {point['date'][:10]} findings={point['findingsCount']} "
+                   f"new={len(point['new'])} resolved={len(point['resolved'])} reparsed={point['filesReparsed']}")
+
+    data = build_timeline(repo, rev=rev, max_count=max_count, subdir=subdir, on_revision=progress)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    typer.echo(f"Timeline written: {out} ({data['revisions']} revisions, {data['elapsedSec']}s)")
+
+@app.command()
+def lineage(
+    project: Path = typer.Option(..., "--project", "-p", exists=True, help="PBIP project root folder, .pbip file, or .zip/.tar export"),
+    out: Optional[Path] = typer.Option(None, "--out", "-o", help="Write the full graph (nodes + CSR adjacency) as JSON"),
+    impact: Optional[List[str]] = typer.Option(None, "--impact", help="Table[Column] or Table[Measure]; print what depends on it (repeatable)"),
+):
+    """
+    Column lineage from source queries through model columns and measures to visuals.
+    """
+    import json
+    from datavalidator.analyze.findings_builder import model_inventories
+    from datavalidator.analyze.lineage import build_lineage, lineage_summary
+    from datavalidator.api import load_inventory
+
+    # one graph per semantic model, fed by the pages of every report bound to it
+    graphs = []
+    for name, inv in model_inventories(load_inventory(project)):
+        graph = build_lineage(inv)
+        summary = lineage_summary(graph)
+        graphs.append({"model": name, "summary": summary, **graph.to_dict()})
+        prefix = f"[{name}] " if name else ""
+        typer.echo(f"{prefix}Nodes: {summary['nodeCounts']}, edges: {summary['edgeCount']}")
+        for ref in impact or []:
+            typer.echo(prefix + json.dumps({"impact": graph.impact(ref), "sources": graph.sources_of(ref)}, indent=2))
+    if out is not None:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        data = {k: v for k, v in graphs[0].items() if k != "model"} if len(graphs) == 1 else {"models": graphs}
+        out.write_text(json.dumps(data), encoding="utf-8")
+        typer.echo(f"Lineage written: {out}")
+
+@app.command()
+def duplicates(
+    projects: List[Path] = typer.Option(..., "--project", "-p", exists=True, help="PBIP project (repeat for a batch)"),
+    out: Optional[Path] = typer.Option(None, "--out", "-o", help="Write every cluster as JSON"),
+    limit: int = typer.Option(10, "--limit", "-n", help="Clusters to print"),
+):
+    """
+    Near-duplicate M queries within and across projects, and the source round trips a shared
+    staging query or dataflow would save.
+    """
+    import json
+    from datavalidator.analyze.m_duplicates import batch_m_duplicates
+
+    data = batch_m_duplicates(projects)
+    typer.echo(
+        f"Queries: {data['queriesIndexed']}, clusters: {data['clusterCount']} "
+        f"({data['crossProjectClusters']} across projects), round trips saved: {data['roundTripsSaved']}"
+    )
+    for c in data["clusters"][:limit]:
+        typer.echo(f"- {c['match']} x{c['size']} (similarity {c['similarity']}, saves {c['roundTripsSaved']}): {', '.join(c['members'][:5])}")
+    if out is not None:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        typer.echo(f"Duplicates written: {out}")
+
+@app.command()
+def history(
+    store: Path = typer.Option(..., "--store", exists=True, dir_okay=False, help="SQLite results store written with --store"),
+    query: str = typer.Option("offenders", "--query", "-q", help="trend | offenders | rules | regressions"),
+    project: Optional[str] = typer.Option(None, "--project", help="trend: limit to one project"),
+    since: Optional[str] = typer.Option(None, "--since", help="ISO date; trend start, or the regressions baseline cut-off"),
+    min_severity: str = typer.Option("LOW", "--min-severity", help="rules/regressions: ignore findings below this severity"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Maximum rows"),
+    as_json: bool = typer.Option(False, "--json", help="Print JSON instead of a table"),
+):
+    """
+    Fleet-wide queries over the results store: severity trend, top offending projects,
+    most frequent rules, and projects that regressed since a date.
+    """
+    import json
+    from datavalidator.history import ResultsStore
+
+    with ResultsStore(store) as db:
+        if query == "trend":
+            rows = db.trend(project=project, since=since, limit=limit)
+        elif query == "offenders":
+            rows = db.top_offenders(limit=limit)
+        elif query == "rules":
+            rows = db.top_rules(limit=limit, min_severity=min_severity)
+        elif query == "regressions":
+            if not since:
+                typer.echo("Error: --since is required for regressions.", err=True)
+                raise typer.Exit(code=2)
+            rows = db.regressions(since, limit=limit, min_severity=min_severity)
+        else:
+            typer.echo(f"Error: unknown query '{query}' (trend | offenders | rules | regressions).", err=True)
+            raise typer.Exit(code=2)
+
+    if as_json:
+        typer.echo(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        typer.echo("No rows.")
+        return
+    columns = list(rows[0])
+    widths = [max(len(c), *(len(str(r[c])) for r in rows)) for c in columns]
+    typer.echo("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for r in rows:
+        typer.echo("  ".join(str(r[c]).ljust(w) for c, w in zip(columns, widths)))
+
 def main():
     app()
 
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+_HASH_CHUNK = 1024 * 1024
+
+
+@dataclass
+class _Entry:
+    signature: Tuple[Any, ...]  # (mtime_ns, size) on disk; store-defined for virtual paths
+    digest: str
+    value: Any
+
+
+def file_signature(path: Path) -> Tuple[Any, ...]:
+    # virtual paths (in-memory files, archives) know a cheaper/more reliable key than stat()
+    signature = getattr(path, "signature", None)
+    if callable(signature):
+        return signature()
+    st = path.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def file_digest(path: Path) -> str:
+    # virtual stores sign by content already (blob id, content hash); no need to read the bytes again
+    signature = getattr(path, "signature", None)
+    if callable(signature):
+        return repr(signature())
+    h = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class FileCache:
+    """
+    Per-file memo for parse results, used by long-lived processes (``datavalidator serve``).
+
+    An entry is reused when the file's (mtime, size) signature is unchanged. When the
+    signature moved but the content hash is identical (touch, checkout, copy), the entry
+    is reused as well and only the signature is refreshed.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path, kind: str, parse: Callable[[Path], Any]) -> Any:
+        key = (kind, str(path))
+        sig = file_signature(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == sig:
+                self.hits += 1
+                return entry.value
+
+        digest = file_digest(path)
+        if entry is not None and entry.digest == digest:
+            with self._lock:
+                entry.signature = sig
+                self.hits += 1
+            return entry.value
+
+        value = parse(path)
+        with self._lock:
+            self._entries[key] = _Entry(signature=sig, digest=digest, value=value)
+            self.misses += 1
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def cached_parse(
+    path: Path,
+    kind: str,
+    parse: Callable[[Path], Any],
+    cache: Optional[FileCache] = None,
+) -> Any:
+    """Run ``parse(path)``, going through ``cache`` when one is supplied."""
+    if cache is None:
+        return parse(path)
+    return cache.get(path, kind, parse)
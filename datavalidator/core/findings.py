@@ -12,4 +12,17 @@ class Finding:
     title: str
     message: str
     evidence: Dict[str, Any]
-    recommendation: str
\ No newline at end of file
+    recommendation: str
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Finding":
+        """Build from the dict shape written to findings.json (which uses "id" for the rule id)."""
+        return cls(
+            rule_id=d.get("id") or d.get("rule_id") or "",
+            category=d.get("category", "Model"),
+            severity=d.get("severity", "INFO"),
+            title=d.get("title", ""),
+            message=d.get("message", ""),
+            evidence=d.get("evidence") or {},
+            recommendation=d.get("recommendation", ""),
+        )
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+_MASK64 = (1 << 64) - 1
+_EMPTY = _MASK64  # bin without a shingle; filled by densification
+_ROLL = 0x100000001B3  # odd multiplier for the rolling token hash
+
+
+def hash64(text: str) -> int:
+    """Stable 64-bit hash (``hash()`` is salted per process, signatures must not be)."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def char_shingles(text: str, n: int = 3) -> FrozenSet[int]:
+    """Hashed character n-grams of ``text`` padded with ^/$, so short strings still get n-grams."""
+    padded = f"^{text}$"
+    if len(padded) <= n:
+        return frozenset((hash64(padded),))
+    return frozenset(hash64(padded[i:i + n]) for i in range(len(padded) - n + 1))
+
+
+@lru_cache(maxsize=1 << 16)
+def _token_hash(token: str) -> int:
+    return hash64(token) | 1
+
+
+def token_shingles(tokens: Sequence[str], n: int = 4) -> FrozenSet[int]:
+    """Hashed token n-grams (word shingles) for code-like text, by a rolling hash over token hashes."""
+    if len(tokens) <= n:
+        return frozenset((hash64("\x1f".join(tokens)),))
+    ids = [_token_hash(t) for t in tokens]
+    top = pow(_ROLL, n - 1, 1 << 64)
+    h = 0
+    for t in ids[:n]:
+        h = (h * _ROLL + t) & _MASK64
+    out = {h}
+    for i in range(n, len(ids)):
+        h = ((h - ids[i - n] * top) * _ROLL + ids[i]) & _MASK64
+        out.add(h)
+    return frozenset(out)
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a and not b:
+        return 1.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+
+class MinHasher:
+    """
+    MinHash signatures by one-permutation hashing: each (re-mixed) shingle hash falls into one
+    of ``num_perm`` bins by its high bits, and every bin keeps its minimum. Empty bins borrow the next
+    non-empty bin's value (rotation densification), so a signature costs O(|shingles| + num_perm)
+    instead of O(|shingles| * num_perm) and still estimates Jaccard similarity.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1) -> None:
+        self.num_perm = num_perm
+        self._seed = (seed * 0x9E3779B97F4A7C15) & _MASK64
+
+    def signature(self, shingles: Iterable[int]) -> Tuple[int, ...]:
+        k = self.num_perm
+        bins = [_EMPTY] * k
+        for h in shingles:
+            # splitmix64 finalizer: rolling/polynomial shingle hashes have weak low bits
+            h ^= self._seed
+            h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+            h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+            h ^= h >> 31
+            b = (h * k) >> 64
+            if h < bins[b]:
+                bins[b] = h
+        if _EMPTY in bins and len(set(bins)) > 1:
+            out = list(bins)
+            step = 1 << 64  # above every real bin value
+            nxt = -1
+            # walk backwards twice so each empty bin sees the next filled bin, wrapping around
+            for i in range(2 * k - 1, -1, -1):
+                j = i % k
+                if bins[j] != _EMPTY:
+                    nxt = j
+                elif i < k:
+                    out[j] = bins[nxt] + ((nxt - j) % k) * step
+            return tuple(out)
+        return tuple(bins)
+
+
+class LshIndex:
+    """
+    Banded locality-sensitive hashing over MinHash signatures: ``bands`` slices of ``rows``
+    values each. Two keys become candidates when any slice matches, which is likely above a
+    Jaccard of about ``(1 / bands) ** (1 / rows)``. Buckets larger than ``max_bucket`` are
+    ignored when pairing (they hold shingles everything shares) and counted in ``skipped_buckets``.
+    """
+
+    def __init__(self, bands: int = 16, rows: int = 4, max_bucket: int = 500) -> None:
+        self.bands = bands
+        self.rows = rows
+        self.max_bucket = max_bucket
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [{} for _ in range(bands)]
+        self.size = 0
+        self.skipped_buckets = 0
+
+    def add(self, key: Hashable, signature: Sequence[int]) -> None:
+        r = self.rows
+        for b, table in enumerate(self._buckets):
+            table.setdefault(tuple(signature[b * r:(b + 1) * r]), []).append(key)
+        self.size += 1
+
+    def query(self, signature: Sequence[int]) -> Set[Hashable]:
+        r = self.rows
+        out: Set[Hashable] = set()
+        for b, table in enumerate(self._buckets):
+            out.update(table.get(tuple(signature[b * r:(b + 1) * r]), ()))
+        return out
+
+    def candidate_pairs(self) -> Set[Tuple[Hashable, Hashable]]:
+        pairs: Set[Tuple[Hashable, Hashable]] = set()
+        self.skipped_buckets = 0
+        for table in self._buckets:
+            for members in table.values():
+                if len(members) < 2:
+                    continue
+                if len(members) > self.max_bucket:
+                    self.skipped_buckets += 1
+                    continue
+                for i, a in enumerate(members):
+                    for b in members[i + 1:]:
+                        if a != b:
+                            pairs.add((a, b) if a < b else (b, a))
+        return pairs
+
+
+def similar_groups(
+    shingles: Dict[Hashable, FrozenSet[int]],
+    threshold: float,
+    num_perm: int = 64,
+    bands: int = 16,
+    max_bucket: int = 500,
+    accept: Optional[Callable[[Hashable, Hashable], bool]] = None,
+) -> Tuple[List[List[Hashable]], Dict[str, int]]:
+    """
+    Cluster keys (strings or tuples) whose shingle sets have Jaccard >= ``threshold``. LSH
+    proposes candidate pairs, each candidate is verified on the exact sets (and ``accept``, when
+    given), and verified pairs are merged with union-find. Returns (groups of 2+ keys; stats).
+    """
+    hasher = MinHasher(num_perm)
+    index = LshIndex(bands=bands, rows=max(1, num_perm // bands), max_bucket=max_bucket)
+    for key, sh in shingles.items():
+        index.add(key, hasher.signature(sh))
+    candidates = index.candidate_pairs()
+
+    parent: Dict[Hashable, Hashable] = {}
+
+    def find(x: Hashable) -> Hashable:
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    verified = 0
+    for a, b in candidates:
+        if a in parent and b in parent and find(a) == find(b):
+            continue  # already linked through other members
+        sa, sb = shingles[a], shingles[b]
+        # Jaccard cannot exceed the size ratio; most LSH false positives fail this for free
+        if min(len(sa), len(sb)) < threshold * max(len(sa), len(sb)) or jaccard(sa, sb) < threshold:
+            continue
+        if accept is not None and not accept(a, b):
+            continue
+        verified += 1
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[rb] = ra
+
+    groups: Dict[Hashable, List[Hashable]] = {}
+    for key in parent:
+        groups.setdefault(find(key), []).append(key)
+    out = [sorted(g) for g in groups.values() if len(g) > 1]
+    out.sort(key=lambda g: (-len(g), g[0]))
+    return out, {
+        "items": len(shingles),
+        "candidatePairs": len(candidates),
+        "verifiedPairs": verified,
+        "skippedBuckets": index.skipped_buckets,
+    }
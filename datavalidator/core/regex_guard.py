@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Set
+
+# Python's re cannot be interrupted mid-match, so the guard is layered:
+#   1. a deterministic input cap: text longer than max_input is never handed to the pattern;
+#   2. per-pattern / per-file wall-clock budgets: once a pattern overruns on a file it is
+#      skipped for the rest of that file, and once the file overruns every guarded pattern
+#      is skipped. Skips are recorded so they surface as SCAN_TIMEOUT findings.
+MAX_INPUT_CHARS = 1_000_000
+PER_FILE_MS = 2000.0
+PER_PATTERN_MS = 250.0
+
+
+@dataclass
+class TimeoutEvent:
+    file: str
+    pattern: str
+    reason: str  # "inputTooLarge" | "patternBudget" | "fileBudget"
+    inputChars: int
+    elapsedMs: float
+
+
+class ScanBudget:
+    """Time spent by guarded patterns on one file, and what got skipped because of it."""
+
+    def __init__(self, label: str, per_file_ms: float = PER_FILE_MS, per_pattern_ms: float = PER_PATTERN_MS) -> None:
+        self.label = label
+        self.per_file_ms = per_file_ms
+        self.per_pattern_ms = per_pattern_ms
+        self.spent_ms = 0.0
+        self.exhausted = False
+        self.disabled: Set[str] = set()
+        self.events: List[TimeoutEvent] = []
+
+    def record(self, name: str, reason: str, input_chars: int, elapsed_ms: float = 0.0) -> None:
+        self.events.append(
+            TimeoutEvent(file=self.label, pattern=name, reason=reason, inputChars=input_chars, elapsedMs=round(elapsed_ms, 2))
+        )
+
+    def allows(self, name: str) -> bool:
+        return not self.exhausted and name not in self.disabled
+
+    def charge(self, name: str, elapsed_ms: float, input_chars: int) -> None:
+        self.spent_ms += elapsed_ms
+        if elapsed_ms > self.per_pattern_ms and name not in self.disabled:
+            self.disabled.add(name)
+            self.record(name, "patternBudget", input_chars, elapsed_ms)
+        if self.spent_ms > self.per_file_ms and not self.exhausted:
+            self.exhausted = True
+            self.record(name, "fileBudget", input_chars, self.spent_ms)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [asdict(e) for e in self.events]
+
+
+_CURRENT: ContextVar[Optional[ScanBudget]] = ContextVar("regex_scan_budget", default=None)
+
+
+@contextmanager
+def scan_budget(label: str, per_file_ms: float = PER_FILE_MS, per_pattern_ms: float = PER_PATTERN_MS) -> Iterator[ScanBudget]:
+    """Run guarded patterns inside ``with scan_budget(path) as b:``; ``b.events`` lists what was skipped."""
+    budget = ScanBudget(label, per_file_ms=per_file_ms, per_pattern_ms=per_pattern_ms)
+    token = _CURRENT.set(budget)
+    try:
+        yield budget
+    finally:
+        _CURRENT.reset(token)
+
+
+class GuardedPattern:
+    """
+    Drop-in for the compiled-pattern calls the heuristics use (search/findall/finditer).
+    Outside a scan_budget only the input cap applies; a skipped call returns no match.
+    """
+
+    def __init__(self, compiled: Pattern[str], name: Optional[str] = None, max_input: int = MAX_INPUT_CHARS) -> None:
+        self.compiled = compiled
+        self.name = name or compiled.pattern[:60]
+        self.max_input = max_input
+
+    @property
+    def pattern(self) -> str:
+        return self.compiled.pattern
+
+    def _run(self, text: str, call: Any, empty: Any) -> Any:
+        budget = _CURRENT.get()
+        if len(text) > self.max_input:
+            if budget is not None:
+                budget.record(self.name, "inputTooLarge", len(text))
+            return empty
+        if budget is None:
+            return call(text)
+        if not budget.allows(self.name):
+            return empty
+        t0 = time.perf_counter()
+        result = call(text)
+        budget.charge(self.name, (time.perf_counter() - t0) * 1000, len(text))
+        return result
+
+    def search(self, text: str) -> Any:
+        return self._run(text, self.compiled.search, None)
+
+    def findall(self, text: str) -> List[Any]:
+        return self._run(text, self.compiled.findall, [])
+
+    def finditer(self, text: str) -> List[Any]:
+        # materialized so the whole scan is inside the timed region
+        return self._run(text, lambda t: list(self.compiled.finditer(t)), [])
+
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import IO, Any, Dict, Tuple
+
+from datavalidator.extract.vfs import VirtualPath, VirtualStore, find_project_root, normalize_key
+
+
+_ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+# Members the extractors actually parse; everything else (images, custom visual packages) is only sized
+_PARSED_SUFFIXES = (".tmdl", ".json", ".pbir", ".pbism", ".pbip")
+
+
+def is_archive(path: Any) -> bool:
+    return isinstance(path, Path) and path.is_file() and path.name.lower().endswith(_ARCHIVE_SUFFIXES)
+
+
+class ZipStore(VirtualStore):
+    """
+    A PBIP export inside a zip. The central directory is the file index, so listing and
+    globbing never decompress anything; members are inflated only when read.
+    """
+
+    def __init__(self, archive: Path) -> None:
+        self.archive = Path(archive)
+        self.label = self.archive.name
+        self._zf = zipfile.ZipFile(self.archive)
+        self._infos: Dict[str, zipfile.ZipInfo] = {
+            normalize_key(info.filename): info for info in self._zf.infolist() if not info.is_dir()
+        }
+        super().__init__(self._infos.keys())
+
+    def _info(self, key: str) -> zipfile.ZipInfo:
+        try:
+            return self._infos[key]
+        except KeyError:
+            raise FileNotFoundError(self.display(key)) from None
+
+    def read_bytes(self, key: str) -> bytes:
+        return self._zf.read(self._info(key))
+
+    def open(self, key: str) -> IO[bytes]:
+        return self._zf.open(self._info(key))
+
+    def size(self, key: str) -> int:
+        return self._info(key).file_size
+
+    def signature(self, key: str) -> Tuple[Any, ...]:
+        info = self._info(key)
+        return ("zip", info.CRC, info.file_size)
+
+    def close(self) -> None:
+        self._zf.close()
+
+
+class TarStore(VirtualStore):
+    """
+    A PBIP export inside a tar (optionally compressed). Tar has no central directory, so the
+    index is built in one sequential pass; parsed member types are buffered during that pass
+    (compressed streams cannot seek cheaply), other members are recorded by size only.
+    """
+
+    def __init__(self, archive: Path) -> None:
+        self.archive = Path(archive)
+        self.label = self.archive.name
+        self._tf = tarfile.open(self.archive, mode="r:*")
+        self._members: Dict[str, tarfile.TarInfo] = {}
+        self._buffered: Dict[str, bytes] = {}
+        for member in self._tf:
+            if not member.isfile():
+                continue
+            key = normalize_key(member.name)
+            self._members[key] = member
+            if key.lower().endswith(_PARSED_SUFFIXES):
+                fh = self._tf.extractfile(member)
+                self._buffered[key] = fh.read() if fh else b""
+        super().__init__(self._members.keys())
+
+    def read_bytes(self, key: str) -> bytes:
+        data = self._buffered.get(key)
+        if data is not None:
+            return data
+        try:
+            member = self._members[key]
+        except KeyError:
+            raise FileNotFoundError(self.display(key)) from None
+        fh = self._tf.extractfile(member)
+        return fh.read() if fh else b""
+
+    def size(self, key: str) -> int:
+        return self._members[key].size
+
+    def signature(self, key: str) -> Tuple[Any, ...]:
+        m = self._members[key]
+        return ("tar", m.size, m.mtime, m.chksum)
+
+    def close(self) -> None:
+        self._tf.close()
+
+
+def open_archive(archive: Path) -> VirtualStore:
+    if archive.name.lower().endswith(".zip"):
+        return ZipStore(archive)
+    return TarStore(archive)
+
+
+def archive_root(archive: Path) -> VirtualPath:
+    return find_project_root(open_archive(archive).root())
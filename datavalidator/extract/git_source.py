@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from datavalidator.extract.vfs import VirtualPath, VirtualStore, find_project_root, normalize_key
+
+
+class GitCatFile:
+    """
+    One long-lived ``git cat-file --batch`` process; blobs are requested by object id
+    over stdin instead of spawning git (or checking out) per file.
+    """
+
+    def __init__(self, repo: Path) -> None:
+        self.repo = Path(repo)
+        self._proc = subprocess.Popen(
+            ["git", "-C", str(self.repo), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._lock = threading.Lock()
+        self.reads = 0
+
+    def read(self, oid: str) -> bytes:
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+        with self._lock:
+            self._proc.stdin.write(oid.encode("ascii") + b"\n")
+            self._proc.stdin.flush()
+            header = self._proc.stdout.readline().decode("ascii", errors="replace").split()
+            if len(header) < 3 or header[1] == "missing":
+                raise FileNotFoundError(f"git object not found: {oid}")
+            size = int(header[2])
+            data = self._proc.stdout.read(size)
+            self._proc.stdout.read(1)  # trailing LF
+            self.reads += 1
+            return data
+
+    def close(self) -> None:
+        if self._proc.poll() is None:
+            assert self._proc.stdin is not None
+            self._proc.stdin.close()
+            self._proc.wait(timeout=10)
+
+    def __enter__(self) -> "GitCatFile":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _git(repo: Path, *args: str) -> str:
+    res = subprocess.run(["git", "-C", str(repo), *args], capture_output=True, check=True)
+    return res.stdout.decode("utf-8", errors="replace")
+
+
+class GitTreeStore(VirtualStore):
+    """
+    Files of one revision, indexed from ``git ls-tree`` and read through a shared GitCatFile.
+    The blob id is the change signature, so a FileCache shared across revisions only
+    re-parses blobs that actually changed.
+    """
+
+    def __init__(self, reader: GitCatFile, rev: str, subdir: str = "", label: str = "git") -> None:
+        self.reader = reader
+        self.rev = rev
+        self.label = label
+        prefix = normalize_key(subdir)
+        args = ["ls-tree", "-r", "-z", "--full-tree", "-l", rev]
+        if prefix:
+            args += ["--", prefix]
+        self._blobs: Dict[str, Tuple[str, int]] = {}
+        for rec in _git(reader.repo, *args).split("\0"):
+            if not rec:
+                continue
+            meta, _, path = rec.partition("\t")
+            _mode, otype, oid, size = meta.split()
+            if otype != "blob":
+                continue
+            key = path[len(prefix):].lstrip("/") if prefix else path
+            self._blobs[normalize_key(key)] = (oid, int(size) if size.isdigit() else 0)
+        super().__init__(self._blobs.keys())
+
+    def read_bytes(self, key: str) -> bytes:
+        try:
+            oid, _size = self._blobs[key]
+        except KeyError:
+            raise FileNotFoundError(self.display(key)) from None
+        return self.reader.read(oid)
+
+    def size(self, key: str) -> int:
+        return self._blobs[key][1]
+
+    def signature(self, key: str) -> Tuple[Any, ...]:
+        return ("git", self._blobs[key][0])
+
+
+def git_root(reader: GitCatFile, rev: str, subdir: str = "", label: str = "git") -> VirtualPath:
+    return find_project_root(GitTreeStore(reader, rev, subdir=subdir, label=label).root())
+
+
+def list_revisions(repo: Path, rev: str = "HEAD", max_count: int = 200, subdir: str = "") -> List[Dict[str, str]]:
+    """Commits (oldest first) that touched ``subdir``, as {"commit", "date", "subject"}."""
+    args = ["log", f"--max-count={max_count}", "--format=%H%x1f%cI%x1f%s", rev]
+    if subdir:
+        args += ["--", normalize_key(subdir)]
+    revs = []
+    for line in _git(Path(repo), *args).splitlines():
+        parts = line.split("\x1f")
+        if len(parts) == 3:
+            revs.append({"commit": parts[0], "date": parts[1], "subject": parts[2]})
+    revs.reverse()
+    return revs
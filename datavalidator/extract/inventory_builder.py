@@ -3,6 +3,8 @@ from pathlib import Path
 import json, re
 from typing import Any, Dict, List, Tuple
 
+from datavalidator.extract.pbip_loader import load_pbip
+
 # ------------------------
 # small helpers
 # ------------------------
@@ -216,14 +218,17 @@ def build_expressions_inventory(expr_path: Path) -> Dict[str, Any]:
 # main builder
 # ------------------------
 def build_inventory(pbip_root: Path) -> Dict[str, Any]:
-    # pbip root contains folders like *.Report and *.SemanticModel
-    report_dir = next(pbip_root.glob("*.Report"), None)
-    model_dir = next(pbip_root.glob("*.SemanticModel"), None)
+    # pbip root contains folders like *.Report and *.SemanticModel; describe the primary report
+    # and the model it is bound to (definition.pbir), and list every artifact found
+    ctx = load_pbip(pbip_root)
+    report_dir, model_dir = ctx.report_dir, ctx.model_dir
 
     out: Dict[str, Any] = {
         "root": str(pbip_root),
         "hasReport": bool(report_dir),
         "hasSemanticModel": bool(model_dir),
+        "reports": [str(r) for r in ctx.reports],
+        "semanticModels": [str(m) for m in ctx.models],
         "report": {},
         "model": {},
         "powerQuery": {},
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+
+def _skip_string(text: str, i: int) -> int:
+    """Index after the M string literal starting at text[i] == '"' (``""`` escapes a quote)."""
+    j = i + 1
+    while True:
+        k = text.find('"', j)
+        if k < 0:
+            return len(text)
+        if text.startswith('""', k):
+            j = k + 2
+            continue
+        return k + 1
+
+
+def _skip_comment(text: str, i: int) -> int:
+    if text.startswith("//", i):
+        k = text.find("\n", i)
+        return len(text) if k < 0 else k
+    k = text.find("*/", i + 2)
+    return len(text) if k < 0 else k + 2
+
+
+def _is_word_at(text: str, i: int, word: str) -> bool:
+    end = i + len(word)
+    if text[i:end] != word:
+        return False
+    before = text[i - 1] if i > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not (before.isalnum() or before in "_.#") and not (after.isalnum() or after in "_.")
+
+
+def let_steps(m_text: str) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    """
+    Steps of the outermost ``let ... in`` expression as ``(name, expression)`` pairs, plus the
+    ``in`` result. Nested let/records/lists/strings/comments are skipped by a single linear scan;
+    text that is not a let expression returns ``([], m_text)``.
+    """
+    text = m_text or ""
+    n = len(text)
+    i = 0
+    # find the outer "let"
+    while i < n and text[i].isspace():
+        i += 1
+    if not _is_word_at(text, i, "let"):
+        return [], text.strip() or None
+    i += 3
+    steps: List[Tuple[str, str]] = []
+    start = i
+    depth = 0
+    nested_lets = 0
+    while i < n:
+        ch = text[i]
+        if ch == '"':
+            i = _skip_string(text, i)
+            continue
+        if text.startswith("//", i) or text.startswith("/*", i):
+            i = _skip_comment(text, i)
+            continue
+        if ch == "#" and text.startswith('#"', i):
+            i = _skip_string(text, i + 1)
+            continue
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif depth == 0 and ch == "," and nested_lets == 0:
+            steps.append(_split_step(text[start:i]))
+            start = i + 1
+        elif depth == 0 and _is_word_at(text, i, "let"):
+            nested_lets += 1
+        elif depth == 0 and _is_word_at(text, i, "in"):
+            if nested_lets == 0:
+                steps.append(_split_step(text[start:i]))
+                return [s for s in steps if s[0]], text[i + 2:].strip() or None
+            nested_lets -= 1
+        i += 1
+    steps.append(_split_step(text[start:]))
+    return [s for s in steps if s[0]], None
+
+
+def _split_step(chunk: str) -> Tuple[str, str]:
+    chunk = chunk.strip()
+    while chunk.startswith("//") or chunk.startswith("/*"):
+        chunk = chunk[_skip_comment(chunk, 0):].strip()
+    if chunk.startswith('#"'):
+        end = _skip_string(chunk, 1)
+        name, rest = chunk[2:end - 1].replace('""', '"'), chunk[end:]
+    else:
+        name, sep, rest = chunk.partition("=")
+        rest = sep + rest
+    rest = rest.strip()
+    if not rest.startswith("="):
+        return "", chunk
+    return name.strip(), rest[1:].strip()
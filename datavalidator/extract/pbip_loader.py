@@ -1,13 +1,80 @@
-from dataclasses import dataclass
+import json
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional
+
+# Folders that never hold PBIP artifacts; artifact folders themselves are not descended into
+_SKIP_DIRS = {".git", ".pbi", ".vs", ".vscode", "node_modules", "output", "__pycache__"}
+_MAX_DEPTH = 3
+
 
 @dataclass
 class PbipContext:
     project_root: Path          # folder that contains .Report and .SemanticModel
     pbip_file: Path | None      # the .pbip file (manifest)
-    report_dir: Path | None
-    model_dir: Path | None
+    report_dir: Path | None     # primary report (first in path order)
+    model_dir: Path | None      # model bound to the primary report, else the first model
     project_name: str
+    reports: List[Path] = field(default_factory=list)   # every *.Report folder
+    models: List[Path] = field(default_factory=list)    # every *.SemanticModel folder
+    bindings: Dict[str, Optional[str]] = field(default_factory=dict)  # str(report) -> str(model) or None
+    connections: Dict[str, str] = field(default_factory=dict)        # str(report) -> remote model connection
+
+    @property
+    def is_multi_artifact(self) -> bool:
+        return len(self.reports) > 1 or len(self.models) > 1
+
+    def model_for(self, report_dir: Path) -> Optional[Path]:
+        target = self.bindings.get(str(report_dir))
+        return next((m for m in self.models if str(m) == target), None) if target else None
+
+
+def _discover(project_root: Path) -> tuple[List[Path], List[Path]]:
+    reports: List[Path] = []
+    models: List[Path] = []
+
+    def walk(folder: Path, depth: int) -> None:
+        for child in sorted(folder.iterdir(), key=lambda p: p.name.lower()):
+            if not child.is_dir():
+                continue
+            if child.name.endswith(".Report"):
+                reports.append(child)
+            elif child.name.endswith(".SemanticModel"):
+                models.append(child)
+            elif depth < _MAX_DEPTH and child.name not in _SKIP_DIRS and not child.name.startswith("."):
+                walk(child, depth + 1)
+
+    walk(project_root, 1)
+    return reports, models
+
+
+def _relative(base: Path, rel: str) -> Path:
+    # no resolve(): virtual paths (archives, git trees) have no filesystem behind them
+    out = base
+    for part in rel.replace("\\", "/").split("/"):
+        if part in ("", "."):
+            continue
+        out = out.parent if part == ".." else out / part
+    return out
+
+
+def _binding(report_dir: Path) -> tuple[Optional[str], Optional[str]]:
+    """(local model path, remote connection) from the report's definition.pbir; ``byPath`` is relative to the .Report folder."""
+    pbir = report_dir / "definition.pbir"
+    if not pbir.exists():
+        return None, None
+    try:
+        ref = json.loads(pbir.read_text(encoding="utf-8-sig", errors="ignore")).get("datasetReference") or {}
+    except (ValueError, AttributeError):
+        return None, None
+    by_path = ref.get("byPath") or {}
+    if by_path.get("path"):
+        return str(_relative(report_dir, str(by_path["path"]))), None
+    by_connection = ref.get("byConnection") or {}
+    if by_connection:
+        return None, str(by_connection.get("connectionString") or by_connection.get("pbiModelDatabaseName") or "remote")
+    return None, None
+
 
 def load_pbip(project_path: Path) -> PbipContext:
     """
@@ -15,6 +82,8 @@ def load_pbip(project_path: Path) -> PbipContext:
       - the PBIP project folder (recommended), e.g. D:\vc_test
       - the .pbip file path, e.g. D:\vc_test\vc_test.pbip
     Returns a context whose project_root is ALWAYS a directory.
+    Every .Report / .SemanticModel folder under the root is discovered and each report is bound
+    to its model through definition.pbir.
     """
     p = project_path
 
@@ -27,27 +96,36 @@ def load_pbip(project_path: Path) -> PbipContext:
     # If user passed a folder, find the .pbip file inside it (optional)
     elif p.is_dir():
         project_root = p
-        pbip_candidates = list(project_root.glob("*.pbip"))
+        pbip_candidates = sorted(project_root.glob("*.pbip"), key=lambda c: c.name.lower())
         pbip_file = pbip_candidates[0] if pbip_candidates else None
         project_name = pbip_file.stem if pbip_file else project_root.name
 
     else:
         raise FileNotFoundError(f"PBIP path not found: {p}")
 
-    report_dir = None
-    model_dir = None
-
-    # Look for artifact folders in the project root
-    for child in project_root.iterdir():
-        if child.is_dir() and child.name.endswith(".Report"):
-            report_dir = child
-        if child.is_dir() and child.name.endswith(".SemanticModel"):
-            model_dir = child
+    reports, models = _discover(project_root)
+    model_paths = {str(m) for m in models}
+    bindings: Dict[str, Optional[str]] = {}
+    connections: Dict[str, str] = {}
+    for r in reports:
+        local, remote = _binding(r)
+        bindings[str(r)] = local if local in model_paths else None
+        if remote:
+            connections[str(r)] = remote
+        elif bindings[str(r)] is None and len(models) == 1:
+            # no definition.pbir (older exports) or a path that points elsewhere: the only model
+            bindings[str(r)] = str(models[0])
 
-    return PbipContext(
+    ctx = PbipContext(
         project_root=project_root,
         pbip_file=pbip_file,
-        report_dir=report_dir,
-        model_dir=model_dir,
+        report_dir=reports[0] if reports else None,
+        model_dir=None,
         project_name=project_name,
-    )
\ No newline at end of file
+        reports=reports,
+        models=models,
+        bindings=bindings,
+        connections=connections,
+    )
+    ctx.model_dir = (ctx.model_for(reports[0]) if reports else None) or (models[0] if models else None)
+    return ctx
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import bisect
 import re
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from datavalidator.core.cache import FileCache, cached_parse
+from datavalidator.core.regex_guard import GuardedPattern, scan_budget
+from datavalidator.extract.tmdl_reader import read_tmdl
+from datavalidator.extract.vfs import as_path
 
 
 @dataclass
@@ -23,72 +29,51 @@ class PowerQueryExtraction:
     count: int
     source_type: str  # "table_source_scan"
     queries: List[Dict[str, Any]]
+    scanTimeouts: List[Dict[str, Any]] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
-        return {"count": self.count, "source_type": self.source_type, "queries": self.queries}
+        return {"count": self.count, "source_type": self.source_type, "queries": self.queries, "scanTimeouts": self.scanTimeouts}
 
 
 # Heuristics: what "looks like" M vs not
-_RE_M_HINTS = re.compile(
+_RE_M_HINTS = GuardedPattern(re.compile(
     r"\b(let|in)\b|"
     r"\b(Sql\.Database|Odbc\.DataSource|OleDb\.DataSource|Snowflake\.Databases|Databricks\.Catalogs|SapHana\.Database|GoogleBigQuery\.Database)\b|"
     r"\b(Table\.(SelectRows|RemoveColumns|RenameColumns|TransformColumns|Group|Join|NestedJoin|AddColumn|ExpandTableColumn|Buffer)\b)",
     re.IGNORECASE | re.MULTILINE,
-)
+), "pq_extractor.M_HINTS")
+
+_RE_NATIVE_QUERY = GuardedPattern(re.compile(r"\bValue\.NativeQuery\s*\(", re.IGNORECASE), "pq_extractor.NATIVE_QUERY")
+_RE_DAXISH = GuardedPattern(re.compile(r"\bNAMEOF\s*\(|\{\s*\(\"", re.IGNORECASE), "pq_extractor.DAXISH")  # tuples / NAMEOF often show up in calc tables
+_RE_SQL_TEXT = GuardedPattern(re.compile(r"\b(SELECT|WITH|FROM|JOIN|GROUP\s+BY|WHERE)\b", re.IGNORECASE), "pq_extractor.SQL_TEXT")
 
-_RE_NATIVE_QUERY = re.compile(r"\bValue\.NativeQuery\s*\(", re.IGNORECASE)
-_RE_DAXISH = re.compile(r"\bNAMEOF\s*\(|\{\s*\(\"", re.IGNORECASE)  # tuples / NAMEOF often show up in calc tables
-_RE_SQL_TEXT = re.compile(r"\b(SELECT|WITH|FROM|JOIN|GROUP\s+BY|WHERE)\b", re.IGNORECASE)
+# Source-block scanning (see _extract_source_blocks); each pattern below is linear on its own
+_RE_SOURCE_START = re.compile(r"(?m)^[ \t]*Source\s*=\s*")
+_RE_WS_RUN = re.compile(r"\s+")
+_RE_NAME_RUN = re.compile(r"[A-Za-z0-9_\s\[\]\-]+")
+_RE_MEASURE_END = re.compile(r"'measure\s")
+_NAME_START = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_")
 
 
-def extract_powerquery(ctx_or_root: Any) -> PowerQueryExtraction:
+def extract_powerquery(ctx_or_root: Any, cache: Optional[FileCache] = None) -> PowerQueryExtraction:
     """
     Extract PQ-ish snippets from PBIP by scanning SemanticModel table .tmdl files
     for 'Source =' blocks. This is heuristic but works well for PBIP exports.
     """
-    root = _resolve_root(ctx_or_root)
-    tmdl_tables_dir = _find_tables_dir(root)
+    if getattr(ctx_or_root, "model_dir", None):
+        tmdl_tables_dir: Optional[Path] = as_path(ctx_or_root.model_dir) / "definition" / "tables"
+    else:
+        tmdl_tables_dir = _find_tables_dir(_resolve_root(ctx_or_root))
     items: List[PQItem] = []
+    timeouts: List[Dict[str, Any]] = []
 
     if not tmdl_tables_dir or not tmdl_tables_dir.exists():
         return PowerQueryExtraction(count=0, source_type="table_source_scan", queries=[])
 
     for tmdl in sorted(tmdl_tables_dir.glob("*.tmdl")):
-        table_name = tmdl.stem
-        text = tmdl.read_text(encoding="utf-8", errors="ignore")
-
-        # Collect candidate "Source =" blocks (Power BI often stores source expressions inside table definitions)
-        for block in _extract_source_blocks(text):
-            snippet = block.strip()
-            is_native = bool(_RE_NATIVE_QUERY.search(snippet))
-            contains_sql = bool(_RE_SQL_TEXT.search(snippet)) or ("#(lf)" in snippet and "SELECT" in snippet.upper())
-
-            # Classify
-            if _RE_DAXISH.search(snippet) and not _RE_M_HINTS.search(snippet):
-                source_type = "daxOrOther"
-                confidence = 0.85
-                m_snip = None
-            elif _RE_M_HINTS.search(snippet) or is_native:
-                source_type = "nativeQuery" if is_native else "m"
-                confidence = 0.90 if is_native else 0.80
-                m_snip = snippet
-            else:
-                source_type = "unknown"
-                confidence = 0.30
-                m_snip = None
-
-            items.append(
-                PQItem(
-                    table=table_name,
-                    path=str(tmdl),
-                    kind="SourceBlock",
-                    sourceType=source_type,
-                    isNativeQuery=is_native,
-                    containsSQL=contains_sql,
-                    mSnippet=m_snip,
-                    confidence=confidence,
-                )
-            )
+        table_items, table_timeouts = cached_parse(tmdl, "pq.items", _extract_table_items, cache)
+        items.extend(table_items)
+        timeouts.extend(table_timeouts)
 
     # Keep only the PQ-relevant ones for downstream PQ rules, but still expose all in inventory if you want later.
     pq_relevant = [it for it in items if it.sourceType in ("m", "nativeQuery") and it.mSnippet]
@@ -97,16 +82,62 @@ def extract_powerquery(ctx_or_root: Any) -> PowerQueryExtraction:
         count=len(pq_relevant),
         source_type="table_source_scan",
         queries=[asdict(it) for it in pq_relevant],
+        scanTimeouts=timeouts,
     )
 
 
+def _extract_table_items(tmdl: Path) -> Tuple[List[PQItem], List[Dict[str, Any]]]:
+    with scan_budget(str(tmdl)) as budget:
+        items = _classify_source_blocks(tmdl, read_tmdl(tmdl).text)
+    return items, budget.to_list()
+
+
+def _classify_source_blocks(tmdl: Path, text: str) -> List[PQItem]:
+    table_name = tmdl.stem
+    items: List[PQItem] = []
+
+    # Collect candidate "Source =" blocks (Power BI often stores source expressions inside table definitions)
+    for block in _extract_source_blocks(text):
+        snippet = block.strip()
+        is_native = bool(_RE_NATIVE_QUERY.search(snippet))
+        contains_sql = bool(_RE_SQL_TEXT.search(snippet)) or ("#(lf)" in snippet and "SELECT" in snippet.upper())
+
+        # Classify
+        if _RE_DAXISH.search(snippet) and not _RE_M_HINTS.search(snippet):
+            source_type = "daxOrOther"
+            confidence = 0.85
+            m_snip = None
+        elif _RE_M_HINTS.search(snippet) or is_native:
+            source_type = "nativeQuery" if is_native else "m"
+            confidence = 0.90 if is_native else 0.80
+            m_snip = snippet
+        else:
+            source_type = "unknown"
+            confidence = 0.30
+            m_snip = None
+
+        items.append(
+            PQItem(
+                table=table_name,
+                path=str(tmdl),
+                kind="SourceBlock",
+                sourceType=source_type,
+                isNativeQuery=is_native,
+                containsSQL=contains_sql,
+                mSnippet=m_snip,
+                confidence=confidence,
+            )
+        )
+    return items
+
+
 def _resolve_root(ctx_or_root: Any) -> Path:
-    if isinstance(ctx_or_root, (str, Path)):
-        return Path(ctx_or_root)
+    if isinstance(ctx_or_root, (str, Path)) or hasattr(ctx_or_root, "iterdir"):
+        return as_path(ctx_or_root)
     # Try common ctx shapes
     for attr in ("root", "project_root", "projectPath", "path"):
         if hasattr(ctx_or_root, attr):
-            return Path(getattr(ctx_or_root, attr))
+            return as_path(getattr(ctx_or_root, attr))
     raise ValueError("extract_powerquery: cannot determine PBIP root from ctx")
 
 
@@ -128,15 +159,64 @@ def _find_tables_dir(root: Path) -> Optional[Path]:
     return tables_dir if tables_dir.exists() else None
 
 
+def _block_ends(text: str) -> List[int]:
+    # Every position where a block may stop: the newline(s) before "<name> =" or "partition ",
+    # plus each "'measure " marker. Computed once per file from linear runs of whitespace and
+    # name characters, so no position is ever rescanned.
+    name_runs = [(m.start(), m.end()) for m in _RE_NAME_RUN.finditer(text)]
+    run_starts = [a for a, _ in name_runs]
+    n = len(text)
+    ends: List[int] = []
+    for ws in _RE_WS_RUN.finditer(text):
+        bs, be = ws.span()
+        first_nl = text.find("\n", bs, be)
+        if first_nl < 0 or be >= n:
+            continue
+        if text.startswith("partition", be) and be + 9 < n and text[be + 9].isspace():
+            ok = True
+        elif text[be] in _NAME_START:
+            run_end = name_runs[bisect.bisect_right(run_starts, be) - 1][1]
+            ok = run_end < n and text[run_end] == "="
+        else:
+            ok = False
+        if ok:
+            p = first_nl
+            while p >= 0:
+                ends.append(p)
+                p = text.find("\n", p + 1, be)
+    ends.extend(m.start() for m in _RE_MEASURE_END.finditer(text))
+    ends.sort()
+    return ends
+
+
 def _extract_source_blocks(tmdl_text: str) -> List[str]:
     """
-    Extract blocks that start with 'Source =' until a likely end.
+    Extract blocks that start with 'Source =' until a likely end: the next line that looks
+    like a new property ("<name> ="), a partition, a 'measure marker, or end of file.
     PBIP/TMDL formatting varies, so we keep this heuristic and safe.
+
+    This used to be one lazy regex whose end-lookahead was re-tried at every character of
+    every block, which went cubic on long whitespace/name runs. Block ends are now collected
+    in one pass and looked up by bisection, giving the same blocks in linear time.
     """
     blocks: List[str] = []
-    # A loose pattern: capture from "Source =" to the next "\n      " that looks like a new property OR end of file
-    # This will also catch Table.FromRows(...) blocks etc.
-    pattern = re.compile(r"(?ms)^\s*Source\s*=\s*(.+?)(?=\n\s*[A-Za-z_][A-Za-z0-9_\s\[\]\-]*\s*=|\n\s*partition\s|'measure\s|\Z)")
-    for m in pattern.finditer(tmdl_text):
-        blocks.append(m.group(1))
-    return blocks
\ No newline at end of file
+    ends: Optional[List[int]] = None
+    n = len(tmdl_text)
+    prev_end = 0
+    for m in _RE_SOURCE_START.finditer(tmdl_text):
+        if m.start() < prev_end:
+            continue
+        g = m.end()
+        if g >= n:
+            # only whitespace left after "=": the block is its last character, as the regex gave
+            if tmdl_text[g - 1].isspace():
+                blocks.append(tmdl_text[-1:])
+                prev_end = n
+            continue
+        if ends is None:
+            ends = _block_ends(tmdl_text)
+        i = bisect.bisect_left(ends, g + 1)
+        end = ends[i] if i < len(ends) else n
+        blocks.append(tmdl_text[g:end])
+        prev_end = end
+    return blocks
@@ -1,23 +1,193 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Optional
+import hashlib
 import json
+from datavalidator.core.cache import FileCache, cached_parse
 from datavalidator.extract.pbip_loader import PbipContext
 
+@dataclass
+class ReportVisual:
+    visual_id: str
+    visual_type: str
+    fields: list[str]  # "Entity.Property" from projections, sort and visual-level filters
+    projection_count: int = 0  # projected fields across all query roles (Values, Rows, Columns...)
+    filter_count: int = 0  # visual-level filters
+    filter_literals: int = 0  # literal values inside those filters (e.g. long In-lists)
+    config_hash: str = ""  # normalized query + filter definition; "" for visuals that do not query
+    field_hash: str = ""  # visual type + field set only, to group near-identical visuals
+    resources: list[str] = field(default_factory=list)  # registered resource items (images) referenced
+
 @dataclass
 class ReportPage:
     page_id: str
     display_name: str
     visual_count: int
+    visuals: list[ReportVisual] = field(default_factory=list)
+    filter_fields: list[str] = field(default_factory=list)
+    resources: list[str] = field(default_factory=list)  # page background/wallpaper images
+
+@dataclass
+class ReportResource:
+    name: str
+    path: str  # relative to the report folder
+    kind: str  # "image" | "theme" | "customVisual" | "other"
+    bytes: int
+    package: str  # resource package folder (RegisteredResources, SharedResources) or custom visual name
+    registered: bool = False  # listed in report.json resourcePackages
 
 @dataclass
 class ReportExtraction:
     pages: list[ReportPage]
     theme_present: bool
+    filter_fields: list[str] = field(default_factory=list)
+    resources: list[ReportResource] = field(default_factory=list)
+    custom_theme: Optional[str] = None
+    base_theme: Optional[str] = None  # SharedResources base theme file (themeCollection.baseTheme)
+    public_custom_visuals: list[str] = field(default_factory=list)  # AppSource visuals listed in report.json
+    report_resources: list[str] = field(default_factory=list)  # items referenced from report.json itself
 
 def _read_json(path: Path):
     return json.loads(path.read_text(encoding="utf-8", errors="ignore"))
 
-def extract_report(ctx: PbipContext) -> ReportExtraction:
+def _field_refs(obj: Any) -> list[str]:
+    """
+    Every Entity.Property referenced anywhere in a visual/filter JSON tree (Column, Measure,
+    Aggregation, PropertyVariationSource...). Older filter JSON names entities through a
+    ``From`` alias list (``{"SourceRef": {"Source": "c"}}``), so aliases are carried down.
+    """
+    refs: set[str] = set()
+    stack: list[tuple[Any, dict]] = [(obj, {})]
+    while stack:
+        node, aliases = stack.pop()
+        if isinstance(node, list):
+            stack.extend((v, aliases) for v in node if isinstance(v, (dict, list)))
+            continue
+        if not isinstance(node, dict):
+            continue
+        frm = node.get("From")
+        if isinstance(frm, list):
+            aliases = {**aliases, **{f.get("Name"): f.get("Entity") for f in frm if isinstance(f, dict) and f.get("Entity")}}
+        prop, expr = node.get("Property"), node.get("Expression")
+        if isinstance(prop, str) and isinstance(expr, dict) and isinstance(expr.get("SourceRef"), dict):
+            src = expr["SourceRef"]
+            entity = src.get("Entity") or aliases.get(src.get("Source"))
+            if entity:
+                refs.add(f"{entity}.{prop}")
+        stack.extend((v, aliases) for v in node.values() if isinstance(v, (dict, list)))
+    return sorted(refs)
+
+def _resource_refs(obj: Any) -> list[str]:
+    """ItemName of every ``ResourcePackageItem`` expression (images in visuals, page backgrounds)."""
+    refs: set[str] = set()
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            item = node.get("ResourcePackageItem")
+            if isinstance(item, dict) and item.get("ItemName"):
+                refs.add(str(item["ItemName"]))
+            stack.extend(v for v in node.values() if isinstance(v, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(v for v in node if isinstance(v, (dict, list)))
+    return sorted(refs)
+
+_IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".svg", ".bmp", ".webp", ".ico", ".tif", ".tiff"}
+
+def _scan_resources(report_dir: Path, registered: dict[str, str]) -> list[ReportResource]:
+    """
+    One walk over StaticResources and CustomVisuals: size and kind of every file. Files of one
+    custom visual package are summed into a single entry named after the package folder.
+    """
+    out: list[ReportResource] = []
+    static_dir = report_dir / "StaticResources"
+    if static_dir.exists():
+        for fp in sorted(static_dir.rglob("*")):
+            if not fp.is_file():
+                continue
+            rel = fp.as_posix()[len(report_dir.as_posix()):].lstrip("/")  # works for virtual paths too
+            package = fp.parent.name
+            reg_type = registered.get(fp.name, "")
+            if fp.suffix.lower() in _IMAGE_SUFFIXES or reg_type == "Image":
+                kind = "image"
+            elif "theme" in reg_type.lower() or (fp.suffix.lower() == ".json" and "theme" in rel.lower()):
+                kind = "theme"
+            else:
+                kind = "other"
+            out.append(ReportResource(
+                name=fp.name, path=rel, kind=kind, bytes=fp.stat().st_size,
+                package=package, registered=fp.name in registered,
+            ))
+    visuals_dir = report_dir / "CustomVisuals"
+    if visuals_dir.exists():
+        for pkg in sorted(visuals_dir.iterdir()):
+            if not pkg.is_dir():
+                continue
+            size = sum(fp.stat().st_size for fp in pkg.rglob("*") if fp.is_file())
+            out.append(ReportResource(
+                name=pkg.name, path=f"CustomVisuals/{pkg.name}", kind="customVisual", bytes=size, package=pkg.name,
+            ))
+    return out
+
+def _count_literals(obj: Any) -> int:
+    count = 0
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if "Literal" in node:
+                count += 1
+            stack.extend(v for v in node.values() if isinstance(v, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(v for v in node if isinstance(v, (dict, list)))
+    return count
+
+# ids, layout and formatting do not change what a visual queries
+_FINGERPRINT_IGNORED_KEYS = {"name", "position", "howCreated", "objects", "vcObjects", "displayName", "ordinal", "isHidden"}
+
+def _normalized(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {k: _normalized(v) for k, v in obj.items() if k not in _FINGERPRINT_IGNORED_KEYS}
+    if isinstance(obj, list):
+        return [_normalized(v) for v in obj]
+    return obj
+
+def _digest(value: Any) -> str:
+    text = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+def _parse_visual(path: Path) -> ReportVisual:
+    try:
+        obj = _read_json(path)
+    except ValueError:
+        obj = {}
+    if not isinstance(obj, dict):
+        obj = {}
+    visual = obj.get("visual") if isinstance(obj.get("visual"), dict) else {}
+    if "visualGroup" in obj and not visual:
+        visual_type = "visualGroup"
+    else:
+        visual_type = str(visual.get("visualType") or "unknown")
+    query = visual.get("query") if isinstance(visual.get("query"), dict) else {}
+    query_state = query.get("queryState") if isinstance(query.get("queryState"), dict) else {}
+    projections = sum(len(role.get("projections") or []) for role in query_state.values() if isinstance(role, dict))
+    filter_config = obj.get("filterConfig") if isinstance(obj.get("filterConfig"), dict) else {}
+    filters = filter_config.get("filters") if isinstance(filter_config.get("filters"), list) else []
+    fields = _field_refs([query, filter_config])
+    queries = bool(query) and bool(fields)
+    return ReportVisual(
+        visual_id=str(obj.get("name") or path.parent.name),
+        visual_type=visual_type,
+        fields=fields,
+        projection_count=projections,
+        filter_count=len(filters),
+        filter_literals=_count_literals(filters),
+        config_hash=_digest([visual_type, _normalized(query), _normalized(filters)]) if queries else "",
+        field_hash=_digest([visual_type, fields]) if queries else "",
+        resources=_resource_refs(visual),
+    )
+
+def extract_report(ctx: PbipContext, cache: Optional[FileCache] = None) -> ReportExtraction:
     if not ctx.report_dir:
         return ReportExtraction(pages=[], theme_present=False)
 
@@ -25,17 +195,43 @@ def extract_report(ctx: PbipContext) -> ReportExtraction:
     pages_index = definition_dir / "pages" / "pages.json"
     report_json = definition_dir / "report.json"
 
-    # Theme detection (best-effort)
+    # Theme and registered resources from report.json (themeCollection / resourcePackages)
     theme_present = False
+    custom_theme: Optional[str] = None
+    base_theme: Optional[str] = None
+    public_custom_visuals: list[str] = []
+    report_filters: list[str] = []
+    report_resources: list[str] = []
+    registered: dict[str, str] = {}
     if report_json.exists():
         try:
             obj = _read_json(report_json)
-            theme_present = "theme" in json.dumps(obj).lower()
+            themes = obj.get("themeCollection") if isinstance(obj.get("themeCollection"), dict) else {}
+            theme_present = bool(themes.get("customTheme") or themes.get("baseTheme"))
+            custom_theme = (themes.get("customTheme") or {}).get("name") if isinstance(themes.get("customTheme"), dict) else None
+            base_name = (themes.get("baseTheme") or {}).get("name") if isinstance(themes.get("baseTheme"), dict) else None
+            report_filters = _field_refs(obj.get("filterConfig"))
+            public_custom_visuals = [str(v) for v in obj.get("publicCustomVisuals") or [] if isinstance(v, str)]
+            for package in obj.get("resourcePackages") or []:
+                for item in (package.get("items") or []) if isinstance(package, dict) else []:
+                    if isinstance(item, dict) and item.get("name"):
+                        file_name = str(item.get("path") or item["name"]).rsplit("/", 1)[-1]
+                        registered[file_name] = str(item.get("type") or "")
+                        if base_name and item["name"] == base_name:
+                            base_theme = file_name  # "CY24SU06" -> BaseThemes/CY24SU06.json
+            if base_name and not base_theme:
+                base_theme = base_name if base_name.lower().endswith(".json") else f"{base_name}.json"
+            report_resources = _resource_refs({k: v for k, v in obj.items() if k != "resourcePackages"})
         except Exception:
             pass
+    resources = _scan_resources(ctx.report_dir, registered)
 
     if not pages_index.exists():
-        return ReportExtraction(pages=[], theme_present=theme_present)
+        return ReportExtraction(
+            pages=[], theme_present=theme_present, filter_fields=report_filters,
+            resources=resources, custom_theme=custom_theme, base_theme=base_theme,
+            public_custom_visuals=public_custom_visuals, report_resources=report_resources,
+        )
 
     idx = _read_json(pages_index)
 
@@ -51,15 +247,31 @@ def extract_report(ctx: PbipContext) -> ReportExtraction:
         page_dir = definition_dir / "pages" / pid
         page_json = page_dir / "page.json"
         display_name = pid
+        page_filters: list[str] = []
+        page_resources: list[str] = []
 
         if page_json.exists():
             pobj = _read_json(page_json)
             if isinstance(pobj, dict):
                 display_name = pobj.get("displayName") or pobj.get("name") or pobj.get("title") or pid
+                page_filters = _field_refs(pobj.get("filterConfig"))
+                page_resources = _resource_refs(pobj.get("objects"))
 
         visuals_dir = page_dir / "visuals"
-        visual_count = len(list(visuals_dir.rglob("visual.json"))) if visuals_dir.exists() else 0
+        visual_files = sorted(visuals_dir.rglob("visual.json")) if visuals_dir.exists() else []
+        visuals = [cached_parse(fp, "report.visual", _parse_visual, cache) for fp in visual_files]
 
-        pages.append(ReportPage(page_id=pid, display_name=display_name, visual_count=visual_count))
+        pages.append(ReportPage(
+            page_id=pid,
+            display_name=display_name,
+            visual_count=len(visual_files),
+            visuals=visuals,
+            filter_fields=page_filters,
+            resources=page_resources,
+        ))
 
-    return ReportExtraction(pages=pages, theme_present=theme_present)
\ No newline at end of file
+    return ReportExtraction(
+        pages=pages, theme_present=theme_present, filter_fields=report_filters,
+        resources=resources, custom_theme=custom_theme, base_theme=base_theme,
+        public_custom_visuals=public_custom_visuals, report_resources=report_resources,
+    )
\ No newline at end of file
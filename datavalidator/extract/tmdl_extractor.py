@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import re
 
+from datavalidator.core.cache import FileCache, cached_parse
+from datavalidator.extract.tmdl_reader import read_tmdl
+from datavalidator.extract.vfs import as_path
+
 
 def _safe_read_text(fp: Path) -> str:
     return fp.read_text(encoding="utf-8", errors="ignore")
@@ -11,14 +16,14 @@ def _safe_read_text(fp: Path) -> str:
 
 def _find_pbip_root_from_ctx(ctx: Any) -> Path:
     if hasattr(ctx, "report_dir") and getattr(ctx, "report_dir"):
-        return Path(getattr(ctx, "report_dir")).parent
+        return as_path(getattr(ctx, "report_dir")).parent
     if hasattr(ctx, "model_dir") and getattr(ctx, "model_dir"):
-        return Path(getattr(ctx, "model_dir")).parent
+        return as_path(getattr(ctx, "model_dir")).parent
     for attr in ("root", "root_dir", "project_path", "projectPath"):
         if hasattr(ctx, attr) and getattr(ctx, attr):
-            return Path(getattr(ctx, attr))
-    if isinstance(ctx, (str, Path)):
-        return Path(ctx)
+            return as_path(getattr(ctx, attr))
+    if isinstance(ctx, (str, Path)) or hasattr(ctx, "iterdir"):
+        return as_path(ctx)
     raise ValueError("extract_semantic_model: cannot determine PBIP root from ctx")
 
 
@@ -39,6 +44,104 @@ _IS_PARAM_RE = re.compile(r"\bIsParameterQuery\s*=\s*true\b", re.IGNORECASE)
 _PARTITION_MODE_RE = re.compile(r"^\s*partition\s+.+?=\s*([A-Za-z_][A-Za-z0-9_]*)", re.IGNORECASE | re.MULTILINE)
 _MEASURE_RE = re.compile(r"^\s*measure\b", re.IGNORECASE | re.MULTILINE)
 _COLUMN_RE = re.compile(r"^\s*column\b", re.IGNORECASE | re.MULTILINE)
+_AUTO_DATE_TIME_RE = re.compile(r"__PBI_TimeIntelligenceEnabled\s*=\s*1\b")
+_DEFAULT_MODE_RE = re.compile(r"^\s*defaultMode\s*:\s*([A-Za-z]+)", re.MULTILINE)
+
+# Declarations that open a child object; other lines at the same depth are plain properties
+_TMDL_OBJECT_TYPES = {
+    "table", "column", "measure", "partition", "hierarchy", "level", "relationship", "expression",
+    "calculationGroup", "calculationItem", "refreshPolicy", "annotation", "changedProperty",
+    "extendedProperty", "variation",
+}
+
+
+def _indent_level(line: str) -> int:
+    ws = line[: len(line) - len(line.lstrip())]
+    return ws.count("\t") + ws.count(" ") // 4
+
+
+def _quoted_end(text: str) -> int:
+    """Index of the quote closing a ``'name'`` that starts at 0 (``''`` is an escaped quote); -1 if unclosed."""
+    i = 1
+    while True:
+        j = text.find("'", i)
+        if j < 0 or text[j + 1: j + 2] != "'":
+            return j
+        i = j + 2
+
+
+def _split_name(rest: str) -> Tuple[str, Optional[str]]:
+    """``'Margin Calc' = expr`` -> ("Margin Calc", "expr"); ``Amount`` -> ("Amount", None)."""
+    rest = rest.strip()
+    if rest.startswith("'"):
+        end = _quoted_end(rest)
+        if end < 0:
+            return rest[1:], None
+        name, tail = rest[1:end].replace("''", "'"), rest[end + 1:].strip()
+    else:
+        name, sep, tail = rest.partition("=")
+        name, tail = name.strip(), ("=" + tail if sep else "")
+    if tail.startswith("="):
+        return name, tail[1:].strip()
+    return name, None
+
+
+def _parse_tmdl_objects(text: str, level: int) -> List[Dict[str, Any]]:
+    """
+    Objects declared at indentation ``level`` (1 inside a table file, 0 in relationships.tmdl).
+    Each object: type, name, expression (text after ``=`` plus deeper continuation lines),
+    properties (``key: value`` and multi-line ``key =`` blocks), flags (bare words such as
+    isHidden), annotations, and the stripped child lines for nested objects (hierarchy levels).
+    """
+    objects: List[Dict[str, Any]] = []
+    cur: Optional[Dict[str, Any]] = None
+    block: Optional[List[str]] = None  # receives deeper lines: the expression or a "key =" property
+    for raw in text.splitlines():
+        stripped = raw.strip()
+        if not stripped:
+            if block is not None:
+                block.append("")
+            continue
+        lvl = _indent_level(raw)
+        if lvl <= level:
+            cur, block = None, None
+            kw, _, rest = stripped.partition(" ")
+            if lvl == level and kw in _TMDL_OBJECT_TYPES:
+                name, expr = _split_name(rest)
+                block = None if expr is None else ([expr] if expr else [])
+                cur = {"type": kw, "name": name, "expression": block, "properties": {}, "flags": [], "annotations": {}, "lines": []}
+                objects.append(cur)
+            continue
+        if cur is None:
+            continue
+        cur["lines"].append(stripped)
+        if lvl > level + 1:
+            if block is not None:
+                block.append(stripped)
+            continue
+
+        block = None
+        kw, _, rest = stripped.partition(" ")
+        colon, eq = stripped.find(":"), stripped.find("=")
+        if kw == "annotation":
+            name, value = _split_name(rest)
+            cur["annotations"][name] = value
+        elif colon > 0 and (eq < 0 or colon < eq):
+            cur["properties"][stripped[:colon].strip()] = stripped[colon + 1:].strip()
+        elif eq > 0:
+            value = stripped[eq + 1:].strip()
+            block = [value] if value else []
+            cur["properties"][stripped[:eq].strip()] = block
+        else:
+            cur["flags"].append(stripped)
+
+    for obj in objects:
+        if obj["expression"] is not None:
+            obj["expression"] = "\n".join(obj["expression"]).strip()
+        for key, value in obj["properties"].items():
+            if isinstance(value, list):
+                obj["properties"][key] = "\n".join(value).strip()
+    return objects
 
 
 def _extract_parameters(expressions_text: str) -> List[Dict[str, str]]:
@@ -51,6 +154,18 @@ def _extract_parameters(expressions_text: str) -> List[Dict[str, str]]:
     return params
 
 
+def _extract_shared_expressions(expressions_text: str) -> List[Dict[str, Any]]:
+    """Named M queries in expressions.tmdl (staging queries, functions) other than parameters."""
+    shared: List[Dict[str, Any]] = []
+    for obj in _parse_tmdl_objects(expressions_text, 0):
+        if obj["type"] != "expression" or not obj["expression"]:
+            continue
+        if _IS_PARAM_RE.search(obj["expression"]):
+            continue
+        shared.append({"name": obj["name"], "expression": obj["expression"]})
+    return shared
+
+
 def _extract_table_meta(table_text: str) -> Dict[str, Any]:
     pm = _PARTITION_MODE_RE.search(table_text)
     partition_mode = (pm.group(1).lower() if pm else "unknown")
@@ -59,24 +174,153 @@ def _extract_table_meta(table_text: str) -> Dict[str, Any]:
     is_calculated = partition_mode == "calculated"
     # Heuristic: measure holder/helper table (many measures, no real columns)
     is_measures_only = (measure_count > 0 and column_count <= 1)
+    objects = _parse_tmdl_objects(table_text, 1)
     return {
         "partitionMode": partition_mode,
         "measureCount": measure_count,
         "columnCount": column_count,
         "isCalculated": is_calculated,
         "isMeasuresOnly": is_measures_only,
+        "columns": [_column_record(o) for o in objects if o["type"] == "column"],
+        "partitions": [
+            {
+                "name": o["name"],
+                "kind": o["expression"] or "",  # "m" | "calculated" | "entity" ...
+                "mode": o["properties"].get("mode", "default"),
+                "source": o["properties"].get("source", ""),
+            }
+            for o in objects
+            if o["type"] == "partition"
+        ],
+        "measures": [
+            {"name": o["name"], "expression": o["expression"] or "", "isHidden": "isHidden" in o["flags"]}
+            for o in objects
+            if o["type"] == "measure"
+        ],
+        "refreshPolicy": next((_refresh_policy_record(o) for o in objects if o["type"] == "refreshPolicy"), None),
+        # columns referenced by hierarchy levels ("column: Year")
+        "hierarchyColumns": sorted({
+            line.split(":", 1)[1].strip().strip("'")
+            for o in objects
+            if o["type"] == "hierarchy"
+            for line in o["lines"]
+            if line.startswith("column:")
+        }),
     }
 
 
-def extract_semantic_model(ctx: Any) -> Dict[str, Any]:
+def _column_record(obj: Dict[str, Any]) -> Dict[str, Any]:
+    props = obj["properties"]
+    return {
+        "name": obj["name"],
+        "dataType": props.get("dataType", "unknown"),
+        "isHidden": "isHidden" in obj["flags"],
+        "isCalculated": obj["expression"] is not None or props.get("type") == "calculated",
+        "sourceColumn": props.get("sourceColumn"),
+        "sortByColumn": (props.get("sortByColumn") or "").strip("'") or None,
+        "summarizeBy": props.get("summarizeBy"),
+        "formatString": props.get("formatString"),
+        "annotations": obj["annotations"],
+        # a "variation" child means Auto date/time generated a LocalDateTable for this column
+        "hasDateVariation": any(line.startswith("variation ") for line in obj["lines"]),
+        "alternateOf": _alternate_of(obj["lines"]),
+        "expression": obj["expression"],
+    }
+
+
+def _alternate_of(lines: List[str]) -> Optional[Dict[str, Any]]:
+    """Aggregation mapping of a column (``alternateOf`` child: baseColumn / baseTable, summarization)."""
+    if "alternateOf" not in lines:
+        return None
+    out: Dict[str, Any] = {"baseTable": None, "baseColumn": None, "summarization": None}
+    for line in lines[lines.index("alternateOf") + 1:]:
+        key, sep, value = line.partition(":")
+        if not sep or key.strip() not in ("baseColumn", "baseTable", "summarization"):
+            break
+        if key.strip() == "baseColumn":
+            out["baseTable"], out["baseColumn"] = _split_column_ref(value)
+        elif key.strip() == "baseTable":
+            out["baseTable"] = value.strip().strip("'").replace("''", "'")
+        else:
+            out["summarization"] = value.strip().lower()
+    return out
+
+
+def _refresh_policy_record(obj: Dict[str, Any]) -> Dict[str, Any]:
+    props = obj["properties"]
+
+    def periods(key: str) -> Optional[int]:
+        try:
+            return int(str(props.get(key)).strip())
+        except ValueError:
+            return None
+
+    return {
+        "policyType": props.get("policyType", "basic"),
+        "mode": props.get("mode", "import"),  # "hybrid" keeps a DirectQuery partition for the newest period
+        "rollingWindowGranularity": (props.get("rollingWindowGranularity") or "").lower() or None,
+        "rollingWindowPeriods": periods("rollingWindowPeriods"),
+        "incrementalGranularity": (props.get("incrementalGranularity") or "").lower() or None,
+        "incrementalPeriods": periods("incrementalPeriods"),
+        "incrementalPeriodsOffset": periods("incrementalPeriodsOffset"),
+        "pollingExpression": props.get("pollingExpression") or None,
+        "sourceExpression": props.get("sourceExpression") or None,
+    }
+
+
+def _split_column_ref(ref: str) -> Tuple[str, str]:
+    """``Sales.CustomerKey`` / ``'Product Copy'.'Product Key'`` -> (table, column)."""
+    ref = ref.strip()
+    if ref.startswith("'") and _quoted_end(ref) > 0:
+        end = _quoted_end(ref)
+        table, column = ref[1:end].replace("''", "'"), ref[end + 1:].lstrip(".")
+    else:
+        table, _, column = ref.partition(".")
+    column = column.strip()
+    if column.startswith("'") and column.endswith("'") and len(column) > 1:
+        column = column[1:-1].replace("''", "'")
+    return table.strip(), column
+
+
+def _extract_relationships(rel_text: str) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    for o in _parse_tmdl_objects(rel_text, 0):
+        if o["type"] != "relationship":
+            continue
+        props = dict(o["properties"])
+        from_table, from_column = _split_column_ref(props.pop("fromColumn", ""))
+        to_table, to_column = _split_column_ref(props.pop("toColumn", ""))
+        items.append({
+            "name": o["name"],
+            "fromTable": from_table,
+            "fromColumn": from_column,
+            "toTable": to_table,
+            "toColumn": to_column,
+            **props,
+        })
+    return items
+
+
+def _parse_table_file(fp: Path) -> Dict[str, Any]:
+    # streamed: embedded Enter Data / Binary.FromText payloads are measured, not loaded
+    doc = read_tmdl(fp)
+    meta = _extract_table_meta(doc.text)
+    meta["embeddedPayloads"] = [asdict(p) for p in doc.payloads]
+    return meta
+
+
+def extract_semantic_model(ctx: Any, cache: Optional[FileCache] = None) -> Dict[str, Any]:
     """
     Robust semantic model inventory for PBIP.
     - tablesCount: number of .tmdl files under definition/tables
     - relationships.count: number of relationship entries in relationships.tmdl
     - tables: list of table names inferred from file names (reliable)
     """
-    project_root = _find_pbip_root_from_ctx(ctx)
-    model_dir = _find_semantic_model_dir(project_root)
+    # a context names its model explicitly (multi-artifact projects hold several)
+    if getattr(ctx, "model_dir", None):
+        model_dir: Optional[Path] = as_path(ctx.model_dir)
+    else:
+        model_dir = _find_semantic_model_dir(_find_pbip_root_from_ctx(ctx))
     if not model_dir:
         return {"tablesCount": 0, "relationships": {"count": 0}, "tables": []}
 
@@ -91,25 +335,40 @@ def extract_semantic_model(ctx: Any) -> Dict[str, Any]:
 
     tables: List[Dict[str, Any]] = []
     for f in table_files:
-        txt = _safe_read_text(f)
-        meta = _extract_table_meta(txt)
+        meta = cached_parse(f, "tmdl.tableMeta", _parse_table_file, cache)
         tables.append({"name": f.stem, "path": str(f), **meta})
     tables_count = len(table_files)
 
     rel_count = 0
+    rel_items: List[Dict[str, Any]] = []
     if rels_file.exists():
         rel_text = _safe_read_text(rels_file)
         rel_count = len(_REL_RE.findall(rel_text))
+        rel_items = _extract_relationships(rel_text)
+
+    auto_date_time = False
+    default_mode = "import"
+    model_file = def_dir / "model.tmdl"
+    if model_file.exists():
+        model_text = _safe_read_text(model_file)
+        auto_date_time = bool(_AUTO_DATE_TIME_RE.search(model_text))
+        dm = _DEFAULT_MODE_RE.search(model_text)
+        if dm:
+            default_mode = dm.group(1)
 
     parameters: List[Dict[str, str]] = []
+    shared: List[Dict[str, Any]] = []
     if expr_file.exists():
-        expr_text = _safe_read_text(expr_file)
+        expr_text = read_tmdl(expr_file).text
         parameters = _extract_parameters(expr_text)
+        shared = _extract_shared_expressions(expr_text)
 
     return {
         "tablesCount": tables_count,
-        "relationships": {"count": rel_count},
+        "relationships": {"count": rel_count, "items": rel_items},
         "tables": tables,
+        "autoDateTimeEnabled": auto_date_time,
+        "defaultMode": default_mode,
         "parameters": parameters,
-        "expressions": {"parameters": parameters},
+        "expressions": {"parameters": parameters, "shared": shared},
     }
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+
+# Literals longer than this are not materialized; they are replaced by a short placeholder
+MAX_LITERAL_CHARS = 4096
+_CHUNK_CHARS = 1 << 16
+_CONTEXT_CHARS = 80
+_RE_BASE64 = re.compile(r"[A-Za-z0-9+/=\s]+")
+_RE_CONTEXT = re.compile(r"(Binary\.(?:FromText|Decompress)|Json\.Document|Value\.NativeQuery|Text\.FromBinary)", re.IGNORECASE)
+
+
+@dataclass
+class Payload:
+    line: int           # 1-based line where the literal starts
+    chars: int          # literal length in characters
+    approxBytes: int    # decoded size for base64, character count otherwise
+    kind: str           # "base64" | "string"
+    context: str        # nearest function the literal is passed to, e.g. "Binary.Decompress"
+
+
+@dataclass
+class TmdlText:
+    text: str
+    payloads: List[Payload] = field(default_factory=list)
+
+
+class _Condenser:
+    """
+    Char-stream state machine: copies TMDL through, but inside a double-quoted literal it stops
+    buffering once MAX_LITERAL_CHARS is reached and only keeps counting. Literals end at the
+    closing quote (``""`` is an escaped quote in M/DAX) or at end of line, which keeps a stray
+    quote in a comment from swallowing the rest of the file.
+    """
+
+    def __init__(self, max_literal: int) -> None:
+        self.max_literal = max_literal
+        self.out: List[str] = []
+        self.payloads: List[Payload] = []
+        self.line = 1
+        self.in_string = False
+        self.pending_quote = False
+        self.lit: List[str] = []
+        self.lit_len = 0
+        self.lit_line = 1
+        self.lit_head = ""
+        self.lit_context = ""
+
+    def _tail(self, chars: int) -> str:
+        parts: List[str] = []
+        size = 0
+        for piece in reversed(self.out):
+            parts.append(piece[-(chars - size):])
+            size += len(parts[-1])
+            if size >= chars:
+                break
+        return "".join(reversed(parts))
+
+    def _emit(self, s: str) -> None:
+        if s:
+            self.out.append(s)
+            self.line += s.count("\n")
+
+    def _start_literal(self) -> None:
+        self.in_string = True
+        self.lit = []
+        self.lit_len = 0
+        self.lit_line = self.line
+        self.lit_head = ""
+        ctx = _RE_CONTEXT.findall(self._tail(_CONTEXT_CHARS))
+        self.lit_context = ctx[-1] if ctx else ""
+
+    def _add_literal(self, s: str) -> None:
+        if not s:
+            return
+        if self.lit_len < 64:
+            self.lit_head += s[: 64 - self.lit_len]
+        self.lit_len += len(s)
+        if self.lit_len <= self.max_literal:
+            self.lit.append(s)
+        elif self.lit:
+            self.lit = []  # over budget: drop what we buffered, keep counting only
+
+    def _end_literal(self, closed: bool) -> None:
+        self.in_string = False
+        if self.lit_len <= self.max_literal:
+            self._emit("".join(self.lit) + ('"' if closed else ""))
+        else:
+            kind = "base64" if _RE_BASE64.fullmatch(self.lit_head or "") else "string"
+            approx = (self.lit_len * 3) // 4 if kind == "base64" else self.lit_len
+            context = self.lit_context
+            if context.lower() == "binary.fromtext":
+                context = "Binary.Decompress" if "binary.decompress" in self._tail(2 * _CONTEXT_CHARS).lower() else "Binary.FromText"
+            self.payloads.append(Payload(line=self.lit_line, chars=self.lit_len, approxBytes=approx, kind=kind, context=context))
+            self._emit(f"<payload:{self.lit_len} chars>" + ('"' if closed else ""))
+        self.lit = []
+
+    def feed(self, chunk: str) -> None:
+        pos = 0
+        n = len(chunk)
+        if self.pending_quote and n:
+            self.pending_quote = False
+            if chunk[0] == '"':  # escaped quote split across chunks
+                self._add_literal('""')
+                pos = 1
+            else:
+                self._end_literal(closed=True)
+        while pos < n:
+            if not self.in_string:
+                q = chunk.find('"', pos)
+                if q < 0:
+                    self._emit(chunk[pos:])
+                    return
+                self._emit(chunk[pos:q + 1])
+                self._start_literal()
+                pos = q + 1
+                continue
+
+            q = chunk.find('"', pos)
+            nl = chunk.find("\n", pos, q if q >= 0 else n)
+            if nl >= 0:
+                self._add_literal(chunk[pos:nl])
+                self._end_literal(closed=False)
+                pos = nl
+                continue
+            if q < 0:
+                self._add_literal(chunk[pos:])
+                return
+            self._add_literal(chunk[pos:q])
+            if q + 1 >= n:
+                self.pending_quote = True
+                return
+            if chunk[q + 1] == '"':
+                self._add_literal('""')
+                pos = q + 2
+                continue
+            self._end_literal(closed=True)
+            pos = q + 1
+
+    def finish(self) -> TmdlText:
+        if self.pending_quote:
+            self.pending_quote = False
+            self._end_literal(closed=True)
+        elif self.in_string:
+            self._end_literal(closed=False)
+        return TmdlText(text="".join(self.out), payloads=self.payloads)
+
+
+def condense_tmdl(text: str, max_literal: int = MAX_LITERAL_CHARS) -> TmdlText:
+    c = _Condenser(max_literal)
+    for i in range(0, len(text), _CHUNK_CHARS):
+        c.feed(text[i:i + _CHUNK_CHARS])
+    return c.finish()
+
+
+def read_tmdl(path: Path, max_literal: int = MAX_LITERAL_CHARS) -> TmdlText:
+    """
+    Stream a TMDL file in fixed-size chunks and return its text with oversized string
+    literals (typically ``Binary.FromText("<base64>")`` from Enter Data tables) replaced by
+    ``"<payload:N chars>"``. Only the payload's size and location are kept, so peak memory
+    tracks the size of the real model definition, not the embedded data.
+    """
+    c = _Condenser(max_literal)
+    with path.open("r", encoding="utf-8", errors="ignore") as fh:
+        while True:
+            chunk = fh.read(_CHUNK_CHARS)
+            if not chunk:
+                break
+            c.feed(chunk)
+    return c.finish()
+
+
+def payload_bytes(payloads: Optional[List[Payload]]) -> int:
+    return sum(p.approxBytes for p in payloads or [])
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import io
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Tuple, Union
+
+
+class VirtualStat(NamedTuple):
+    st_mtime_ns: int
+    st_size: int
+
+
+class VirtualStore:
+    """
+    Read-only file index behind VirtualPath. Subclasses supply the file list and bytes;
+    the directory tree is derived from the file keys (posix paths relative to the store root).
+    """
+
+    label = ""
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        self._files: Dict[str, None] = {}
+        self._children: Dict[str, Dict[str, bool]] = {"": {}}
+        for key in keys:
+            self._add(key)
+
+    def _add(self, key: str) -> None:
+        key = normalize_key(key)
+        if not key:
+            return
+        self._files[key] = None
+        parent, _, name = key.rpartition("/")
+        self._children.setdefault(parent, {})[name] = False
+        while parent:
+            grand, _, dname = parent.rpartition("/")
+            siblings = self._children.setdefault(grand, {})
+            if siblings.get(dname) is True:
+                break
+            siblings[dname] = True
+            self._children.setdefault(parent, {})
+            parent = grand
+
+    def read_bytes(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    def open(self, key: str) -> IO[bytes]:
+        return io.BytesIO(self.read_bytes(key))
+
+    def size(self, key: str) -> int:
+        return len(self.read_bytes(key))
+
+    def signature(self, key: str) -> Tuple[Any, ...]:
+        """Change-detection key used by FileCache; content-derived unless the store has something cheaper."""
+        return ("blake2b", hashlib.blake2b(self.read_bytes(key), digest_size=16).hexdigest())
+
+    def display(self, key: str) -> str:
+        if not self.label:
+            return key
+        return f"{self.label}/{key}" if key else self.label
+
+    def is_file(self, key: str) -> bool:
+        return key in self._files
+
+    def is_dir(self, key: str) -> bool:
+        return key in self._children
+
+    def children(self, key: str) -> List[str]:
+        return sorted((self._children.get(key) or {}).keys())
+
+    def keys(self) -> List[str]:
+        return list(self._files.keys())
+
+    def root(self) -> "VirtualPath":
+        return VirtualPath(self, "")
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryStore(VirtualStore):
+    """Files supplied by the caller as {relative path: text or bytes}."""
+
+    def __init__(self, files: Mapping[str, Union[str, bytes]], label: str = "memory") -> None:
+        self.label = label
+        self._data: Dict[str, bytes] = {}
+        for key, content in files.items():
+            self._data[normalize_key(key)] = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+        self._digests: Dict[str, Tuple[Any, ...]] = {}
+        super().__init__(self._data.keys())
+
+    def read_bytes(self, key: str) -> bytes:
+        try:
+            return self._data[key]
+        except KeyError:
+            raise FileNotFoundError(self.display(key)) from None
+
+    def signature(self, key: str) -> Tuple[Any, ...]:
+        sig = self._digests.get(key)
+        if sig is None:
+            sig = self._digests[key] = super().signature(key)
+        return sig
+
+
+class VirtualPath:
+    """
+    The subset of pathlib.Path the extractors rely on, served from a VirtualStore
+    (in-memory files today; archives and git trees plug in the same way).
+    """
+
+    __slots__ = ("_store", "_key")
+
+    def __init__(self, store: VirtualStore, key: str = "") -> None:
+        self._store = store
+        self._key = normalize_key(key)
+
+    # --- naming ---
+    @property
+    def name(self) -> str:
+        if not self._key:
+            return self._store.label
+        return self._key.rpartition("/")[2]
+
+    @property
+    def suffix(self) -> str:
+        return PurePosixPath(self.name).suffix if self.name else ""
+
+    @property
+    def stem(self) -> str:
+        return PurePosixPath(self.name).stem if self.name else ""
+
+    @property
+    def parent(self) -> "VirtualPath":
+        return VirtualPath(self._store, self._key.rpartition("/")[0])
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @property
+    def store(self) -> VirtualStore:
+        return self._store
+
+    def joinpath(self, *parts: str) -> "VirtualPath":
+        key = self._key
+        for part in parts:
+            for seg in normalize_key(str(part)).split("/"):
+                if seg in ("", "."):
+                    continue
+                if seg == "..":
+                    key = key.rpartition("/")[0]
+                else:
+                    key = f"{key}/{seg}" if key else seg
+        return VirtualPath(self._store, key)
+
+    def __truediv__(self, other: str) -> "VirtualPath":
+        return self.joinpath(other)
+
+    def as_posix(self) -> str:
+        return self._key
+
+    # --- queries ---
+    def exists(self) -> bool:
+        return self._store.is_file(self._key) or self._store.is_dir(self._key)
+
+    def is_file(self) -> bool:
+        return self._store.is_file(self._key)
+
+    def is_dir(self) -> bool:
+        return self._store.is_dir(self._key)
+
+    def iterdir(self) -> Iterator["VirtualPath"]:
+        if not self.is_dir():
+            raise NotADirectoryError(str(self))
+        for name in self._store.children(self._key):
+            yield self.joinpath(name)
+
+    def glob(self, pattern: str) -> Iterator["VirtualPath"]:
+        if pattern.startswith("**/"):
+            yield from self.rglob(pattern[3:])
+            return
+        head, _, rest = pattern.partition("/")
+        for child in self.iterdir() if self.is_dir() else ():
+            if fnmatch.fnmatchcase(child.name, head):
+                if not rest:
+                    yield child
+                elif child.is_dir():
+                    yield from child.glob(rest)
+
+    def rglob(self, pattern: str) -> Iterator["VirtualPath"]:
+        stack = [self] if self.is_dir() else []
+        while stack:
+            cur = stack.pop()
+            for child in cur.iterdir():
+                if fnmatch.fnmatchcase(child.name, pattern):
+                    yield child
+                if child.is_dir():
+                    stack.append(child)
+
+    def stat(self) -> VirtualStat:
+        return VirtualStat(st_mtime_ns=0, st_size=self._store.size(self._key))
+
+    def signature(self) -> Tuple[Any, ...]:
+        return self._store.signature(self._key)
+
+    # --- content ---
+    def read_bytes(self) -> bytes:
+        return self._store.read_bytes(self._key)
+
+    def read_text(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return self.read_bytes().decode(encoding, errors)
+
+    def open(self, mode: str = "r", encoding: str = "utf-8", errors: str = "strict") -> IO[Any]:
+        if mode not in ("r", "rb", "rt"):
+            raise ValueError(f"read-only path: unsupported mode {mode!r}")
+        raw = self._store.open(self._key)
+        if mode == "rb":
+            return raw
+        return io.TextIOWrapper(raw, encoding=encoding, errors=errors)
+
+    # --- identity ---
+    def __str__(self) -> str:
+        return self._store.display(self._key)
+
+    def __repr__(self) -> str:
+        return f"VirtualPath({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, VirtualPath) and other._store is self._store and other._key == self._key
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._key))
+
+    def __lt__(self, other: "VirtualPath") -> bool:
+        return self._key < other._key
+
+
+def normalize_key(key: str) -> str:
+    return key.replace("\\", "/").strip("/")
+
+
+def as_path(p: Any) -> Any:
+    """Wrap plain strings as Path; leave Path and VirtualPath objects untouched."""
+    return Path(p) if isinstance(p, str) else p
+
+
+def find_project_root(root: VirtualPath) -> VirtualPath:
+    """Descend single-folder wrappers ("MyProj/Sales.Report/...") down to the folder holding the PBIP artifacts."""
+    cur = root
+    while True:
+        children = list(cur.iterdir())
+        if any(c.suffix.lower() == ".pbip" or c.name.endswith((".Report", ".SemanticModel")) for c in children):
+            return cur
+        dirs = [c for c in children if c.is_dir()]
+        if len(dirs) != 1:
+            return cur
+        cur = dirs[0]
+
+
+def memory_root(files: Mapping[str, Union[str, bytes]], label: str = "memory") -> VirtualPath:
+    return MemoryStore(files, label=label).root()
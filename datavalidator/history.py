@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from datavalidator.api import ScanResult
+
+SCHEMA_VERSION = 1
+_SEVERITY_RANK = {"INFO": 0, "LOW": 1, "MED": 2, "HIGH": 3, "BLOCKER": 4}
+
+
+def _score(alias: str = "") -> str:
+    """Weighted severity score used to rank runs: one HIGH outweighs a handful of LOWs."""
+    p = f"{alias}." if alias else ""
+    return f"({p}blocker * 25 + {p}high * 10 + {p}med * 3 + {p}low)"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    project_path TEXT,
+    run_at TEXT NOT NULL,
+    findings INTEGER NOT NULL,
+    blocker INTEGER NOT NULL,
+    high INTEGER NOT NULL,
+    med INTEGER NOT NULL,
+    low INTEGER NOT NULL,
+    info INTEGER NOT NULL,
+    inventory TEXT NOT NULL,
+    signals TEXT
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    project TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    rule_id TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    severity_rank INTEGER NOT NULL,
+    category TEXT,
+    title TEXT,
+    fingerprint TEXT,
+    evidence TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_runs_project_time ON runs(project, run_at);
+CREATE INDEX IF NOT EXISTS ix_runs_time ON runs(run_at);
+CREATE INDEX IF NOT EXISTS ix_findings_run ON findings(run_id, fingerprint);
+CREATE INDEX IF NOT EXISTS ix_findings_project_time ON findings(project, run_at);
+CREATE INDEX IF NOT EXISTS ix_findings_rule_time ON findings(rule_id, run_at);
+CREATE INDEX IF NOT EXISTS ix_findings_severity_time ON findings(severity_rank, run_at);
+"""
+
+# Latest run per project (optionally at or before a cut-off), answered from ix_runs_project_time;
+# run_at has one-second resolution, so runs in the same second are ordered by id (insert order)
+_LATEST = """
+SELECT r.* FROM (SELECT DISTINCT project FROM runs) p
+JOIN runs r ON r.id = (
+  SELECT id FROM runs WHERE project = p.project AND run_at <= :until ORDER BY run_at DESC, id DESC LIMIT 1
+)
+"""
+
+
+def inventory_summary(inventory: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Counts that are cheap to trend; the full inventory stays in the run folder. Multi-artifact
+    projects are summed over every semantic model and report.
+    """
+    artifacts = inventory.get("artifacts") or []
+    if artifacts:
+        models = [a for a in artifacts if a.get("kind") == "semanticModel"]
+        reports = [a.get("report") or {} for a in artifacts if a.get("kind") == "report"]
+        queries = sum((a.get("powerQuery") or {}).get("count", 0) for a in models)
+        models = [a.get("model") or {} for a in models]
+    else:
+        models, reports = [inventory.get("model") or {}], [inventory.get("report") or {}]
+        queries = (inventory.get("powerQuery") or {}).get("count", 0)
+    tables = [t for m in models for t in m.get("tables") or [] if isinstance(t, dict)]
+    pages = [p for r in reports for p in r.get("pages") or []]
+    return {
+        "queries": queries,
+        "tables": len(tables),
+        "columns": sum(len(t.get("columns") or []) for t in tables),
+        "measures": sum(len(t.get("measures") or []) for t in tables),
+        "relationships": sum(len((m.get("relationships") or {}).get("items") or []) for m in models),
+        "pages": len(pages),
+        "visuals": sum(len(p.get("visuals") or []) for p in pages),
+    }
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class ResultsStore:
+    """
+    Append-only SQLite store of scan runs across many projects. Each run is one row in ``runs``
+    (severity counts, inventory summary, signals JSON) plus one row per finding; project and
+    run time are copied onto findings so trend queries stay on a single indexed table.
+    """
+
+    def __init__(self, path: Path, keep_signals: bool = True) -> None:
+        self.path = Path(path)
+        self.keep_signals = keep_signals
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('schemaVersion', ?)", (str(SCHEMA_VERSION),))
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # --- writing ---------------------------------------------------------------------------
+
+    def record(self, result: ScanResult, project: Optional[str] = None, run_at: Optional[str] = None) -> int:
+        """Append one run in a single transaction; returns the run id."""
+        name = project or (result.inventory.get("project") or {}).get("name") or Path(result.project).name
+        run_at = run_at or _utc_now()
+        counts = {k.lower(): 0 for k in _SEVERITY_RANK}
+        for f in result.findings:
+            sev = str(f.get("severity", "INFO")).lower()
+            counts[sev] = counts.get(sev, 0) + 1
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO runs(project, project_path, run_at, findings, blocker, high, med, low, info, inventory, signals)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    name, result.project, run_at, len(result.findings),
+                    counts["blocker"], counts["high"], counts["med"], counts["low"], counts["info"],
+                    json.dumps(inventory_summary(result.inventory)),
+                    json.dumps(result.signals, default=str) if self.keep_signals else None,
+                ),
+            )
+            run_id = int(cur.lastrowid)
+            self._conn.executemany(
+                "INSERT INTO findings(run_id, project, run_at, rule_id, severity, severity_rank, category, title, fingerprint, evidence)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id, name, run_at, f.get("id") or "", f.get("severity", "INFO"),
+                        _SEVERITY_RANK.get(f.get("severity", "INFO"), 0), f.get("category"), f.get("title"),
+                        f.get("fingerprint"), json.dumps(f.get("evidence") or {}, default=str),
+                    )
+                    for f in result.findings
+                ],
+            )
+        return run_id
+
+    # --- queries ---------------------------------------------------------------------------
+
+    def _rows(self, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(sql, params)]
+
+    def trend(self, project: Optional[str] = None, since: Optional[str] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        """Severity counts of the latest ``limit`` runs (one project or the whole fleet), oldest first."""
+        where = "project = :project AND run_at >= :since" if project else "run_at >= :since"  # keeps each on its index
+        rows = self._rows(
+            "SELECT project, run_at AS runAt, findings, blocker, high, med, low, info, " + _score() + " AS score"
+            " FROM runs WHERE " + where + " ORDER BY run_at DESC LIMIT :limit",
+            {"project": project, "since": since or "", "limit": limit},
+        )
+        return rows[::-1]
+
+    def top_offenders(self, limit: int = 20, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Projects ranked by weighted severity score of their latest run."""
+        return self._rows(
+            "SELECT project, run_at AS runAt, findings, blocker, high, med, low, " + _score() + " AS score"
+            " FROM (" + _LATEST + ") ORDER BY score DESC, project LIMIT :limit",
+            {"until": until or "9999", "limit": limit},
+        )
+
+    def top_rules(self, limit: int = 20, min_severity: str = "LOW") -> List[Dict[str, Any]]:
+        """Rules firing most across the latest run of every project."""
+        return self._rows(
+            "SELECT f.rule_id AS ruleId, MAX(f.severity_rank) AS severityRank, COUNT(*) AS findings,"
+            " COUNT(DISTINCT f.project) AS projects"
+            " FROM findings f JOIN (" + _LATEST + ") l ON l.id = f.run_id"
+            " WHERE f.severity_rank >= :min_rank GROUP BY f.rule_id ORDER BY projects DESC, findings DESC LIMIT :limit",
+            {"until": "9999", "min_rank": _SEVERITY_RANK.get(min_severity.upper(), 1), "limit": limit},
+        )
+
+    def regressions(self, since: str, limit: int = 50, min_severity: str = "LOW") -> List[Dict[str, Any]]:
+        """
+        Projects whose latest run got worse than their latest run before ``since``: score delta
+        plus the number of findings (by fingerprint) that are new at ``min_severity`` or above.
+        """
+        rows = self._rows(
+            "WITH cur AS (" + _LATEST.replace(":until", "'9999'") + "),"
+            " base AS (" + _LATEST.replace(":until", ":since") + ")"
+            " SELECT cur.project, base.run_at AS baselineAt, cur.run_at AS latestAt,"
+            " " + _score("base") + " AS baselineScore, " + _score("cur") + " AS latestScore,"
+            " base.high AS baselineHigh, cur.high AS latestHigh,"
+            " (SELECT COUNT(*) FROM findings f WHERE f.run_id = cur.id AND f.severity_rank >= :min_rank"
+            "   AND NOT EXISTS (SELECT 1 FROM findings b WHERE b.run_id = base.id AND b.fingerprint = f.fingerprint)) AS newFindings"
+            " FROM cur JOIN base ON base.project = cur.project AND base.id <> cur.id",
+            {"since": since, "min_rank": _SEVERITY_RANK.get(min_severity.upper(), 1)},
+        )
+        worse = [
+            {**r, "scoreDelta": r["latestScore"] - r["baselineScore"]}
+            for r in rows if r["latestScore"] > r["baselineScore"] or r["newFindings"]
+        ]
+        worse.sort(key=lambda r: (-r["scoreDelta"], -r["newFindings"], r["project"]))
+        return worse[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        row = self._rows("SELECT COUNT(*) AS runs, COUNT(DISTINCT project) AS projects, MIN(run_at) AS firstRun, MAX(run_at) AS lastRun FROM runs", {})[0]
+        row["findings"] = self._rows("SELECT COUNT(*) AS n FROM findings", {})[0]["n"]
+        return row
@@ -3,24 +3,39 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-
-from datavalidator.analyze.inventory_builder import build_inventory
-from datavalidator.analyze.findings_builder import build_findings
-from datavalidator.report.render import render_audit_report
-
-def run_pipeline(project_path: Path, out_dir: Path, run_ai: bool = False) -> None:
+from typing import Optional
+
+from datavalidator.analyze.baseline import Baseline, BaselineDiff, Suppressions, diff_against_baseline
+from datavalidator.api import scan
+from datavalidator.sinks import HtmlReportSink, JsonArtifactsSink, SqliteStoreSink
+
+def run_pipeline(
+    project_path: Path,
+    out_dir: Path,
+    run_ai: bool = False,
+    baseline_path: Optional[Path] = None,
+    suppressions_path: Optional[Path] = None,
+    store_path: Optional[Path] = None,
+) -> Optional[BaselineDiff]:
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    inventory = build_inventory(project_path)
-    bundle = build_findings(inventory)
+    result = scan(project_path)
 
-    signals = bundle["signals"]
-    findings = bundle["findings"]
+    # Baseline / suppressions (CI gating): suppressed findings are dropped, the rest tagged new/existing
+    diff = None
+    if baseline_path or suppressions_path:
+        baseline = Baseline.load(baseline_path) if baseline_path else None
+        suppressions = Suppressions.load(suppressions_path) if suppressions_path else None
+        result.findings, diff = diff_against_baseline(result.findings, baseline, suppressions)
+        (out_dir / "baseline_diff.json").write_text(json.dumps(diff.to_dict(), indent=2), encoding="utf-8")
 
     # Save core artifacts always
-    (out_dir / "inventory.json").write_text(json.dumps(inventory, indent=2), encoding="utf-8")
-    (out_dir / "signals.json").write_text(json.dumps(signals, indent=2), encoding="utf-8")
-    (out_dir / "findings.json").write_text(json.dumps(findings, indent=2), encoding="utf-8")
+    JsonArtifactsSink(out_dir)(result)
+    if store_path:
+        SqliteStoreSink(store_path)(result)
+
+    signals = result.signals
+    findings = result.findings
 
     # AI layer (Power Query first)
     if run_ai:
@@ -36,8 +51,10 @@ def run_pipeline(project_path: Path, out_dir: Path, run_ai: bool = False) -> Non
         # merge into signals so template can render AI section without extra file reads
         signals = dict(signals)
         signals["ai"] = {"powerQuery": ai_pq}
+        result.signals = signals
 
         (out_dir / "ai_pq.json").write_text(json.dumps(ai_pq, indent=2), encoding="utf-8")
         (out_dir / "signals.json").write_text(json.dumps(signals, indent=2), encoding="utf-8")  # overwrite with ai included
 
-    render_audit_report(out_dir=out_dir, inventory=inventory, findings=findings, signals=signals)
+    HtmlReportSink(out_dir)(result)
+    return diff
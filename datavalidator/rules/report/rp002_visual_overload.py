@@ -1,24 +1,23 @@
+from dataclasses import asdict
+
 from datavalidator.rules.base import Rule
 from datavalidator.core.findings import Finding
+from datavalidator.analyze.render_cost import build_render_cost, page_severity
 
 class RP002(Rule):
     rule_id = "RP002"
-    title = "Visual overload per page"
+    title = "Expensive page render"
 
-    def run(self, ctx, report=None, **kwargs):
+    def run(self, ctx, report=None, model=None, **kwargs):
         findings = []
         if not report or not getattr(report, "pages", None):
             return findings
 
-        for p in report.pages:
-            # use display_name (fallback to page_id)
-            page_name = getattr(p, "display_name", None) or getattr(p, "page_id", "Unknown Page")
-
-            if p.visual_count >= 20:
-                sev = "HIGH"
-            elif p.visual_count >= 14:
-                sev = "MED"
-            else:
+        # score pages by estimated query cost, not by how many visuals they hold
+        cost = build_render_cost(asdict(report), model)
+        for p in cost["pages"]:
+            sev = page_severity(p["estimatedCost"])
+            if not sev:
                 continue
 
             findings.append(Finding(
@@ -26,9 +25,9 @@ class RP002(Rule):
                 category="Report",
                 severity=sev,
                 title=self.title,
-                message=f"Page '{page_name}' contains {p.visual_count} visuals.",
-                evidence={"page": page_name, "visual_count": p.visual_count},
-                recommendation="Split into drill-through/tooltip pages or reduce visuals for performance/readability."
+                message=f"Page '{p['page']}' issues ~{p['estimatedQueries']} queries from {p['visualCount']} visuals (estimated cost {p['estimatedCost']:.0f}).",
+                evidence={"page": p["page"], "visual_count": p["visualCount"], "estimated_queries": p["estimatedQueries"], "estimated_cost": p["estimatedCost"]},
+                recommendation="Split into drill-through/tooltip pages, trim wide tables/matrices and long filter lists, and avoid slicers on high-cardinality columns."
             ))
 
-        return findings
\ No newline at end of file
+        return findings
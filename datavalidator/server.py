@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from datavalidator import __version__
+from datavalidator.api import scan
+from datavalidator.core.cache import FileCache, file_signature
+from datavalidator.extract.archive_source import is_archive
+
+
+# Files that feed extraction; anything else under the project (caches, output folders) is ignored
+_WATCHED_SUFFIXES = {".tmdl", ".json", ".pbir", ".pbism", ".pbip"}
+
+
+class ServiceBusy(RuntimeError):
+    pass
+
+
+@dataclass
+class _ProjectEntry:
+    key: str
+    cache: FileCache = field(default_factory=FileCache)
+    snapshot: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    scans: int = 0
+
+
+def _project_root(project: Path) -> Path:
+    return project.parent if project.is_file() else project
+
+
+def _project_snapshot(project: Path) -> Dict[str, Tuple[int, int]]:
+    if is_archive(project):
+        return {str(project): file_signature(project)}
+    snap: Dict[str, Tuple[int, int]] = {}
+    for fp in _project_root(project).rglob("*"):
+        if fp.suffix.lower() in _WATCHED_SUFFIXES and fp.is_file():
+            snap[str(fp)] = file_signature(fp)
+    return snap
+
+
+def _changed_files(old: Dict[str, Tuple[int, int]], new: Dict[str, Tuple[int, int]]) -> int:
+    changed = sum(1 for k, v in new.items() if old.get(k) != v)
+    removed = sum(1 for k in old if k not in new)
+    return changed + removed
+
+
+class ScanService:
+    """
+    Keeps recently scanned projects warm between requests.
+
+    Each project gets its own FileCache, so a re-scan only re-parses files whose
+    mtime/size (and then content hash) changed. When nothing under the project changed
+    at all, the previous result is served as-is. Projects are kept in an LRU bounded by
+    ``max_projects``; concurrent scans are bounded by ``max_concurrent``.
+    """
+
+    def __init__(self, max_projects: int = 8, max_concurrent: int = 2, queue_timeout: float = 30.0) -> None:
+        self.max_projects = max(1, max_projects)
+        self.max_concurrent = max(1, max_concurrent)
+        self.queue_timeout = queue_timeout
+        self._projects: "OrderedDict[str, _ProjectEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._started = time.time()
+        self._counters: Dict[str, float] = {
+            "requests": 0,
+            "scans": 0,
+            "resultCacheHits": 0,
+            "rejected": 0,
+            "errors": 0,
+            "evictions": 0,
+            "inflight": 0,
+            "scanMsTotal": 0.0,
+        }
+
+    def _bump(self, name: str, by: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += by
+
+    def _entry(self, key: str) -> _ProjectEntry:
+        with self._lock:
+            entry = self._projects.get(key)
+            if entry is None:
+                entry = _ProjectEntry(key=key)
+                self._projects[key] = entry
+            self._projects.move_to_end(key)
+            while len(self._projects) > self.max_projects:
+                self._projects.popitem(last=False)
+                self._counters["evictions"] += 1
+            return entry
+
+    def scan(self, project: Path, force: bool = False) -> Dict[str, Any]:
+        self._bump("requests")
+        project = Path(project).resolve()
+        if not project.exists():
+            raise FileNotFoundError(f"PBIP path not found: {project}")
+
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._bump("rejected")
+            raise ServiceBusy(f"all {self.max_concurrent} scan slots busy")
+        self._bump("inflight")
+        try:
+            entry = self._entry(str(project))
+            with entry.lock:
+                return self._scan_entry(entry, project, force)
+        except Exception:
+            self._bump("errors")
+            raise
+        finally:
+            self._bump("inflight", -1)
+            self._slots.release()
+
+    def _scan_entry(self, entry: _ProjectEntry, project: Path, force: bool) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        snapshot = _project_snapshot(project)
+        changed = _changed_files(entry.snapshot, snapshot)
+
+        if entry.result is not None and not force and changed == 0:
+            self._bump("resultCacheHits")
+            return {**entry.result, "cached": True, "changedFiles": 0,
+                    "durationMs": round((time.perf_counter() - t0) * 1000, 2)}
+
+        misses_before = entry.cache.misses
+        result = scan(project, cache=entry.cache)
+        duration_ms = (time.perf_counter() - t0) * 1000
+
+        entry.snapshot = snapshot
+        entry.scans += 1
+        entry.result = {
+            "project": str(project),
+            "findings": result.findings,
+            "signals": result.signals,
+            "fileParses": entry.cache.misses - misses_before,
+        }
+        self._bump("scans")
+        self._bump("scanMsTotal", duration_ms)
+        return {**entry.result, "cached": False, "changedFiles": changed, "durationMs": round(duration_ms, 2)}
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            projects = [
+                {"project": e.key, "scans": e.scans, "files": len(e.snapshot), **e.cache.stats()}
+                for e in self._projects.values()
+            ]
+        scans = counters["scans"] or 1
+        counters["scanMsAvg"] = round(counters.pop("scanMsTotal") / scans, 2)
+        return {
+            **counters,
+            "uptimeSec": round(time.time() - self._started, 1),
+            "maxProjects": self.max_projects,
+            "maxConcurrent": self.max_concurrent,
+            "projectsCached": len(projects),
+            "projects": projects,
+        }
+
+
+def _make_handler(service: ScanService):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = f"datavalidator/{__version__}"
+
+        def _send(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "version": __version__})
+            elif self.path == "/metrics":
+                self._send(200, service.metrics())
+            else:
+                self._send(404, {"error": f"unknown endpoint {self.path}"})
+
+        def do_POST(self) -> None:
+            if self.path != "/scan":
+                self._send(404, {"error": f"unknown endpoint {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                req = json.loads(self.rfile.read(length) or b"{}")
+                project = req["project"]
+            except (ValueError, KeyError, TypeError):
+                self._send(400, {"error": "expected JSON body with a 'project' path"})
+                return
+
+            try:
+                res = service.scan(Path(project), force=bool(req.get("force")))
+            except FileNotFoundError as e:
+                self._send(404, {"error": str(e)})
+                return
+            except ServiceBusy as e:
+                self._send(503, {"error": str(e)})
+                return
+            except Exception as e:  # keep the service alive; report the failure to the caller
+                self._send(500, {"error": f"{type(e).__name__}: {e}"})
+                return
+
+            if not req.get("signals"):
+                res = {k: v for k, v in res.items() if k != "signals"}
+            self._send(200, res)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    max_projects: int = 8,
+    max_concurrent: int = 2,
+    queue_timeout: float = 30.0,
+) -> None:
+    """
+    Run the scan service until interrupted.
+
+    Endpoints:
+      - POST /scan     {"project": "<path>", "force": false, "signals": false} -> findings JSON
+      - GET  /health   liveness
+      - GET  /metrics  counters, cache stats and warm projects
+    """
+    service = ScanService(max_projects=max_projects, max_concurrent=max_concurrent, queue_timeout=queue_timeout)
+    httpd = ThreadingHTTPServer((host, port), _make_handler(service))
+    httpd.daemon_threads = True
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
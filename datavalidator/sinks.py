@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Optional
+
+from datavalidator.api import ScanResult
+
+
+class JsonArtifactsSink:
+    """Writes inventory.json, signals.json and findings.json into ``out_dir``."""
+
+    def __init__(self, out_dir: Path) -> None:
+        self.out_dir = Path(out_dir)
+
+    def __call__(self, result: ScanResult) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        (self.out_dir / "inventory.json").write_text(json.dumps(result.inventory, indent=2), encoding="utf-8")
+        (self.out_dir / "signals.json").write_text(json.dumps(result.signals, indent=2), encoding="utf-8")
+        (self.out_dir / "findings.json").write_text(json.dumps(result.findings, indent=2), encoding="utf-8")
+
+
+class HtmlReportSink:
+    """Renders report.html into ``out_dir``."""
+
+    def __init__(self, out_dir: Path) -> None:
+        self.out_dir = Path(out_dir)
+
+    def __call__(self, result: ScanResult) -> None:
+        # jinja2 is only needed when a report is actually rendered
+        from datavalidator.report.render import render_audit_report
+
+        render_audit_report(
+            out_dir=self.out_dir,
+            inventory=result.inventory,
+            findings=result.findings,
+            signals=result.signals,
+        )
+
+
+class SqliteStoreSink:
+    """Appends the run (severity counts, inventory summary, signals, findings) to a SQLite results store."""
+
+    def __init__(self, db_path: Path, project: Optional[str] = None, keep_signals: bool = True) -> None:
+        self.db_path = Path(db_path)
+        self.project = project
+        self.keep_signals = keep_signals
+
+    def __call__(self, result: ScanResult) -> None:
+        from datavalidator.history import ResultsStore
+
+        with ResultsStore(self.db_path, keep_signals=self.keep_signals) as store:
+            store.record(result, project=self.project)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from datavalidator.api import scan
+from datavalidator.core.cache import FileCache
+from datavalidator.extract.git_source import GitCatFile, git_root, list_revisions
+
+
+def build_timeline(
+    repo: Path,
+    rev: str = "HEAD",
+    max_count: int = 200,
+    subdir: str = "",
+    on_revision: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """
+    Scan the last ``max_count`` commits touching ``subdir`` straight from the object database.
+
+    All revisions share one ``git cat-file --batch`` reader and one FileCache keyed by blob id,
+    so each revision only re-extracts files whose blob changed since the previous one.
+    Each timeline point lists counts plus new/resolved fingerprints relative to the previous point.
+    """
+    repo = Path(repo)
+    revisions = list_revisions(repo, rev=rev, max_count=max_count, subdir=subdir)
+    cache = FileCache()
+    points: List[Dict[str, Any]] = []
+    prev: Dict[str, Dict[str, Any]] = {}
+    label = f"git:{subdir or repo.resolve().name}"
+
+    t0 = time.perf_counter()
+    with GitCatFile(repo) as reader:
+        for r in revisions:
+            misses_before = cache.misses
+            result = scan(git_root(reader, r["commit"], subdir=subdir, label=label), cache=cache)
+            current = {f["fingerprint"]: f for f in result.findings}
+            point = {
+                **r,
+                "findingsCount": len(result.findings),
+                "bySeverity": result.count_by_severity(),
+                "filesReparsed": cache.misses - misses_before,
+                "new": [{"fingerprint": fp, "id": f.get("id"), "severity": f.get("severity"), "title": f.get("title")}
+                        for fp, f in current.items() if fp not in prev],
+                "resolved": [{"fingerprint": fp, "id": f.get("id"), "severity": f.get("severity"), "title": f.get("title")}
+                             for fp, f in prev.items() if fp not in current],
+            }
+            points.append(point)
+            prev = current
+            if on_revision is not None:
+                on_revision(point)
+        blob_reads = reader.reads
+
+    return {
+        "repo": str(repo),
+        "rev": rev,
+        "subdir": subdir,
+        "revisions": len(points),
+        "blobReads": blob_reads,
+        "elapsedSec": round(time.perf_counter() - t0, 2),
+        "timeline": points,
+    }
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import decimal
+import math
+import os
+import pickle
+import tempfile
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+Row = Mapping[str, Any]
+Key = Tuple[str, ...]
+
+DEFAULT_MEMORY_ROWS = 200_000
+DEFAULT_PARTITIONS = 64
+_MAX_DEPTH = 4  # re-partitioning rounds for a partition that alone exceeds the memory budget
+_MASK = (1 << 64) - 1
+
+
+@dataclass
+class CompareOptions:
+    keys: List[str]  # column names in the expected result set
+    columns: Optional[List[str]] = None  # value columns to compare; None = every non-key expected column
+    column_map: Dict[str, str] = field(default_factory=dict)  # actual column name -> expected column name
+    abs_tolerance: float = 0.0
+    rel_tolerance: float = 0.0
+    column_tolerances: Dict[str, float] = field(default_factory=dict)  # absolute tolerance per column
+    memory_rows: int = DEFAULT_MEMORY_ROWS  # rows held in memory (both sides) before spilling to disk
+    partitions: int = DEFAULT_PARTITIONS
+    max_examples: int = 25
+    spill_dir: Optional[str] = None
+
+
+@dataclass
+class CompareResult:
+    expected_rows: int = 0
+    actual_rows: int = 0
+    matched: int = 0
+    missing: int = 0  # key in expected, not in actual
+    extra: int = 0  # key in actual, not in expected
+    mismatched: int = 0  # same key, at least one value outside tolerance
+    duplicate_keys: int = 0  # repeated keys in expected rows of diffed partitions (informational)
+    partitions_skipped: int = 0  # digests equal: not diffed
+    partitions_diffed: int = 0
+    spilled: bool = False
+    missing_examples: List[Dict[str, Any]] = field(default_factory=list)
+    extra_examples: List[Dict[str, Any]] = field(default_factory=list)
+    mismatch_examples: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not (self.missing or self.extra or self.mismatched)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "passed": self.passed}
+
+    def to_finding(self, test_id: str, title: str, severity: str = "HIGH") -> Dict[str, Any]:
+        """Findings-shaped dict (category DataValidation) for a failed comparison."""
+        return {
+            "id": test_id,
+            "severity": severity if not self.passed else "INFO",
+            "category": "DataValidation",
+            "title": title,
+            "message": (
+                f"{self.expected_rows:,} expected vs {self.actual_rows:,} actual rows: {self.missing:,} missing, "
+                f"{self.extra:,} extra, {self.mismatched:,} mismatched, {self.duplicate_keys:,} duplicate keys."
+            ),
+            "recommendation": "Check filters, relationships and measure logic against the source query for the listed keys.",
+            "evidence": {
+                "missing": self.missing_examples,
+                "extra": self.extra_examples,
+                "mismatches": self.mismatch_examples,
+                "partitionsSkipped": self.partitions_skipped,
+                "partitionsDiffed": self.partitions_diffed,
+            },
+        }
+
+
+def canonical(value: Any) -> str:
+    """Type-tolerant text form: 1, 1.0 and Decimal('1.00') agree; datetimes use ISO format."""
+    kind = type(value)
+    if kind is str:
+        return value
+    if kind is int:
+        return str(value)
+    if kind is float:
+        if value.is_integer():
+            return str(int(value))
+        return repr(value)  # shortest round-trip form; nan/inf stay distinct
+    if value is None:
+        return "\x00null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, decimal.Decimal):
+        if value.is_finite() and value == value.to_integral_value():
+            return str(int(value))
+        return format(value.normalize(), "f")
+    if isinstance(value, int):  # int/float subclasses (IntEnum, numpy float64)
+        return str(int(value))
+    if isinstance(value, float):
+        return canonical(float(value))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return float(value)
+    return None
+
+
+def _partition_of(key: Key, partitions: int, salt: int) -> int:
+    return zlib.crc32("\x1f".join(key).encode("utf-8", "surrogatepass"), salt) % partitions
+
+
+def _row_hash(key: Key, values: Tuple[Any, ...]) -> int:
+    text = "\x1f".join(key) + "\x1e" + "\x1f".join(canonical(v) for v in values)
+    data = text.encode("utf-8", "surrogatepass")
+    return (zlib.crc32(data) << 32) | zlib.adler32(data)
+
+
+class _Side:
+    """Rows of one result set split into partitions, held in memory until the budget forces a spill."""
+
+    def __init__(self, name: str, partitions: int, workdir: str) -> None:
+        self.name = name
+        self.buffers: List[List[Tuple[Key, Tuple[Any, ...]]]] = [[] for _ in range(partitions)]
+        self.files: Dict[int, str] = {}
+        self.digests = [0] * partitions
+        self.counts = [0] * partitions
+        self.workdir = workdir
+        self.buffered = 0
+
+    def add(self, part: int, key: Key, values: Tuple[Any, ...]) -> None:
+        self.buffers[part].append((key, values))
+        # order-independent digest: sum of row hashes
+        self.digests[part] = (self.digests[part] + _row_hash(key, values)) & _MASK
+        self.counts[part] += 1
+        self.buffered += 1
+
+    def spill(self) -> None:
+        for part, rows in enumerate(self.buffers):
+            if not rows:
+                continue
+            path = self.files.get(part) or os.path.join(self.workdir, f"{self.name}-{part}.bin")
+            self.files[part] = path
+            with open(path, "ab") as fh:
+                pickle.dump(rows, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            self.buffers[part] = []
+        self.buffered = 0
+
+    def discard(self) -> None:
+        """Delete the spill files once their partitions have been diffed."""
+        for path in self.files.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.files.clear()
+
+    def rows(self, part: int) -> Iterator[Tuple[Key, Tuple[Any, ...]]]:
+        path = self.files.get(part)
+        if path:
+            with open(path, "rb") as fh:
+                yield from _read_batches(fh)
+        yield from self.buffers[part]
+
+
+def _read_batches(fh: IO[bytes]) -> Iterator[Tuple[Key, Tuple[Any, ...]]]:
+    while True:
+        try:
+            batch = pickle.load(fh)  # only files this module wrote
+        except EOFError:
+            return
+        yield from batch
+
+
+class StreamingComparator:
+    """
+    Compare two result sets (iterables of dict rows) on declared key columns.
+
+    Rows are routed to ``partitions`` buckets by a key hash while streaming; each side keeps
+    an order-independent digest and count per bucket. Buckets whose digests and counts agree
+    are skipped. The others are diffed one at a time: the expected rows of the bucket go into
+    a dict and the actual rows are streamed against it. When more than ``memory_rows`` rows
+    are buffered, buckets are spilled to temp files; a bucket that alone exceeds the budget is
+    re-partitioned with a different hash salt.
+    """
+
+    def __init__(self, options: CompareOptions) -> None:
+        if not options.keys:
+            raise ValueError("comparator: at least one key column is required")
+        self.options = options
+        self.result = CompareResult()
+
+    # --- row normalization ----------------------------------------------------------------
+
+    def _names(self, mapped: bool, columns: Sequence[str]) -> Tuple[List[str], List[str]]:
+        """Key and value column names as they appear in rows of one side (actual rows use column_map)."""
+        if not mapped or not self.options.column_map:
+            return list(self.options.keys), list(columns)
+        inverse = {v: k for k, v in self.options.column_map.items()}
+        return [inverse.get(k, k) for k in self.options.keys], [inverse.get(c, c) for c in columns]
+
+    @staticmethod
+    def _split(row: Row, key_names: Sequence[str], value_names: Sequence[str], side: str) -> Tuple[Key, Tuple[Any, ...]]:
+        try:
+            key = tuple([canonical(row[k]) for k in key_names])
+        except KeyError as e:
+            raise ValueError(f"comparator: key column {e.args[0]!r} missing from {side} row") from None
+        return key, tuple([row.get(c) for c in value_names])
+
+    def _equal(self, column: str, a: Any, b: Any) -> bool:
+        na, nb = _number(a), _number(b)
+        if na is not None and nb is not None:
+            if not (math.isfinite(na) and math.isfinite(nb)):
+                # inf/nan never fall within a tolerance: equal only to the same infinity or to NaN
+                return (math.isnan(na) and math.isnan(nb)) or na == nb
+            tol = self.options.column_tolerances.get(column, self.options.abs_tolerance)
+            tol = max(tol, self.options.rel_tolerance * max(abs(na), abs(nb)))
+            return abs(na - nb) <= tol
+        return canonical(a) == canonical(b)
+
+    # --- main entry -----------------------------------------------------------------------
+
+    def compare(self, expected: Iterable[Row], actual: Iterable[Row]) -> CompareResult:
+        opts = self.options
+        res = self.result
+        exp_iter = iter(expected)
+        first = next(exp_iter, None)
+        columns = list(opts.columns) if opts.columns else [c for c in (first or {}) if c not in opts.keys]
+        with tempfile.TemporaryDirectory(prefix="dv-compare-", dir=opts.spill_dir) as workdir:
+            exp = _Side("expected", opts.partitions, workdir)
+            act = _Side("actual", opts.partitions, workdir)
+            rows = ([first] if first is not None else [])
+            for side, source, mapped in ((exp, _chain(rows, exp_iter), False), (act, iter(actual), True)):
+                key_names, value_names = self._names(mapped, columns)
+                for row in source:
+                    key, values = self._split(row, key_names, value_names, side.name)
+                    side.add(_partition_of(key, opts.partitions, 0), key, values)
+                    if exp.buffered + act.buffered > opts.memory_rows:
+                        exp.spill()
+                        act.spill()
+                        res.spilled = True
+            res.expected_rows, res.actual_rows = sum(exp.counts), sum(act.counts)
+
+            for part in range(opts.partitions):
+                if exp.counts[part] == act.counts[part] and exp.digests[part] == act.digests[part]:
+                    res.partitions_skipped += 1
+                    res.matched += exp.counts[part]
+                    continue
+                res.partitions_diffed += 1
+                self._diff(exp.rows(part), act.rows(part), exp.counts[part], columns, workdir, depth=1, path=str(part))
+        return res
+
+    def _diff(
+        self,
+        expected: Iterable[Tuple[Key, Tuple[Any, ...]]],
+        actual: Iterable[Tuple[Key, Tuple[Any, ...]]],
+        expected_count: int,
+        columns: Sequence[str],
+        workdir: str,
+        depth: int,
+        path: str = "0",
+    ) -> None:
+        opts = self.options
+        if expected_count > opts.memory_rows and depth <= _MAX_DEPTH:
+            # too big for memory: split this bucket again with a new salt, spilling every row;
+            # spill files are named by the bucket path so sibling buckets never share a file
+            sub_exp = _Side(f"expected-d{depth}-p{path}", opts.partitions, workdir)
+            sub_act = _Side(f"actual-d{depth}-p{path}", opts.partitions, workdir)
+            for side, rows in ((sub_exp, expected), (sub_act, actual)):
+                for key, values in rows:
+                    side.add(_partition_of(key, opts.partitions, depth), key, values)
+                    if side.buffered > opts.memory_rows // 2:
+                        side.spill()
+                side.spill()
+            for part in range(opts.partitions):
+                if sub_exp.counts[part] == sub_act.counts[part] and sub_exp.digests[part] == sub_act.digests[part]:
+                    self.result.matched += sub_exp.counts[part]
+                    continue
+                self._diff(sub_exp.rows(part), sub_act.rows(part), sub_exp.counts[part], columns, workdir, depth + 1, f"{path}.{part}")
+            sub_exp.discard()
+            sub_act.discard()
+            return
+
+        res = self.result
+        pending: Dict[Key, List[Tuple[Any, ...]]] = {}
+        for key, values in expected:
+            bucket = pending.setdefault(key, [])
+            if bucket:
+                res.duplicate_keys += 1
+            bucket.append(values)
+        for key, values in actual:
+            bucket = pending.get(key)
+            if not bucket:
+                res.extra += 1
+                self._example(res.extra_examples, {"key": dict(zip(opts.keys, key))})
+                continue
+            expected_values = bucket.pop()
+            if not bucket:
+                del pending[key]
+            diffs = [
+                {"column": c, "expected": a, "actual": b}
+                for c, a, b in zip(columns, expected_values, values)
+                if not self._equal(c, a, b)
+            ]
+            if diffs:
+                res.mismatched += 1
+                self._example(res.mismatch_examples, {"key": dict(zip(opts.keys, key)), "diffs": diffs[:10]})
+            else:
+                res.matched += 1
+        for key, bucket in pending.items():
+            res.missing += len(bucket)
+            self._example(res.missing_examples, {"key": dict(zip(opts.keys, key))})
+
+    def _example(self, target: List[Dict[str, Any]], item: Dict[str, Any]) -> None:
+        if len(target) < self.options.max_examples:
+            target.append(item)
+
+
+def _chain(head: List[Row], tail: Iterator[Row]) -> Iterator[Row]:
+    yield from head
+    yield from tail
+
+
+def compare_results(expected: Iterable[Row], actual: Iterable[Row], options: CompareOptions) -> CompareResult:
+    return StreamingComparator(options).compare(expected, actual)
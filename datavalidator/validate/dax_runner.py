@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import decimal
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from datavalidator.core.cache import file_digest
+
+Row = Dict[str, Any]
+# (column names, row tuples) as returned by a transport session
+RawResult = Tuple[List[str], Iterator[Sequence[Any]]]
+
+DEFAULT_BATCH_SIZE = 25
+_MEMORY_ROWS = 10_000  # results up to this size are also kept in the in-process LRU
+_MODEL_SUFFIXES = (".tmdl", ".bim", ".pbism", ".json")
+_RE_DAX_LITERAL = re.compile(r'"(?:[^"]|"")*"|\'(?:[^\']|\'\')*\'|\[[^\]]*\]')
+_RE_WS = re.compile(r"\s+")
+
+
+class DaxQueryError(RuntimeError):
+    pass
+
+
+def normalize_query(text: str) -> str:
+    """Whitespace-insensitive form of a DAX query; string literals and [names]/'tables' are kept verbatim."""
+    out: List[str] = []
+    pos = 0
+    for m in _RE_DAX_LITERAL.finditer(text):
+        out.append(_RE_WS.sub(" ", text[pos:m.start()]))
+        out.append(m.group(0))
+        pos = m.end()
+    out.append(_RE_WS.sub(" ", text[pos:]))
+    return "".join(out).strip()
+
+
+def model_version(model_dir: Path) -> str:
+    """Content hash of a semantic model definition (TMDL/BIM files); local .pbi settings and caches are ignored."""
+    h = hashlib.blake2b(digest_size=16)
+    files = sorted(
+        p for p in Path(model_dir).rglob("*")
+        if p.is_file() and p.suffix.lower() in _MODEL_SUFFIXES and ".pbi" not in p.relative_to(model_dir).parts
+    )
+    for p in files:
+        h.update(p.relative_to(model_dir).as_posix().encode("utf-8"))
+        h.update(file_digest(p).encode("ascii"))
+    return h.hexdigest()
+
+
+class DaxSession:
+    """One open connection. ``execute`` may be called many times before ``close``."""
+
+    def execute(self, query: str) -> RawResult:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class DaxTransport:
+    """
+    Opens sessions against a semantic model. An XMLA/ADOMD client implements ``open``;
+    ``FixtureTransport`` answers from local files.
+    """
+
+    name = "dax"
+
+    def open(self) -> DaxSession:
+        raise NotImplementedError
+
+
+class FixtureTransport(DaxTransport):
+    """
+    Stand-in for a live endpoint: every ``*.jsonl`` file under ``fixture_dir`` answers one query.
+    The first line is a header ``{"query": "EVALUATE ...", "columns": [...]}``; each further
+    line is a row, either a JSON array (in column order) or an object.
+    """
+
+    name = "fixture"
+
+    def __init__(self, fixture_dir: Path) -> None:
+        self.fixture_dir = Path(fixture_dir)
+        self._index: Optional[Dict[str, Tuple[Path, List[str]]]] = None
+        self._lock = threading.Lock()
+
+    def _load_index(self) -> Dict[str, Tuple[Path, List[str]]]:
+        with self._lock:
+            if self._index is None:
+                index: Dict[str, Tuple[Path, List[str]]] = {}
+                for p in sorted(self.fixture_dir.rglob("*.jsonl")):
+                    with p.open("r", encoding="utf-8") as fh:
+                        header = json.loads(fh.readline() or "{}")
+                    if isinstance(header, dict) and header.get("query"):
+                        index[normalize_query(str(header["query"]))] = (p, list(header.get("columns") or []))
+                self._index = index
+            return self._index
+
+    def open(self) -> DaxSession:
+        return _FixtureSession(self._load_index())
+
+
+class _FixtureSession(DaxSession):
+    def __init__(self, index: Dict[str, Tuple[Path, List[str]]]) -> None:
+        self._index = index
+
+    def execute(self, query: str) -> RawResult:
+        hit = self._index.get(normalize_query(query))
+        if hit is None:
+            raise DaxQueryError("no fixture answers this query")
+        path, columns = hit
+        if not columns:
+            with path.open("r", encoding="utf-8") as fh:
+                fh.readline()
+                first = fh.readline()
+            if first.strip().startswith("{"):
+                columns = list(json.loads(first))
+        return columns, _fixture_rows(path, columns)
+
+
+def _fixture_rows(path: Path, columns: List[str]) -> Iterator[Sequence[Any]]:
+    with path.open("r", encoding="utf-8") as fh:
+        fh.readline()
+        for line in fh:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            yield [row.get(c) for c in columns] if isinstance(row, dict) else row
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
+
+class ResultCache:
+    """
+    DAX results keyed by (model version, normalized query). Small results stay in an in-process
+    LRU; with ``cache_dir`` every completed result is also written as JSON lines and streamed
+    back from disk on later runs. A result is only stored once it was read to the end.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 64, memory_rows: int = _MEMORY_ROWS) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self.memory_rows = memory_rows
+        self._memory: "OrderedDict[str, Tuple[List[str], List[Sequence[Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(version: str, query: str) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(version.encode("utf-8"))
+        h.update(b"\x00")
+        h.update(normalize_query(query).encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Optional[Path]:
+        return self.cache_dir / key[:2] / f"{key}.jsonl" if self.cache_dir else None
+
+    def get(self, key: str) -> Optional[RawResult]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0], iter(entry[1])
+        path = self._path(key)
+        if path is not None and path.exists():
+            with path.open("r", encoding="utf-8") as fh:
+                columns = json.loads(fh.readline())["columns"]
+            with self._lock:
+                self.hits += 1
+            return columns, _fixture_rows(path, columns)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def record(self, key: str, columns: List[str], rows: Iterator[Sequence[Any]]) -> Iterator[Sequence[Any]]:
+        """Pass ``rows`` through while storing them; the entry is committed when the iterator is exhausted."""
+        kept: Optional[List[Sequence[Any]]] = []
+        path = self._path(key)
+        fh = tmp = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".dv-", suffix=".tmp", dir=path.parent)
+            fh = os.fdopen(fd, "w", encoding="utf-8")
+            fh.write(json.dumps({"columns": columns}) + "\n")
+        completed = False
+        try:
+            for row in rows:
+                if fh is not None:
+                    fh.write(json.dumps(list(row), default=_json_value) + "\n")
+                if kept is not None:
+                    kept.append(row)
+                    if len(kept) > self.memory_rows:
+                        kept = None
+                yield row
+            completed = True
+        finally:
+            if fh is not None:
+                fh.close()
+                if completed:
+                    os.replace(tmp, path)
+                else:
+                    os.unlink(tmp)
+        if kept is not None:
+            with self._lock:
+                self._memory[key] = (columns, kept)
+                self._memory.move_to_end(key)
+                while len(self._memory) > self.max_entries:
+                    self._memory.popitem(last=False)
+
+
+@dataclass
+class DaxQuery:
+    id: str
+    query: str
+
+
+@dataclass
+class DaxQueryResult:
+    id: str
+    rows: int = 0
+    columns: List[str] = field(default_factory=list)
+    cached: bool = False
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+    output: Any = None  # what the consumer returned (e.g. a CompareResult)
+
+
+class DaxRunner:
+    """
+    Runs DAX test queries through a transport. Uncached queries are sent in batches of
+    ``batch_size`` over one session each; results are cached per model version so re-running
+    unchanged tests against an unchanged model never reaches the endpoint.
+    """
+
+    def __init__(
+        self,
+        transport: DaxTransport,
+        model_version: str,
+        cache: Optional[ResultCache] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self.transport = transport
+        self.model_version = model_version
+        self.cache = cache if cache is not None else ResultCache()
+        self.batch_size = max(1, batch_size)
+
+    def _execute(self, session: DaxSession, query: DaxQuery) -> Tuple[List[str], Iterator[Row], bool]:
+        key = ResultCache.key(self.model_version, query.query)
+        hit = self.cache.get(key)
+        if hit is not None:
+            columns, raw = hit
+            cached = True
+        else:
+            columns, raw = session.execute(query.query)
+            raw = self.cache.record(key, columns, raw)
+            cached = False
+        return columns, (dict(zip(columns, r)) for r in raw), cached
+
+    def stream(self, query: DaxQuery) -> Tuple[List[str], Iterator[Row]]:
+        """(columns, dict rows) for one query; opens a session only on a cache miss."""
+        session = _LazySession(self.transport)
+        try:
+            columns, rows, _ = self._execute(session, query)
+        except BaseException:
+            session.close()
+            raise
+        return columns, _closing(rows, session)
+
+    def run_batch(
+        self,
+        queries: Sequence[DaxQuery],
+        consumer: Optional[Callable[[DaxQuery, Iterator[Row]], Any]] = None,
+    ) -> List[DaxQueryResult]:
+        """Run queries in order, ``batch_size`` per session; each result is streamed to ``consumer``."""
+        results: List[DaxQueryResult] = []
+        for start in range(0, len(queries), self.batch_size):
+            session = _LazySession(self.transport)
+            try:
+                for q in queries[start:start + self.batch_size]:
+                    results.append(self._run_one(session, q, consumer))
+            finally:
+                session.close()
+        return results
+
+    def _run_one(
+        self, session: DaxSession, query: DaxQuery, consumer: Optional[Callable[[DaxQuery, Iterator[Row]], Any]],
+    ) -> DaxQueryResult:
+        result = DaxQueryResult(id=query.id)
+        begin = time.perf_counter()
+        try:
+            columns, rows, result.cached = self._execute(session, query)
+            result.columns = columns
+            counted = _Counted(rows)
+            if consumer is not None:
+                result.output = consumer(query, counted)
+            for _ in counted:  # drain so the cache entry completes
+                pass
+            result.rows = counted.count
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.elapsed_ms = round((time.perf_counter() - begin) * 1000, 2)
+        return result
+
+
+class _LazySession(DaxSession):
+    """Opens the transport session on first use, so a fully cached batch never connects."""
+
+    def __init__(self, transport: DaxTransport) -> None:
+        self._transport = transport
+        self._session: Optional[DaxSession] = None
+
+    def execute(self, query: str) -> RawResult:
+        if self._session is None:
+            self._session = self._transport.open()
+        return self._session.execute(query)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+def _closing(rows: Iterator[Row], session: DaxSession) -> Iterator[Row]:
+    try:
+        yield from rows
+    finally:
+        session.close()
+
+
+class _Counted:
+    def __init__(self, rows: Iterator[Row]) -> None:
+        self._rows = rows
+        self.count = 0
+
+    def __iter__(self) -> "_Counted":
+        return self
+
+    def __next__(self) -> Row:
+        row = next(self._rows)
+        self.count += 1
+        return row
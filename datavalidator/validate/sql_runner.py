@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from datavalidator.validate.comparator import CompareOptions, CompareResult, compare_results
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_TIMEOUT_S = 120.0
+
+
+class QueryTimeout(RuntimeError):
+    pass
+
+
+class PoolExhausted(RuntimeError):
+    pass
+
+
+class SqlBackend:
+    """
+    DB-API 2.0 connection factory. ``interrupt`` cancels the statement running on a connection
+    from another thread; backends without a cancel call leave it as a no-op and the runner
+    falls back to checking the deadline between ``fetchmany`` batches.
+    """
+
+    name = "dbapi"
+
+    def __init__(self, connect: Callable[[], Any], interrupt: Optional[Callable[[Any], None]] = None, name: str = "dbapi") -> None:
+        self._connect = connect
+        self._interrupt = interrupt
+        self.name = name
+
+    def connect(self) -> Any:
+        return self._connect()
+
+    def interrupt(self, conn: Any) -> None:
+        if self._interrupt is not None:
+            self._interrupt(conn)
+
+    def is_timeout_error(self, exc: BaseException) -> bool:
+        return False
+
+    def close(self) -> None:
+        """Release backend-level resources (pooled connections are closed by the pool)."""
+
+
+class SqliteBackend(SqlBackend):
+    """
+    Reference backend. ``database`` is a file path or a ``file:`` URI; the default is a shared
+    in-memory database named per instance, so every pooled connection of this backend sees the
+    same tables and other backends do not. ``init_sql`` runs once, on the first connection
+    (fixtures for offline runs).
+    """
+
+    name = "sqlite"
+
+    def __init__(self, database: Optional[str] = None, init_sql: Optional[str] = None) -> None:
+        self.database = database or f"file:dv-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self.init_sql = init_sql
+        self._init_lock = threading.Lock()
+        self._initialized = init_sql is None
+        self._keepalive: Optional[sqlite3.Connection] = None  # a shared in-memory db lives while one connection is open
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.database, uri=self.database.startswith("file:"), check_same_thread=False)
+        with self._init_lock:
+            if self._keepalive is None and "mode=memory" in self.database:
+                self._keepalive = sqlite3.connect(self.database, uri=True, check_same_thread=False)
+            if not self._initialized:
+                try:
+                    conn.executescript(self.init_sql or "")
+                    conn.commit()
+                except Exception:
+                    _close_quietly(conn)
+                    raise
+                self._initialized = True
+        return conn
+
+    def close(self) -> None:
+        with self._init_lock:
+            if self._keepalive is not None:
+                _close_quietly(self._keepalive)
+                self._keepalive = None
+
+    def interrupt(self, conn: Any) -> None:
+        conn.interrupt()
+
+    def is_timeout_error(self, exc: BaseException) -> bool:
+        return isinstance(exc, sqlite3.OperationalError) and "interrupted" in str(exc)
+
+
+class ConnectionPool:
+    """Up to ``size`` connections, created lazily and reused; a connection that raised is discarded."""
+
+    def __init__(self, backend: SqlBackend, size: int = 4, acquire_timeout: float = 60.0) -> None:
+        self.backend = backend
+        self.size = max(1, size)
+        self.acquire_timeout = acquire_timeout
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise PoolExhausted(f"no {self.backend.name} connection free after {self.acquire_timeout}s")
+        conn = None
+        healthy = False
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self.backend.connect()
+                with self._lock:
+                    self._created += 1
+            yield conn
+            healthy = True
+        finally:
+            if conn is not None:
+                if healthy:
+                    self._idle.put(conn)
+                else:
+                    _close_quietly(conn)
+                    with self._lock:
+                        self._created -= 1
+            self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                _close_quietly(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+@dataclass
+class SqlQuery:
+    id: str
+    sql: str
+    params: Optional[Sequence[Any]] = None
+    timeout_s: Optional[float] = None
+
+
+@dataclass
+class SqlQueryResult:
+    id: str
+    rows: int = 0
+    columns: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    timed_out: bool = False
+    error: Optional[str] = None
+    output: Any = None  # what the consumer returned (e.g. a CompareResult)
+
+
+class SqlRunner:
+    """
+    Runs validation queries on a pooled backend, ``max_concurrency`` at a time. Results are
+    streamed as dict rows in ``fetchmany(batch_size)`` batches, so a consumer such as the
+    comparator never needs the whole result set in memory. Each query has a deadline that
+    covers execution and fetching.
+    """
+
+    def __init__(
+        self,
+        backend: SqlBackend,
+        pool_size: int = 4,
+        max_concurrency: int = 4,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        default_timeout_s: float = DEFAULT_TIMEOUT_S,
+    ) -> None:
+        self.backend = backend
+        self.pool = ConnectionPool(backend, size=pool_size)
+        self.max_concurrency = max(1, min(max_concurrency, pool_size))
+        self.batch_size = max(1, batch_size)
+        self.default_timeout_s = default_timeout_s
+
+    @contextmanager
+    def stream(self, query: SqlQuery) -> Iterator[Tuple[List[str], Iterator[Dict[str, Any]]]]:
+        """``with runner.stream(q) as (columns, rows):`` holds one pooled connection until the block exits."""
+        timeout = query.timeout_s if query.timeout_s is not None else self.default_timeout_s
+        deadline = time.monotonic() + timeout
+        with self.pool.connection() as conn:
+            fired = threading.Event()
+
+            def _cancel() -> None:
+                fired.set()
+                self.backend.interrupt(conn)
+
+            timer = threading.Timer(timeout, _cancel)
+            timer.daemon = True
+            timer.start()
+            cursor = conn.cursor()
+            try:
+                try:
+                    cursor.execute(query.sql, tuple(query.params or ()))
+                except Exception as e:
+                    if fired.is_set() or self.backend.is_timeout_error(e):
+                        raise QueryTimeout(f"{query.id}: exceeded {timeout}s") from None
+                    raise
+                columns = [d[0] for d in cursor.description or []]
+                yield columns, self._rows(query, cursor, columns, deadline, timeout, fired)
+            finally:
+                timer.cancel()
+                _close_quietly(cursor)
+
+    def _rows(
+        self, query: SqlQuery, cursor: Any, columns: List[str], deadline: float, timeout: float, fired: threading.Event,
+    ) -> Iterator[Dict[str, Any]]:
+        while True:
+            if fired.is_set() or time.monotonic() > deadline:
+                raise QueryTimeout(f"{query.id}: exceeded {timeout}s")
+            try:
+                batch = cursor.fetchmany(self.batch_size)
+            except Exception as e:
+                if fired.is_set() or self.backend.is_timeout_error(e):
+                    raise QueryTimeout(f"{query.id}: exceeded {timeout}s") from None
+                raise
+            if not batch:
+                return
+            for row in batch:
+                yield dict(zip(columns, row))
+
+    def run(self, query: SqlQuery, consumer: Optional[Callable[[Iterator[Dict[str, Any]]], Any]] = None) -> SqlQueryResult:
+        """Run one query and feed its rows to ``consumer`` (rows are counted and dropped when omitted)."""
+        result = SqlQueryResult(id=query.id)
+        start = time.perf_counter()
+        try:
+            with self.stream(query) as (columns, rows):
+                result.columns = columns
+                counted = _Counted(rows)
+                if consumer is not None:
+                    result.output = consumer(counted)
+                for _ in counted:  # drain what the consumer left, so the count is complete
+                    pass
+                result.rows = counted.count
+        except QueryTimeout as e:
+            result.timed_out = True
+            result.error = str(e)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    def run_many(
+        self,
+        queries: Sequence[SqlQuery],
+        consumer: Optional[Callable[[SqlQuery, Iterator[Dict[str, Any]]], Any]] = None,
+    ) -> List[SqlQueryResult]:
+        """Run queries in parallel (bounded by ``max_concurrency``); results keep the input order."""
+        def one(q: SqlQuery) -> SqlQueryResult:
+            return self.run(q, (lambda rows: consumer(q, rows)) if consumer else None)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="dv-sql") as pool:
+            return list(pool.map(one, queries))
+
+    def compare(self, query: SqlQuery, actual_rows: Any, options: CompareOptions) -> Tuple[SqlQueryResult, Optional[CompareResult]]:
+        """Stream the query result (expected side) into the comparator against ``actual_rows``."""
+        result = self.run(query, lambda rows: compare_results(rows, actual_rows, options))
+        return result, result.output
+
+    def close(self) -> None:
+        self.pool.close()
+        self.backend.close()
+
+
+class _Counted:
+    """Iterator wrapper that counts rows as the consumer pulls them."""
+
+    def __init__(self, rows: Iterator[Dict[str, Any]]) -> None:
+        self._rows = rows
+        self.count = 0
+
+    def __iter__(self) -> "_Counted":
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        row = next(self._rows)
+        self.count += 1
+        return row
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from datavalidator.core.cache import FileCache, file_digest
+from datavalidator.validate.comparator import CompareOptions
+from datavalidator.validate.dax_runner import normalize_query
+from datavalidator.validate.tests_schema import TEST_FILE_SUFFIX, TestSpec, TestSuite, validate_suite
+
+# Folders that never hold test files (tool caches, VCS metadata, run output)
+_SKIP_DIRS = {".pbi", ".git", ".venv", "node_modules", "output", "__pycache__"}
+_PLAN_CACHE_SIZE = 16
+
+
+@dataclass
+class PlannedQuery:
+    """One distinct query on one source; ``tests`` lists every test that reads its result."""
+
+    id: str
+    source: str
+    language: str  # sql | dax
+    text: str
+    tests: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PlannedTest:
+    id: str
+    type: str
+    file: str
+    title: str
+    severity: str
+    expect: str  # "match": expected and actual results agree; "empty": the query returns no rows
+    expected: Optional[str] = None  # query id (SQL side for reconciliations)
+    actual: Optional[str] = None  # query id (DAX side)
+    keys: List[str] = field(default_factory=list)
+    column_map: Dict[str, str] = field(default_factory=dict)
+    abs_tolerance: float = 0.0
+    rel_tolerance: float = 0.0
+    column_tolerances: Dict[str, float] = field(default_factory=dict)
+
+    def compare_options(self, **overrides: Any) -> CompareOptions:
+        return CompareOptions(
+            keys=list(self.keys),
+            column_map=dict(self.column_map),
+            abs_tolerance=self.abs_tolerance,
+            rel_tolerance=self.rel_tolerance,
+            column_tolerances=dict(self.column_tolerances),
+            **overrides,
+        )
+
+
+@dataclass
+class ExecutionPlan:
+    digest: str
+    files: List[str]
+    sources: Dict[str, Dict[str, Any]]
+    queries: Dict[str, List[PlannedQuery]]  # source name -> distinct queries, run as one batch
+    tests: List[PlannedTest]
+    errors: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "digest": self.digest,
+            "files": self.files,
+            "sources": self.sources,
+            "queries": {s: [q.__dict__ for q in qs] for s, qs in self.queries.items()},
+            "tests": [t.__dict__ for t in self.tests],
+            "errors": self.errors,
+            "stats": {
+                "tests": len(self.tests),
+                "queries": sum(len(qs) for qs in self.queries.values()),
+                "queryReferences": sum(len(q.tests) for qs in self.queries.values() for q in qs),
+            },
+        }
+
+
+def discover_test_files(project_root: Path) -> List[Path]:
+    """Every ``*.dvtests.json`` under the project, in a stable order."""
+    found: List[Path] = []
+
+    def walk(folder: Path) -> None:
+        for child in sorted(folder.iterdir(), key=lambda p: p.name):
+            if child.is_dir():
+                if child.name not in _SKIP_DIRS:
+                    walk(child)
+            elif child.name.lower().endswith(TEST_FILE_SUFFIX):
+                found.append(child)
+
+    walk(Path(project_root))
+    return found
+
+
+# --- query generation --------------------------------------------------------------------
+
+def _dax_table(name: str) -> str:
+    return "'" + name.replace("'", "''") + "'"
+
+
+def _dax_column(table: str, column: str) -> str:
+    return f"{_dax_table(table)}[{column.replace(']', ']]')}]"
+
+
+def _row_count_queries(t: TestSpec) -> Tuple[str, str, List[str], Dict[str, str]]:
+    """(sql, dax, keys, column_map) comparing row counts of a model table and its warehouse table."""
+    table = t.table or ""
+    if t.partition_by:
+        alias = t.partition_by
+        sql = f"SELECT {t.sql_partition_by} AS \"{alias}\", COUNT(*) AS \"RowCount\" FROM {t.sql_table} GROUP BY {t.sql_partition_by}"
+        dax = f"EVALUATE SUMMARIZECOLUMNS({_dax_column(table, alias)}, \"RowCount\", COUNTROWS({_dax_table(table)}))"
+        return sql, dax, [alias], {f"{table}[{alias}]": alias, "[RowCount]": "RowCount"}
+    sql = f"SELECT 'all' AS \"Partition\", COUNT(*) AS \"RowCount\" FROM {t.sql_table}"
+    dax = f"EVALUATE ROW(\"Partition\", \"all\", \"RowCount\", COUNTROWS({_dax_table(table)}))"
+    return sql, dax, ["Partition"], {"[Partition]": "Partition", "[RowCount]": "RowCount"}
+
+
+def _duplicate_keys_query(t: TestSpec, language: str) -> str:
+    table = t.table or ""
+    if language == "dax":
+        cols = ", ".join(_dax_column(table, k) for k in t.keys)
+        return f"EVALUATE FILTER(SUMMARIZECOLUMNS({cols}, \"Occurrences\", COUNTROWS({_dax_table(table)})), [Occurrences] > 1)"
+    cols = ", ".join(t.keys)
+    return f"SELECT {cols}, COUNT(*) AS \"Occurrences\" FROM {table} GROUP BY {cols} HAVING COUNT(*) > 1"
+
+
+class _QueryBook:
+    """Deduplicates queries per source on their normalized text."""
+
+    def __init__(self) -> None:
+        self.by_source: Dict[str, Dict[str, PlannedQuery]] = {}
+
+    def add(self, source: str, language: str, text: str, test_id: str) -> str:
+        norm = normalize_query(text)
+        bucket = self.by_source.setdefault(source, {})
+        planned = bucket.get(norm)
+        if planned is None:
+            qid = "q" + hashlib.blake2b(f"{source}\x00{norm}".encode("utf-8"), digest_size=6).hexdigest()
+            planned = bucket[norm] = PlannedQuery(id=qid, source=source, language=language, text=text)
+        planned.tests.append(test_id)
+        return planned.id
+
+
+def compile_plan(suites: List[TestSuite], errors: List[str], digest: str = "") -> ExecutionPlan:
+    """Turn validated suites into per-source query batches plus the tests that consume them."""
+    book = _QueryBook()
+    sources: Dict[str, Dict[str, Any]] = {}
+    tests: List[PlannedTest] = []
+    owner: Dict[str, str] = {}
+    errors = list(errors)
+    for suite in suites:
+        for name, spec in suite.sources.items():
+            if name in sources and sources[name] != spec:
+                errors.append(f"{suite.file}: source '{name}' differs from its declaration in another file; the first one is used")
+                continue
+            sources.setdefault(name, spec)
+        for t in suite.tests:
+            if t.id in owner:
+                errors.append(f"{t.file}: test '{t.id}' is already declared in {owner[t.id]}")
+                continue
+            owner[t.id] = t.file
+            planned = PlannedTest(
+                id=t.id, type=t.type, file=t.file, title=t.title, severity=t.severity, expect="match",
+                keys=list(t.keys), column_map=dict(t.column_map), abs_tolerance=t.abs_tolerance,
+                rel_tolerance=t.rel_tolerance, column_tolerances=dict(t.column_tolerances),
+            )
+            if t.type == "measureVsSql" and t.sql and t.dax:
+                planned.expected = book.add(t.sql.source, "sql", t.sql.query, t.id)
+                planned.actual = book.add(t.dax.source, "dax", t.dax.query, t.id)
+            elif t.type == "rowCount":
+                sql, dax, keys, column_map = _row_count_queries(t)
+                planned.expected = book.add(t.source or "", "sql", sql, t.id)
+                planned.actual = book.add(t.model_source or "", "dax", dax, t.id)
+                planned.keys, planned.column_map = keys, column_map
+            elif t.type == "keyUnique":
+                language = str(sources.get(t.source or "", suite.sources.get(t.source or "", {})).get("type") or "sql")
+                planned.expect = "empty"
+                planned.actual = book.add(t.source or "", language, _duplicate_keys_query(t, language), t.id)
+            tests.append(planned)
+    return ExecutionPlan(
+        digest=digest,
+        files=sorted({s.file for s in suites}),
+        sources=sources,
+        queries={s: list(b.values()) for s, b in sorted(book.by_source.items())},
+        tests=tests,
+        errors=errors,
+    )
+
+
+# --- loading and caching -----------------------------------------------------------------
+
+def _parse_file(path: Path, label: str) -> Tuple[Optional[TestSuite], List[str]]:
+    try:
+        doc = json.loads(path.read_text(encoding="utf-8-sig"))
+    except (OSError, ValueError) as e:
+        return None, [f"{label}: {e}"]
+    return validate_suite(doc, label)
+
+
+class TestPlanLoader:
+    """
+    Discovers, validates and compiles a project's test files. Each file is validated once per
+    content (``FileCache``); the compiled plan is reused while the set of file hashes is unchanged.
+    """
+
+    __test__ = False  # not a pytest class despite the name
+
+    def __init__(self, file_cache: Optional[FileCache] = None, max_plans: int = _PLAN_CACHE_SIZE) -> None:
+        self.file_cache = file_cache or FileCache()
+        self.max_plans = max_plans
+        self._plans: "OrderedDict[str, ExecutionPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, project_root: Path) -> ExecutionPlan:
+        root = Path(project_root)
+        files = discover_test_files(root)
+        h = hashlib.blake2b(digest_size=16)
+        for p in files:
+            h.update(p.relative_to(root).as_posix().encode("utf-8"))
+            h.update(file_digest(p).encode("ascii"))
+        digest = h.hexdigest()
+        with self._lock:
+            plan = self._plans.get(digest)
+            if plan is not None:
+                self._plans.move_to_end(digest)
+                return plan
+
+        suites: List[TestSuite] = []
+        errors: List[str] = []
+        for p in files:
+            rel = p.relative_to(root).as_posix()
+            suite, problems = self.file_cache.get(p, "dvtests", lambda fp: _parse_file(fp, rel))
+            errors.extend(problems)
+            if suite is not None:
+                suites.append(suite)
+        plan = compile_plan(suites, errors, digest)
+        plan.files = [p.relative_to(root).as_posix() for p in files]
+        with self._lock:
+            self._plans[digest] = plan
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return plan
+
+
+def iter_plan_queries(plan: ExecutionPlan, language: str) -> Iterator[Tuple[str, List[PlannedQuery]]]:
+    """(source, queries) batches for one query language."""
+    for source, queries in plan.queries.items():
+        if (plan.sources.get(source) or {}).get("type") == language:
+            yield source, queries
+
+
+def load_test_plan(project_root: Path) -> ExecutionPlan:
+    return _DEFAULT_LOADER.load(project_root)
+
+
+_DEFAULT_LOADER = TestPlanLoader()
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEMA_VERSION = 1
+TEST_FILE_SUFFIX = ".dvtests.json"
+
+TEST_TYPES = ("measureVsSql", "rowCount", "keyUnique")
+SOURCE_TYPES = ("sql", "dax")
+_SEVERITIES = ("HIGH", "MED", "LOW", "INFO")
+DEFAULT_SQL_SOURCE = "sql"
+DEFAULT_DAX_SOURCE = "model"
+
+
+@dataclass
+class QuerySpec:
+    source: str
+    query: str
+
+
+@dataclass
+class TestSpec:
+    """One declared reconciliation test, after validation and defaulting."""
+
+    id: str
+    type: str
+    file: str
+    title: str
+    severity: str = "HIGH"
+    sql: Optional[QuerySpec] = None  # measureVsSql
+    dax: Optional[QuerySpec] = None  # measureVsSql
+    source: Optional[str] = None  # rowCount: SQL source; keyUnique: source holding the table
+    model_source: Optional[str] = None  # rowCount: DAX source
+    table: Optional[str] = None  # rowCount: model table; keyUnique: table on ``source``
+    sql_table: Optional[str] = None  # rowCount: warehouse table
+    partition_by: Optional[str] = None  # rowCount: model column; counts are compared per value
+    sql_partition_by: Optional[str] = None  # rowCount: SQL expression for the same partition
+    keys: List[str] = field(default_factory=list)
+    column_map: Dict[str, str] = field(default_factory=dict)
+    abs_tolerance: float = 0.0
+    rel_tolerance: float = 0.0
+    column_tolerances: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class TestSuite:
+    file: str
+    sources: Dict[str, Dict[str, Any]]
+    tests: List[TestSpec]
+
+
+def _str_list(value: Any) -> Optional[List[str]]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(v, str) and v for v in value):
+        return list(value)
+    return None
+
+
+def _number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+
+def _query(value: Any, default_source: str, where: str, errors: List[str]) -> Optional[QuerySpec]:
+    if isinstance(value, str) and value.strip():
+        return QuerySpec(default_source, value)
+    if isinstance(value, dict) and isinstance(value.get("query"), str) and value["query"].strip():
+        return QuerySpec(str(value.get("source") or default_source), value["query"])
+    errors.append(f"{where}: expected a query string or {{\"source\", \"query\"}}")
+    return None
+
+
+def validate_suite(doc: Any, file: str) -> Tuple[Optional[TestSuite], List[str]]:
+    """
+    Check one parsed test file. Returns the suite (None when the file is unusable) and every
+    problem found; individual invalid tests are dropped and reported, valid ones are kept.
+
+    Shape::
+
+        {"version": 1,
+         "sources": {"warehouse": {"type": "sql", ...}, "model": {"type": "dax"}},
+         "defaults": {"sqlSource": "warehouse", "daxSource": "model", "absTolerance": 0.01},
+         "tests": [{"id": "...", "type": "measureVsSql" | "rowCount" | "keyUnique", ...}]}
+    """
+    errors: List[str] = []
+    if not isinstance(doc, dict):
+        return None, [f"{file}: top level must be an object"]
+    version = doc.get("version", SCHEMA_VERSION)
+    if version != SCHEMA_VERSION:
+        return None, [f"{file}: unsupported version {version!r} (expected {SCHEMA_VERSION})"]
+
+    sources: Dict[str, Dict[str, Any]] = {}
+    for name, spec in (doc.get("sources") or {}).items():
+        if not isinstance(spec, dict) or spec.get("type") not in SOURCE_TYPES:
+            errors.append(f"{file}: source '{name}' needs \"type\": one of {', '.join(SOURCE_TYPES)}")
+            continue
+        sources[name] = dict(spec)
+
+    defaults = doc.get("defaults") or {}
+    if not isinstance(defaults, dict):
+        errors.append(f"{file}: defaults must be an object")
+        defaults = {}
+    sql_source = str(defaults.get("sqlSource") or DEFAULT_SQL_SOURCE)
+    dax_source = str(defaults.get("daxSource") or DEFAULT_DAX_SOURCE)
+
+    raw_tests = doc.get("tests")
+    if not isinstance(raw_tests, list):
+        return None, errors + [f"{file}: \"tests\" must be a list"]
+
+    tests: List[TestSpec] = []
+    seen: set = set()
+    for i, raw in enumerate(raw_tests):
+        where = f"{file}: tests[{i}]"
+        if not isinstance(raw, dict):
+            errors.append(f"{where}: must be an object")
+            continue
+        test_id = raw.get("id")
+        if not isinstance(test_id, str) or not test_id:
+            errors.append(f"{where}: missing \"id\"")
+            continue
+        where = f"{file}: test '{test_id}'"
+        if test_id in seen:
+            errors.append(f"{where}: duplicate id")
+            continue
+        kind = raw.get("type")
+        if kind not in TEST_TYPES:
+            errors.append(f"{where}: \"type\" must be one of {', '.join(TEST_TYPES)}")
+            continue
+        severity = str(raw.get("severity") or "HIGH").upper()
+        before = len(errors)
+        if severity not in _SEVERITIES:
+            errors.append(f"{where}: severity must be one of {', '.join(_SEVERITIES)}")
+
+        spec = TestSpec(id=test_id, type=kind, file=file, title=str(raw.get("title") or test_id), severity=severity)
+        for attr, key in (("abs_tolerance", "absTolerance"), ("rel_tolerance", "relTolerance")):
+            value = raw.get(key, defaults.get(key, 0.0))
+            if not _number(value):
+                errors.append(f"{where}: {key} must be a non-negative number")
+            else:
+                setattr(spec, attr, float(value))
+        column_tolerances = raw.get("columnTolerances") or {}
+        if not isinstance(column_tolerances, dict) or not all(_number(v) for v in column_tolerances.values()):
+            errors.append(f"{where}: columnTolerances must map column names to non-negative numbers")
+        else:
+            spec.column_tolerances = {k: float(v) for k, v in column_tolerances.items()}
+
+        if kind == "measureVsSql":
+            spec.sql = _query(raw.get("sql"), sql_source, f"{where}.sql", errors)
+            spec.dax = _query(raw.get("dax"), dax_source, f"{where}.dax", errors)
+            keys = _str_list(raw.get("keys"))
+            if not keys:
+                errors.append(f"{where}: \"keys\" must name at least one column of the SQL result")
+            spec.keys = keys or []
+            column_map = raw.get("columnMap") or {}
+            if not isinstance(column_map, dict) or not all(isinstance(v, str) for v in column_map.values()):
+                errors.append(f"{where}: columnMap must map DAX result columns to SQL result columns")
+            else:
+                spec.column_map = dict(column_map)
+        elif kind == "rowCount":
+            spec.source = str(raw.get("source") or sql_source)
+            spec.model_source = str(raw.get("modelSource") or dax_source)
+            spec.table, spec.sql_table = raw.get("table"), raw.get("sqlTable")
+            if not isinstance(spec.table, str) or not isinstance(spec.sql_table, str):
+                errors.append(f"{where}: rowCount needs \"table\" (model) and \"sqlTable\" (warehouse)")
+            spec.partition_by = raw.get("partitionBy")
+            spec.sql_partition_by = raw.get("sqlPartitionBy") or spec.partition_by
+            if spec.partition_by is not None and not isinstance(spec.partition_by, str):
+                errors.append(f"{where}: partitionBy must be a column name")
+        else:  # keyUnique
+            spec.source = str(raw.get("source") or sql_source)
+            spec.table = raw.get("table")
+            keys = _str_list(raw.get("keys"))
+            if not isinstance(spec.table, str) or not keys:
+                errors.append(f"{where}: keyUnique needs \"table\" and \"keys\"")
+            spec.keys = keys or []
+
+        if len(errors) == before:
+            seen.add(test_id)
+            tests.append(spec)
+
+    # every referenced source must exist with the right type; the two default names may stay implicit
+    implicit = {sql_source: "sql", dax_source: "dax"}
+    kept: List[TestSpec] = []
+    for t in tests:
+        if t.type == "measureVsSql":
+            needs = [(t.sql.source, "sql"), (t.dax.source, "dax")] if t.sql and t.dax else []
+        elif t.type == "rowCount":
+            needs = [(t.source, "sql"), (t.model_source, "dax")]
+        else:
+            needs = [(t.source, None)]
+        problems = []
+        for name, kind in needs:
+            if name not in sources and name in implicit:
+                sources[name] = {"type": implicit[name]}
+            actual = (sources.get(name) or {}).get("type")
+            if actual is None:
+                problems.append(f"{file}: test '{t.id}' uses undeclared source '{name}'")
+            elif kind and actual != kind:
+                problems.append(f"{file}: test '{t.id}' needs a {kind} source, '{name}' is {actual}")
+        errors.extend(problems)
+        if not problems:
+            kept.append(t)
+    return TestSuite(file=file, sources=sources, tests=kept), errors
@@ -0,0 +1,29 @@
+from datavalidator.validate.comparator import CompareOptions, compare_results
+
+
+def _rows(changed=()):
+    return [{"id": i, "amount": i * 10 + (1 if i in changed else 0)} for i in range(2000)]
+
+
+def test_repartitioned_buckets_do_not_share_spill_files():
+    changed = {3, 150, 777, 1200, 1999}
+    in_memory = compare_results(_rows(), _rows(changed), CompareOptions(keys=["id"]))
+    # 4 buckets of ~500 rows each exceed the budget, so every one is re-partitioned (twice)
+    spilled = compare_results(_rows(), _rows(changed), CompareOptions(keys=["id"], memory_rows=100, partitions=4))
+
+    assert spilled.spilled
+    for res in (in_memory, spilled):
+        assert res.matched == 1995
+        assert res.mismatched == 5
+        assert res.duplicate_keys == 0
+        assert res.missing == 0 and res.extra == 0
+
+
+def test_non_finite_values_ignore_tolerance():
+    inf, nan = float("inf"), float("nan")
+    expected = [{"id": 1, "v": inf}, {"id": 2, "v": -inf}, {"id": 3, "v": nan}, {"id": 4, "v": inf}, {"id": 5, "v": 1e308}]
+    actual = [{"id": 1, "v": inf}, {"id": 2, "v": -inf}, {"id": 3, "v": nan}, {"id": 4, "v": 1e308}, {"id": 5, "v": nan}]
+    res = compare_results(expected, actual, CompareOptions(keys=["id"], rel_tolerance=0.01))
+
+    assert res.matched == 3
+    assert res.mismatched == 2
@@ -0,0 +1,22 @@
+from datavalidator.analyze.naming import build_naming
+
+
+def _model(columns):
+    return {"tables": [{"name": table, "columns": [{"name": c} for c in cols]} for table, cols in columns.items()]}
+
+
+def _column_groups(columns):
+    return [(g["match"], g["names"]) for g in build_naming(_model(columns))["nearDuplicates"]["columns"]]
+
+
+def test_spelling_variants_of_one_name_are_grouped():
+    groups = _column_groups({"Sales": ["Sales Amount", "Quantity"], "Returns": ["SalesAmount"], "Orders": ["Sales_Amt"]})
+    assert groups == [("near", ["Sales Amount", "SalesAmount", "Sales_Amt"])]
+
+
+def test_words_that_are_prefixes_of_other_words_are_not_abbreviations():
+    groups = _column_groups({
+        "Sales": ["Net Sales", "Min Price", "Pro Plan", "Part Number", "Plan Amount", "Cash Account"],
+        "Network": ["Network Sales", "Minute Price", "Product Plan", "Partner Number", "Planning Amount", "Cashier Account"],
+    })
+    assert groups == []
@@ -0,0 +1,16 @@
+from datavalidator.validate.sql_runner import SqliteBackend, SqlQuery, SqlRunner
+
+
+def _count(init_sql):
+    runner = SqlRunner(SqliteBackend(init_sql=init_sql))
+    try:
+        return runner.run(SqlQuery("q", "SELECT COUNT(*) AS n FROM t"), lambda rows: next(rows)["n"])
+    finally:
+        runner.close()
+
+
+def test_default_in_memory_databases_are_separate_per_backend():
+    first = _count("CREATE TABLE t (x INT); INSERT INTO t VALUES (1), (2);")
+    second = _count("CREATE TABLE t (x INT); INSERT INTO t VALUES (3);")
+    assert (first.error, first.output) == (None, 2)
+    assert (second.error, second.output) == (None, 1)